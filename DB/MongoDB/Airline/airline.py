@@ -1,4 +1,5 @@
 import requests
+from ..http_session import http_get
 import pandas as pd
 from pymongo import MongoClient
 from pymongo.server_api import ServerApi
@@ -39,7 +40,7 @@ def upload_airline_data_atomic():
 
         params['serviceKey'] = service_key
         print(f"API 요청 중: {AIRLINE_API_URL} (params: {params})")
-        response = requests.get(AIRLINE_API_URL, params=params)
+        response = http_get(AIRLINE_API_URL, params=params)
         response.raise_for_status()
         json_data = response.json()
 
@@ -1,4 +1,5 @@
 import requests
+from ..http_session import http_get
 import pandas as pd
 from pymongo import MongoClient
 from pymongo.server_api import ServerApi
@@ -65,7 +66,7 @@ def fetch_and_upload_flight_schedule():
 
                 params['serviceKey'] = service_key
 
-                response = requests.get(api_url, params=params)
+                response = http_get(api_url, params=params)
                 response.raise_for_status()
 
                 json_data = response.json()
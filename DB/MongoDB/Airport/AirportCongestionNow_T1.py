@@ -1,5 +1,5 @@
 from pymongo import MongoClient
-import requests
+from ..http_session import http_get
 import json
 import time
 from datetime import datetime
@@ -39,7 +39,7 @@ def fetch_and_save_to_mongodb():
     print(f"[{current_time_str}] API 요청 시작...")
 
     try:
-        response = requests.get(url, params=params)
+        response = http_get(url, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -1,4 +1,4 @@
-import requests
+from ..http_session import http_get
 from datetime import datetime
 from dotenv import load_dotenv
 import os
@@ -40,7 +40,7 @@ def fetch_and_save_airport_enterprise():
         current_time_str = datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{current_time_str}] API 요청 시작...")
 
-        response = requests.get(url, params=params)
+        response = http_get(url, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -1,7 +1,7 @@
 from pymongo import MongoClient
 import os
 from dotenv import load_dotenv
-import requests
+from ..http_session import http_get
 from requests import Request
 import time
 import json
@@ -27,7 +27,7 @@ def get_valid_api_key(url, params_base, key_type, auth_param_name, max_retries=5
 
         try:
 
-            response = requests.get(url, params=params, timeout=10)
+            response = http_get(url, params=params, timeout=10)
 
             if response.status_code == 200:
                 text_data = response.text.strip()
@@ -1,6 +1,7 @@
 import os
 import json
 import requests
+from ..http_session import http_get
 import re
 import pandas as pd
 from collections import defaultdict
@@ -147,7 +148,7 @@ def fetch_and_process_parking_fee_policy():
         params = params.copy()
         params['serviceKey'] = service_key
 
-        response = requests.get(PARKING_FEE_API_URL, params=params)
+        response = http_get(PARKING_FEE_API_URL, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -1,4 +1,4 @@
-import requests
+from ..http_session import http_get
 import re
 import os
 from datetime import datetime
@@ -67,7 +67,7 @@ def fetch_and_insert_parking_lot_status_once():
         params = params.copy()
         params['serviceKey'] = service_key
 
-        response = requests.get(parking_lot_status_url, params=params)
+        response = http_get(parking_lot_status_url, params=params)
         response.raise_for_status()
 
         data = response.json()
@@ -1,4 +1,4 @@
-import requests
+from ..http_session import http_get
 import os
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
@@ -50,7 +50,7 @@ def update_parking_walk_time():
         }
 
         print("🌐 API 호출 중...")
-        response = requests.get(api_url, params=params)
+        response = http_get(api_url, params=params)
         response.raise_for_status()
         data = response.json()
 
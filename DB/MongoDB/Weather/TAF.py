@@ -1,5 +1,5 @@
 import pandas as pd
-import requests
+from ..http_session import http_get
 from datetime import datetime
 from pymongo import MongoClient
 from dotenv import load_dotenv
@@ -43,7 +43,7 @@ def fetch_and_save_taf_data():
         current_time_str = datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{current_time_str}] TAF API 요청 시작...")
 
-        response = requests.get(url, params=params)
+        response = http_get(url, params=params)
         response.raise_for_status()
 
         print(f"[{current_time_str}] Status Code: {response.status_code}")
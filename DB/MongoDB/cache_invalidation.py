@@ -0,0 +1,50 @@
+"""
+일일 갱신 후 챗봇 시맨틱 캐시 무효화
+
+갱신 작업이 끝난 데이터 도메인마다 DataVersion 컬렉션에 갱신 시각을 기록하고,
+그 도메인 데이터로 만든 Cached(시맨틱 캐시 영속 저장소) 문서 중 갱신 전에 만든 것을 삭제합니다.
+챗봇 워커는 DataVersion을 주기적으로 확인해 메모리의 캐시 항목도 버립니다. (ai/chatbot/rag/cache_policy.py와 같은 도메인 이름)
+"""
+import os
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+load_dotenv()
+
+DATA_VERSION_COLLECTION = "DataVersion"
+CACHED_COLLECTION = "Cached"
+
+
+def publish_data_refresh(domains):
+    domains = sorted(set(domains))
+    if not domains:
+        return
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("오류: .env 파일에서 MONGO_URI를 찾을 수 없습니다. 파일을 확인해주세요.")
+        return
+
+    client = None
+    try:
+        client = MongoClient(mongo_uri)
+        db = client["AirBot"]
+        refreshed_at = datetime.now(timezone.utc)
+
+        for domain in domains:
+            db[DATA_VERSION_COLLECTION].update_one(
+                {"_id": domain}, {"$set": {"refreshed_at": refreshed_at}}, upsert=True
+            )
+        delete_result = db[CACHED_COLLECTION].delete_many(
+            {"domains": {"$in": domains}, "created_at": {"$lt": refreshed_at}}
+        )
+        print(f"✅ 데이터 갱신 기록 {domains} - 시맨틱 캐시 {delete_result.deleted_count}건 삭제")
+
+    except Exception as e:
+        print(f"❌ 시맨틱 캐시 무효화 오류: {e}")
+
+    finally:
+        if client:
+            client.close()
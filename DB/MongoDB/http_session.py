@@ -0,0 +1,40 @@
+"""
+수집 스크립트 공용 HTTP 세션 (data.go.kr API 호출)
+
+- 하나의 requests.Session으로 keep-alive 커넥션을 재사용합니다. (페이지/키 반복 호출 시 TCP/TLS 재연결 방지)
+- 연결 오류, 429/5xx 응답은 urllib3 Retry로 지수 백오프 + jitter 재시도합니다.
+- 재시도 후에도 실패 상태 코드면 마지막 응답을 그대로 반환하므로 기존 status_code 검사/raise_for_status가 그대로 동작합니다.
+- timeout을 주지 않은 호출에도 기본 타임아웃을 적용합니다.
+
+설정은 챗봇 서버(ai/shared/http_client.py)의 HTTP_* 환경 변수와 섞이지 않도록 INGEST_HTTP_* 이름을 씁니다.
+"""
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+INGEST_HTTP_CONNECT_TIMEOUT_SEC = float(os.getenv("INGEST_HTTP_CONNECT_TIMEOUT_SEC", "5"))
+INGEST_HTTP_READ_TIMEOUT_SEC = float(os.getenv("INGEST_HTTP_READ_TIMEOUT_SEC", "30"))
+INGEST_HTTP_MAX_RETRIES = int(os.getenv("INGEST_HTTP_MAX_RETRIES", "3"))
+
+_retry = Retry(
+    total=INGEST_HTTP_MAX_RETRIES,
+    backoff_factor=0.5,
+    backoff_jitter=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    raise_on_status=False,
+)
+
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=_retry)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+
+def http_get(url, params=None, timeout=None, **kwargs):
+    """requests.get과 같은 인터페이스 (세션 재사용 + 재시도 + 기본 타임아웃)"""
+    if timeout is None:
+        timeout = (INGEST_HTTP_CONNECT_TIMEOUT_SEC, INGEST_HTTP_READ_TIMEOUT_SEC)
+    return _session.get(url, params=params, timeout=timeout, **kwargs)
@@ -7,6 +7,7 @@ from zoneinfo import ZoneInfo
 from MongoDB.Airline.airline import upload_airline_data_atomic
 from MongoDB.Airline.airport import upload_airport_data_atomic
 from MongoDB.Airline.flight_schedule import fetch_flight_schedule
+from MongoDB.Airline.flight_realtime import fetch_and_save_flight_realtime
 from MongoDB.Airline.update_airline import update_airline_info_atomic
 from MongoDB.Airline.upload_data import upload_country_data, upload_restricted_item_data, upload_minimum_connection_time_data
 from MongoDB.Airline.upload_data import upload_airport_procedure_data, upload_transit_path_data
@@ -23,6 +24,8 @@ from MongoDB.Parking.ParkingLotWalkTime import update_parking_walk_time
 from MongoDB.Weather.ATMOS import fetch_and_save_atmos_data
 from MongoDB.Weather.TAF import fetch_and_save_taf_data
 
+from MongoDB.cache_invalidation import publish_data_refresh
+
 
 
 from dotenv import load_dotenv
@@ -41,6 +44,9 @@ parking_discount_csv_path = os.path.join(PARKING_DIR, "ParkingFeeDiscountPolicy
 parking_fee_payment_csv_path = os.path.join(PARKING_DIR, "ParkingFeePayment.csv")
 parkingLot_csv_path = os.path.join(PARKING_DIR, "ParkingLot.csv")
 
+# 실시간 항공편 현황판 스냅샷 갱신 주기 (분). 챗봇은 이 스냅샷을 먼저 조회합니다.
+FLIGHT_REALTIME_INTERVAL_MIN = int(os.getenv("FLIGHT_REALTIME_INTERVAL_MIN", "3"))
+
 
 # 로깅 설정
 logging.basicConfig(
@@ -50,13 +56,16 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
-def run_task_with_logging(func, task_name):
+def run_task_with_logging(func, task_name, domain=None, refreshed=None):
+    """domain을 주면 작업이 성공했을 때 refreshed 집합에 추가합니다. (시맨틱 캐시 무효화 대상)"""
     logging.info(f"작업 시작: {task_name}")
     print(f"{datetime.now(ZoneInfo("Asia/Seoul"))} - 작업 시작: {task_name}")
     try:
         func()
         logging.info(f"작업 완료: {task_name}")
         print(f"{datetime.now(ZoneInfo("Asia/Seoul"))} - 작업 완료: {task_name}")
+        if domain and refreshed is not None:
+            refreshed.add(domain)
     except Exception as e:
         logging.error(f"작업 중 오류 발생({task_name}): {e}")
         print(f"{datetime.now(ZoneInfo("Asia/Seoul"))} - 작업 중 오류 발생({task_name}): {e}")
@@ -66,6 +75,7 @@ def main():
     last_run = {
         "TAF": datetime.min,
         "ATMOS": datetime.min,
+        "FLIGHT_REALTIME": datetime.min,
         "DAILY": datetime.min,
     }
 
@@ -82,27 +92,36 @@ def main():
             run_task_with_logging(fetch_and_save_atmos_data, "ATMOS 데이터 갱신")
             last_run["ATMOS"] = now
 
+        # FLIGHT_REALTIME_INTERVAL_MIN마다 실행 (실시간 항공편 스냅샷)
+        if now - last_run["FLIGHT_REALTIME"] >= timedelta(minutes=FLIGHT_REALTIME_INTERVAL_MIN):
+            run_task_with_logging(fetch_and_save_flight_realtime, "실시간 항공편 스냅샷 갱신")
+            last_run["FLIGHT_REALTIME"] = now
+
         # 하루 1번 실행 (나머지)
         if now - last_run["DAILY"] >= timedelta(days=1):
+            # 성공한 작업의 데이터 도메인 (갱신 후 챗봇 시맨틱 캐시 무효화)
+            refreshed = set()
             
-            run_task_with_logging(upload_airline_data_atomic, "airline 데이터 갱신")
-            run_task_with_logging(lambda: upload_airport_data_atomic(airport_list_file), "airport 데이터 갱신")
-            run_task_with_logging(fetch_flight_schedule, "flight schedule 데이터 갱신")
-            run_task_with_logging(lambda: update_airline_info_atomic(unmatched_csv_path), "airline 정보 업데이트")
-            run_task_with_logging(upload_country_data, "국가 데이터 갱신")
-            run_task_with_logging(upload_restricted_item_data, "제한 품목 데이터 갱신")
-            run_task_with_logging(upload_minimum_connection_time_data, "최소 환승 시간 데이터 갱신")
-            run_task_with_logging(upload_airport_procedure_data, "공항 절차 데이터 갱신")
-            run_task_with_logging(upload_transit_path_data, "환승 경로 데이터 갱신")
+            run_task_with_logging(upload_airline_data_atomic, "airline 데이터 갱신", "airline", refreshed)
+            run_task_with_logging(lambda: upload_airport_data_atomic(airport_list_file), "airport 데이터 갱신", "airport", refreshed)
+            run_task_with_logging(fetch_flight_schedule, "flight schedule 데이터 갱신", "flight_schedule", refreshed)
+            run_task_with_logging(lambda: update_airline_info_atomic(unmatched_csv_path), "airline 정보 업데이트", "airline", refreshed)
+            run_task_with_logging(upload_country_data, "국가 데이터 갱신", "airport_policy", refreshed)
+            run_task_with_logging(upload_restricted_item_data, "제한 품목 데이터 갱신", "airport_policy", refreshed)
+            run_task_with_logging(upload_minimum_connection_time_data, "최소 환승 시간 데이터 갱신", "airport_policy", refreshed)
+            run_task_with_logging(upload_airport_procedure_data, "공항 절차 데이터 갱신", "airport_policy", refreshed)
+            run_task_with_logging(upload_transit_path_data, "환승 경로 데이터 갱신", "airport_policy", refreshed)
             
-            run_task_with_logging(fetch_and_save_airport_congestion_predict, "공항 혼잡 예측 데이터 갱신")
-            run_task_with_logging(fetch_and_save_airport_enterprise, "공항 기업 데이터 갱신")
-            run_task_with_logging(fetch_and_save_airport_facility, "공항 시설 데이터 갱신")
+            run_task_with_logging(fetch_and_save_airport_congestion_predict, "공항 혼잡 예측 데이터 갱신", "congestion", refreshed)
+            run_task_with_logging(fetch_and_save_airport_enterprise, "공항 기업 데이터 갱신", "facility", refreshed)
+            run_task_with_logging(fetch_and_save_airport_facility, "공항 시설 데이터 갱신", "facility", refreshed)
             
-            run_task_with_logging(lambda: upload_discount_policy_from_csv(parking_discount_csv_path), "주차 할인 정책 데이터 갱신")
-            run_task_with_logging(lambda: upload_payment_methods_from_csv(parking_fee_payment_csv_path), "주차 요금 결제 방법 데이터 갱신")
-            run_task_with_logging(lambda: upload_parking_lot_from_csv(parkingLot_csv_path), "주차장 데이터 갱신")
-            run_task_with_logging(update_parking_walk_time, "주차장 보행 시간 데이터 갱신")
+            run_task_with_logging(lambda: upload_discount_policy_from_csv(parking_discount_csv_path), "주차 할인 정책 데이터 갱신", "parking", refreshed)
+            run_task_with_logging(lambda: upload_payment_methods_from_csv(parking_fee_payment_csv_path), "주차 요금 결제 방법 데이터 갱신", "parking", refreshed)
+            run_task_with_logging(lambda: upload_parking_lot_from_csv(parkingLot_csv_path), "주차장 데이터 갱신", "parking", refreshed)
+            run_task_with_logging(update_parking_walk_time, "주차장 보행 시간 데이터 갱신", "parking", refreshed)
+
+            run_task_with_logging(lambda: publish_data_refresh(refreshed), "시맨틱 캐시 무효화")
 
 
 
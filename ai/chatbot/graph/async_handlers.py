@@ -0,0 +1,57 @@
+"""
+핸들러의 비동기 실행 경로 (chat_graph.ainvoke)
+
+핸들러 본문(슬롯/LLM 파싱, Mongo/벡터 검색, 외부 API)은 동기 코드이므로 전용 스레드 풀에서 실행하고,
+가장 오래 걸리는 최종 답변 LLM 호출만 AsyncOpenAI로 이벤트 루프에서 기다립니다.
+
+- 핸들러를 streaming_mode()로 실행하면 최종 답변 LLM 함수들이 호출 대신 LLMStream을 돌려주므로
+  (스트리밍 뷰와 같은 방식) 핸들러 코드를 고치지 않고 LLM 호출만 분리할 수 있습니다.
+- 스레드는 응답 생성 대기(수 초) 동안 점유되지 않아, 워커 하나가 여러 대화를 동시에 처리합니다.
+- build_chat_graph가 각 핸들러를 RunnableLambda(동기 함수, afunc=비동기 함수)로 등록하므로
+  chat_graph.invoke는 기존 동기 경로를, chat_graph.ainvoke는 이 경로를 사용합니다.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from chatbot.rag.config import async_client
+from chatbot.rag.streaming import LLMStream, streaming_mode
+
+ASYNC_HANDLER_MAX_WORKERS = int(os.getenv("ASYNC_HANDLER_MAX_WORKERS", "32"))
+
+_handler_executor = None
+_handler_executor_pid = None
+_handler_executor_lock = threading.Lock()
+
+
+def _get_handler_executor() -> ThreadPoolExecutor:
+    """핸들러 동기 구간 실행용 스레드 풀 (fork 이후 워커마다 새로 생성)"""
+    global _handler_executor, _handler_executor_pid
+    if _handler_executor is None or _handler_executor_pid != os.getpid():
+        with _handler_executor_lock:
+            if _handler_executor is None or _handler_executor_pid != os.getpid():
+                _handler_executor = ThreadPoolExecutor(
+                    max_workers=ASYNC_HANDLER_MAX_WORKERS, thread_name_prefix="async-handler"
+                )
+                _handler_executor_pid = os.getpid()
+    return _handler_executor
+
+
+def make_async_handler(handler):
+    """동기 핸들러를 받아 같은 state를 반환하는 비동기 핸들러를 만듭니다."""
+
+    def run(state):
+        with streaming_mode():
+            return handler(state)
+
+    async def async_handler(state):
+        loop = asyncio.get_running_loop()
+        new_state = await loop.run_in_executor(_get_handler_executor(), run, state)
+        response = new_state.get("response")
+        if isinstance(response, LLMStream):
+            new_state = {**new_state, "response": await response.atext(async_client)}
+        return new_state
+
+    async_handler.__name__ = f"{getattr(handler, '__name__', 'handler')}_async"
+    return async_handler
@@ -0,0 +1,103 @@
+"""
+복합 의도 디스패치 서브그래프 생성 비용 마이크로 벤치마크
+
+이전: handle_complex_intent가 요청마다 StateGraph를 만들고 모든 핸들러 노드를 추가한 뒤 compile()
+이후: build_chat_graph에서 한 번 컴파일한 서브그래프를 재사용
+
+핸들러 이름은 chatbot/graph/handlers/*.py 소스에서 읽고(import 하지 않음) 같은 이름의 더미 핸들러로
+노드 수를 실제와 동일하게 맞춥니다. 모델/DB/LLM 없이 그래프 구성 비용만 측정합니다.
+
+ai/ 디렉토리에서 실행:
+    python -m chatbot.graph.benchmark_subgraph --iterations 200
+"""
+import argparse
+import ast
+import os
+import statistics
+import time
+
+from chatbot.graph.nodes.complex_handler import build_dispatch_subgraph
+
+HANDLERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "handlers")
+
+
+def discover_handler_names():
+    """handlers 패키지 소스에서 *_handler 함수 이름을 수집합니다. (build_chat_graph와 같은 규칙)"""
+    names = []
+    for filename in sorted(os.listdir(HANDLERS_DIR)):
+        if not filename.endswith(".py") or filename.startswith("__"):
+            continue
+        with open(os.path.join(HANDLERS_DIR, filename), encoding="utf-8") as f:
+            source = f.read()
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            # 실행 중인 파이썬 버전에서 파싱되지 않는 파일은 문자열 검색으로 이름만 수집
+            names.extend(
+                line.split("def ", 1)[1].split("(", 1)[0]
+                for line in source.splitlines()
+                if line.startswith("def ") and line.split("(", 1)[0].endswith("_handler")
+            )
+            continue
+        names.extend(
+            node.name for node in tree.body
+            if isinstance(node, ast.FunctionDef) and node.name.endswith("_handler")
+        )
+    return sorted(set(names))
+
+
+def make_dummy_handlers(names):
+    def make(name):
+        def handler(state):
+            return {**state, "response": f"{name} 응답"}
+        handler.__name__ = name
+        return handler
+    return {name: make(name) for name in names}
+
+
+def measure(fn, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    ordered = sorted(latencies)
+    return {
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="복합 의도 서브그래프 요청당 생성 비용 비교")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    names = discover_handler_names()
+    handlers = make_dummy_handlers(names)
+    intent = names[0].replace("_handler", "") if names else "default"
+    sub_state = {"user_input": "벤치마크 질문", "intent": intent, "response": None}
+    print(f"핸들러 노드 수: {len(handlers)}, 반복: {args.iterations}")
+
+    cached_subgraph = build_dispatch_subgraph(handlers)
+    cached_subgraph.invoke(sub_state)  # 첫 실행 비용 제외
+
+    results = {
+        "이전 (요청마다 build+compile)": measure(lambda: build_dispatch_subgraph(handlers), args.iterations),
+        "이전 (build+compile+invoke)": measure(
+            lambda: build_dispatch_subgraph(handlers).invoke(sub_state), args.iterations
+        ),
+        "이후 (캐시된 서브그래프 invoke)": measure(lambda: cached_subgraph.invoke(sub_state), args.iterations),
+    }
+
+    print(f"{'구분':<32}{'mean(ms)':>10}{'p50(ms)':>10}{'p95(ms)':>10}")
+    for label, stats in results.items():
+        print(f"{label:<32}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}")
+
+    saved = results["이전 (build+compile+invoke)"]["mean_ms"] - results["이후 (캐시된 서브그래프 invoke)"]["mean_ms"]
+    print(f"\n복합 의도 요청당 절감 (서브 질문 1개 기준): {saved:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
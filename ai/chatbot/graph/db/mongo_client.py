@@ -1,40 +1,156 @@
 import os
-from pymongo import MongoClient
+import threading
+import time
+
+from pymongo import MongoClient, monitoring
 from pymongo.collection import Collection
 from pymongo.database import Database
+from pymongo.server_api import ServerApi
 from dotenv import load_dotenv
 
+from shared.lazy import LazyResource, record
+from shared.metrics import get_counter, get_histogram
+
 load_dotenv()
 
+DEFAULT_DB_NAME = os.getenv("MONGO_DB_NAME", "AirBot")
+
+# 커넥션 풀 설정 (워커 프로세스당 하나의 풀을 모든 핸들러/헬퍼/뷰가 공유)
+MONGO_POOL_CONFIG = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+    # 풀이 가득 찼을 때 커넥션을 기다리는 최대 시간
+    "waitQueueTimeoutMS": int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000")),
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+    "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+}
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    커넥션 풀 이벤트를 메트릭으로 기록합니다.
+    - mongo.pool.checkout_wait_ms: 커넥션을 얻기까지 기다린 시간
+    - mongo.pool.checkout_failed / connections_created / connections_closed / pool_cleared
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._checkout_wait = get_histogram("mongo.pool.checkout_wait_ms")
+        self._checkout_failed = get_counter("mongo.pool.checkout_failed")
+        self._created = get_counter("mongo.pool.connections_created")
+        self._closed = get_counter("mongo.pool.connections_closed")
+        self._cleared = get_counter("mongo.pool.pool_cleared")
+
+    def _elapsed_ms(self, event):
+        # pymongo 4.7+는 이벤트에 duration(초)을 제공, 없으면 스레드별 시작 시각으로 계산
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            return duration * 1000
+        started = getattr(self._local, "started", None)
+        return (time.perf_counter() - started) * 1000 if started else 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        self._checkout_wait.observe(self._elapsed_ms(event))
+
+    def connection_check_out_failed(self, event):
+        self._checkout_failed.inc()
+        self._checkout_wait.observe(self._elapsed_ms(event))
+
+    def connection_created(self, event):
+        self._created.inc()
+
+    def connection_closed(self, event):
+        self._closed.inc()
+
+    def pool_cleared(self, event):
+        self._cleared.inc()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
 class MongoDBClient:
     """
     MongoDB 와 연결을 한번만 하도록 하는 싱글톤 구조
+    ai/ 패키지 전체(RAG 헬퍼, 핸들러, 뷰)가 이 클라이언트의 커넥션 풀을 공유합니다.
+    요청 단위로 close()하지 않습니다.
     """
     _instance = None
+    _lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super(MongoDBClient, cls).__new__(cls, *args, **kwargs)
+        # fork 이후 자식 프로세스에서는 부모의 클라이언트를 쓰지 않고 새로 만듦 (MongoClient는 fork-safe 하지 않음)
+        if not cls._instance or cls._instance._pid != os.getpid():
+            with cls._lock:
+                if not cls._instance or cls._instance._pid != os.getpid():
+                    instance = super(MongoDBClient, cls).__new__(cls)
+                    instance._connect()
+                    cls._instance = instance
         return cls._instance
 
-    def __init__(self):
-        # The __init__ is called every time, but the connection is only made once.
-        if not hasattr(self, 'client'):
-            mongo_uri = os.getenv("MONGO_URI")
-            if not mongo_uri:
-                raise ValueError("MONGO_URI environment variable not set.")
-            
-            self.client: MongoClient = MongoClient(mongo_uri)
-            self.db: Database = self.client.get_database("AirBot")
-            print("MongoDB connection established.")
+    def _connect(self):
+        mongo_uri = os.getenv("MONGO_URI")
+        if not mongo_uri:
+            raise ValueError("MONGO_URI environment variable not set.")
+
+        started = time.perf_counter()
+        self._pid = os.getpid()
+        self.client: MongoClient = MongoClient(
+            mongo_uri,
+            server_api=ServerApi('1'),
+            event_listeners=[PoolMetricsListener()],
+            **MONGO_POOL_CONFIG,
+        )
+        self.db: Database = self.client.get_database(DEFAULT_DB_NAME)
+        record("mongo_client", (time.perf_counter() - started) * 1000)
+        print(f"MongoDB connection pool established. (pid={self._pid}, maxPoolSize={MONGO_POOL_CONFIG['maxPoolSize']})")
+
+    def get_database(self, db_name: str = None) -> Database:
+        if not db_name or db_name == DEFAULT_DB_NAME:
+            return self.db
+        return self.client.get_database(db_name)
+
+    def get_collection(self, collection_name: str, db_name: str = None) -> Collection:
+        return self.get_database(db_name).get_collection(collection_name)
+
+
+def get_mongo_client() -> MongoClient:
+    """프로세스 공용 pymongo MongoClient (커넥션 풀)"""
+    return MongoDBClient().client
+
+
+def get_database(db_name: str = None) -> Database:
+    return MongoDBClient().get_database(db_name)
 
-    def get_collection(self, collection_name: str) -> Collection:
-        return self.db.get_collection(collection_name)
 
+def get_collection(collection_name: str, db_name: str = None) -> Collection:
+    return MongoDBClient().get_collection(collection_name, db_name)
 
-mongo_client = MongoDBClient()
 
-airport_congestion_t1_collection = mongo_client.get_collection("AirportCongestionNow_T1")
-airport_congestion_t2_collection = mongo_client.get_collection("AirportCongestionNow_T2")
-aiport_congestion_predict = mongo_client.get_collection("AirportCongestionPredict")
+# import 시점이 아닌 첫 사용 시점에 연결
+mongo_client = LazyResource("mongo_client.graph_db", MongoDBClient)
 
+airport_congestion_t1_collection = LazyResource(
+    "collection.AirportCongestionNow_T1", lambda: get_collection("AirportCongestionNow_T1")
+)
+airport_congestion_t2_collection = LazyResource(
+    "collection.AirportCongestionNow_T2", lambda: get_collection("AirportCongestionNow_T2")
+)
+aiport_congestion_predict = LazyResource(
+    "collection.AirportCongestionPredict", lambda: get_collection("AirportCongestionPredict")
+)
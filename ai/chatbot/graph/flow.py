@@ -2,11 +2,13 @@ import importlib
 import pkgutil
 from functools import partial
 from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableLambda
 
 from chatbot.graph.state import ChatState
 from chatbot.graph.nodes.classifiy_intent import classify_intent
-from chatbot.graph.nodes.complex_handler import handle_complex_intent
-from chatbot.graph.nodes.llm_verify_intent import llm_verify_intent_node
+from chatbot.graph.nodes.complex_handler import handle_complex_intent, build_dispatch_subgraph
+from chatbot.graph.nodes.llm_verify_intent import llm_verify_intent_node, allm_verify_intent_node
+from chatbot.graph.async_handlers import make_async_handler
 import chatbot.graph.handlers
 
 
@@ -28,18 +30,27 @@ def build_chat_graph():
             attribute = getattr(module, attribute_name)
             if callable(attribute) and attribute_name.endswith("_handler"):
                 node_name = attribute_name
-                builder.add_node(node_name, attribute)
+                # invoke는 동기 핸들러, ainvoke는 비동기 핸들러(AsyncOpenAI)로 실행
+                builder.add_node(node_name, RunnableLambda(attribute, afunc=make_async_handler(attribute), name=node_name))
                 builder.add_edge(node_name, END)
                 handlers[node_name] = attribute
                 supported_intents.append(node_name.replace("_handler", ""))
 
     # 복합 의도 처리 노드 추가
-    complex_handler_node = partial(handle_complex_intent, handlers=handlers, supported_intents=supported_intents)
-    builder.add_node("handle_complex_intent", complex_handler_node)
+    # 복합 의도용 디스패치 서브그래프는 여기서 한 번만 컴파일해 모든 요청이 재사용
+    dispatch_subgraph = build_dispatch_subgraph(handlers)
+    complex_handler_node = partial(
+        handle_complex_intent, handlers=handlers, supported_intents=supported_intents, subgraph=dispatch_subgraph
+    )
+    builder.add_node("handle_complex_intent", RunnableLambda(
+        complex_handler_node, afunc=make_async_handler(complex_handler_node), name="handle_complex_intent"
+    ))
     builder.add_edge("handle_complex_intent", END)
 
     # LLM 검증 노드 추가
-    builder.add_node("llm_verify_intent", llm_verify_intent_node)
+    builder.add_node("llm_verify_intent", RunnableLambda(
+        llm_verify_intent_node, afunc=allm_verify_intent_node, name="llm_verify_intent"
+    ))
     
     def route_final_intent_to_handler(state):
         final_intent = state.get("intent")
@@ -7,6 +7,7 @@ from chatbot.rag.config import RAG_SEARCH_CONFIG, common_llm_rag_caller
 from chatbot.rag.airport_congestion_helpers import _get_congestion_level, VALID_AREAS, _parse_query_with_llm, _get_congestion_data_from_db, _get_daily_congestion_data_from_db, _map_area_to_db_key
 import json
 from zoneinfo import ZoneInfo
+from chatbot.rag.rule_parsers import parse_with_fallback, parse_congestion_query
 
 load_dotenv()
 
@@ -18,7 +19,11 @@ def airport_congestion_prediction_handler(state: ChatState) -> ChatState:
     if not query_to_process:
         return {**state, "response": "죄송합니다. 질문 내용을 파악할 수 없습니다. 다시 질문해주세요."}
     
-    parsed_query = _parse_query_with_llm(query_to_process)
+    # 규칙 기반 파싱을 먼저 시도하고, 부족할 때만 LLM 파싱
+    parsed_query = parse_with_fallback(
+        "airport_congestion_prediction", parse_congestion_query, _parse_query_with_llm,
+        query_to_process, state.get("slots", []),
+    )
     if parsed_query is None:
         return {**state, "response": "죄송합니다. 요청을 처리하는 중 문제가 발생했습니다. 다시 시도해 주세요."}
     
@@ -1,6 +1,6 @@
 from typing import List, Dict, Any
 from chatbot.graph.state import ChatState
-from chatbot.rag.utils import get_query_embedding, perform_vector_search, close_mongo_client
+from chatbot.rag.utils import get_query_embeddings, run_vector_searches
 from chatbot.rag.config import RAG_SEARCH_CONFIG, common_llm_rag_caller
 from chatbot.rag.llm_tools import extract_location_with_llm, _extract_facility_names_with_llm, _filter_and_rerank_docs
 
@@ -82,18 +82,21 @@ def facility_guide_handler(state: ChatState) -> ChatState:
 
     individual_responses = []
     try:
-        for facility_name in facility_names:
+        # 1단계: 넓은 벡터 검색 (필터 없이) - 시설명들을 한 번에 임베딩하고 검색은 동시에 실행
+        query_embeddings = get_query_embeddings(facility_names)
+        search_results = run_vector_searches([
+            {
+                "query_embedding": query_embedding,
+                "collection_name": collection_name,
+                "vector_index_name": vector_index_name,
+                "query_filter": {}, # 빈 딕셔너리를 전달하여 필터링을 하지 않음
+                "top_k": 10,
+            }
+            for query_embedding in query_embeddings
+        ])
+
+        for facility_name, retrieved_docs_text in zip(facility_names, search_results):
             print(f"디버그: '{facility_name}'에 대한 RAG 파이프라인 시작...")
-            
-            # 1단계: 넓은 벡터 검색 (필터 없이)
-            query_embedding = get_query_embedding(facility_name)
-            retrieved_docs_text = perform_vector_search(
-                query_embedding,
-                collection_name=collection_name,
-                vector_index_name=vector_index_name,
-                query_filter={}, # 빈 딕셔너리를 전달하여 필터링을 하지 않음
-                top_k=10
-            )
             print(f"디버그: '{facility_name}'에 대해 {len(retrieved_docs_text)}개 문서 검색 완료.")
 
             # 📌 2단계: 파이썬에서 직접 필터링
@@ -138,8 +141,6 @@ def facility_guide_handler(state: ChatState) -> ChatState:
         error_msg = f"죄송합니다. 정보를 검색하는 중 오류가 발생했습니다: {e}"
         print(f"디버그: {error_msg}")
         return {**state, "response": error_msg}
-    finally:
-        close_mongo_client()
 
     final_response = _combine_individual_responses(individual_responses)
     return {**state, "response": final_response}
\ No newline at end of file
@@ -1,6 +1,6 @@
 from chatbot.graph.state import ChatState
 
-from chatbot.rag.utils import get_query_embedding, perform_vector_search, close_mongo_client # utils에서 필요한 함수 임포트
+from chatbot.rag.utils import get_query_embedding, perform_vector_search, retrieve_documents_for_queries # utils에서 필요한 함수 임포트
 from chatbot.rag.config import RAG_SEARCH_CONFIG, common_llm_rag_caller # config에서 설정 및 공통 LLM 호출 함수 임포트
 
 from chatbot.rag.regular_schedule_helper import (
@@ -15,6 +15,7 @@ from chatbot.rag.flight_info_helper import (
 )
 from chatbot.rag.llm_tools import _extract_airline_name_with_llm 
 from chatbot.rag.utils import get_mongo_collection
+from chatbot.rag.rule_parsers import parse_with_fallback, parse_schedule_query
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
@@ -203,7 +204,10 @@ def regular_schedule_query_handler(state: ChatState) -> ChatState:
     print(f"\n--- {intent_name.upper()} 핸들러 실행 ---")
     print(f"디버그: 핸들러가 처리할 최종 쿼리 - '{query_to_process}'")
 
-    parsed_queries_data = _parse_schedule_query_with_llm(query_to_process)
+    parsed_queries_data = parse_with_fallback(
+        "regular_schedule_query", parse_schedule_query, _parse_schedule_query_with_llm,
+        query_to_process, state.get("slots", []),
+    )
     if not parsed_queries_data or not parsed_queries_data.get('requests'):
         return {**state, "response": "죄송합니다. 스케줄 정보를 파악하는 중 문제가 발생했습니다. 다시 시도해 주세요."}
     
@@ -342,18 +346,14 @@ def airline_info_query_handler(state: ChatState) -> ChatState:
     all_retrieved_docs_text = []
     try:
         # 추출된 각 항공사 이름에 대해 RAG 검색을 개별적으로 수행합니다.
-        for airline_name in airline_names:
-            # 📌 수정된 로직: 검색 쿼리로 'airline_name' 변수를 사용
-            print(f"디버그: '{airline_name}'에 대해 검색 시작...")
-            query_embedding = get_query_embedding(airline_name)
-            retrieved_docs_text = perform_vector_search(
-                query_embedding,
-                collection_name=collection_name,
-                vector_index_name=vector_index_name,
-                query_filter=query_filter,
-                top_k=3
-            )
-            all_retrieved_docs_text.extend(retrieved_docs_text)
+        # 하위 질의를 한 번에 임베딩하고 벡터 검색은 동시에 실행 (중복 문서 제거)
+        all_retrieved_docs_text = retrieve_documents_for_queries(
+            airline_names,
+            collection_name=collection_name,
+            vector_index_name=vector_index_name,
+            query_filter=query_filter,
+            top_k=3
+        )
             
         print(f"디버그: MongoDB에서 총 {len(all_retrieved_docs_text)}개 문서 검색 완료.")
 
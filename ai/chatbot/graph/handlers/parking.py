@@ -1,6 +1,6 @@
 from chatbot.graph.state import ChatState
 
-from chatbot.rag.utils import get_query_embedding, perform_vector_search, close_mongo_client
+from chatbot.rag.utils import retrieve_documents_for_queries
 from chatbot.rag.config import RAG_SEARCH_CONFIG, common_llm_rag_caller
 from chatbot.rag.config import client, DISCLAIMER
 
@@ -14,7 +14,9 @@ import json
 # 새로운 LLM 파싱 함수를 임포트합니다.
 from chatbot.rag.parking_fee_helper import _parse_parking_fee_query_with_llm
 from chatbot.rag.parking_walk_time_helper import _parse_parking_walk_time_query_with_llm
+from chatbot.rag.rule_parsers import parse_with_fallback, parse_parking_walk_time_query
 from chatbot.graph.utils.formatting_utils import get_formatted_llm_response_single_message
+from shared.http_client import get_endpoint
 
 load_dotenv()
 
@@ -71,19 +73,14 @@ def parking_fee_info_handler(state: ChatState) -> ChatState:
 
     all_retrieved_docs_text = []
     try:
-        for query in search_queries:
-            print(f"디버그: '{query}'에 대해 검색 시작...")
-            
-            # 📌 수정된 부분: 검색을 위해 query_embedding에 query를 전달합니다.
-            query_embedding = get_query_embedding(query)
-            retrieved_docs_text = perform_vector_search(
-                query_embedding,
-                collection_name=collection_name,
-                vector_index_name=vector_index_name,
-                query_filter=query_filter,
-                top_k=5
-            )
-            all_retrieved_docs_text.extend(retrieved_docs_text)
+        # 하위 질의를 한 번에 임베딩하고 벡터 검색은 동시에 실행 (중복 문서 제거)
+        all_retrieved_docs_text = retrieve_documents_for_queries(
+            search_queries,
+            collection_name=collection_name,
+            vector_index_name=vector_index_name,
+            query_filter=query_filter,
+            top_k=5
+        )
             
         print(f"디버그: MongoDB에서 총 {len(all_retrieved_docs_text)}개 문서 검색 완료.")
 
@@ -147,19 +144,14 @@ def parking_location_recommendation_handler(state: ChatState) -> ChatState:
 
     all_retrieved_docs_text = []
     try:
-        for keyword in search_keywords:
-            print(f"디버그: '{keyword}'에 대해 검색 시작...")
-
-            # 📌 수정된 부분: 검색을 위해 query_embedding에 keyword를 전달합니다.
-            query_embedding = get_query_embedding(keyword)
-            retrieved_docs_text = perform_vector_search(
-                query_embedding,
-                collection_name=collection_name,
-                vector_index_name=vector_index_name,
-                query_filter=query_filter,
-                top_k=5
-            )
-            all_retrieved_docs_text.extend(retrieved_docs_text)
+        # 하위 질의를 한 번에 임베딩하고 벡터 검색은 동시에 실행 (중복 문서 제거)
+        all_retrieved_docs_text = retrieve_documents_for_queries(
+            search_keywords,
+            collection_name=collection_name,
+            vector_index_name=vector_index_name,
+            query_filter=query_filter,
+            top_k=5
+        )
 
         print(f"디버그: MongoDB에서 총 {len(all_retrieved_docs_text)}개 문서 검색 완료.")
         
@@ -203,7 +195,7 @@ def parking_availability_query_handler(state: ChatState) -> ChatState:
     }
     
     try:
-        response = requests.get(API_URL, params=params)
+        response = get_endpoint("parking_status").get(API_URL, params=params)
         response.raise_for_status()
         
         print(f"디버그: API 응답 텍스트: {response.text[:200]}")  # 처음 200자만 출력
@@ -282,7 +274,10 @@ def parking_walk_time_info_handler(state: ChatState) -> ChatState:
     print(f"\n--- {intent_name.upper()} 핸들러 실행 ---")
     print(f"디버그: 핸들러가 처리할 최종 쿼리 - '{query_to_process}'")
 
-    parsed_queries = _parse_parking_walk_time_query_with_llm(query_to_process)
+    parsed_queries = parse_with_fallback(
+        "parking_walk_time_info", parse_parking_walk_time_query, _parse_parking_walk_time_query_with_llm,
+        query_to_process, state.get("slots", []),
+    )
     
     search_queries = []
     if parsed_queries and parsed_queries.get("requests"):
@@ -305,19 +300,14 @@ def parking_walk_time_info_handler(state: ChatState) -> ChatState:
 
     all_retrieved_docs_text = []
     try:
-        for query in search_queries:
-            print(f"디버그: '{query}'에 대해 검색 시작...")
-            
-            # 📌 수정된 부분: 검색을 위해 query_embedding에 query를 전달합니다.
-            query_embedding = get_query_embedding(query)
-            retrieved_docs_text = perform_vector_search(
-                query_embedding,
-                collection_name=collection_name,
-                vector_index_name=vector_index_name,
-                query_filter=query_filter,
-                top_k=5
-            )
-            all_retrieved_docs_text.extend(retrieved_docs_text)
+        # 하위 질의를 한 번에 임베딩하고 벡터 검색은 동시에 실행 (중복 문서 제거)
+        all_retrieved_docs_text = retrieve_documents_for_queries(
+            search_queries,
+            collection_name=collection_name,
+            vector_index_name=vector_index_name,
+            query_filter=query_filter,
+            top_k=5
+        )
             
         print(f"디버그: MongoDB에서 총 {len(all_retrieved_docs_text)}개 문서 검색 완료.")
 
@@ -1,11 +1,12 @@
 from chatbot.graph.state import ChatState
 from datetime import datetime, timedelta
 
-from chatbot.rag.utils import get_query_embedding, perform_vector_search, close_mongo_client
+from chatbot.rag.utils import retrieve_documents_for_queries
 from chatbot.rag.config import RAG_SEARCH_CONFIG, common_llm_rag_caller
 from chatbot.rag.baggage_helper import _parse_baggage_rule_query_with_llm
 from chatbot.rag.baggage_claim_info_helper import call_arrival_flight_api, _parse_flight_baggage_query_with_llm, _parse_airport_code_with_llm, _generate_final_answer_with_llm
 from chatbot.rag.immigration_helper import _parse_immigration_policy_query_with_llm
+from chatbot.rag.rule_parsers import parse_with_fallback, parse_immigration_policy_query, parse_flight_baggage_query
 from chatbot.rag.flight_info_helper import _call_flight_api, _extract_flight_info_from_response
 from zoneinfo import ZoneInfo
 
@@ -26,9 +27,11 @@ def immigration_policy_handler(state: ChatState) -> ChatState:
     print(f"\n--- {intent_name.upper()} 핸들러 실행 ---")
     print(f"디버그: 핸들러가 처리할 최종 쿼리 - '{query_to_process}'")
 
-    # ⭐ LLM으로 복합 질문을 분해합니다.
-    # 📌 수정된 부분: _parse_immigration_policy_query_with_llm 함수에 재구성된 쿼리를 전달합니다.
-    parsed_queries = _parse_immigration_policy_query_with_llm(query_to_process)
+    # ⭐ 복합 질문을 분해합니다. (규칙 기반으로 먼저 시도하고, 부족할 때만 LLM 사용)
+    parsed_queries = parse_with_fallback(
+        "immigration_policy_info", parse_immigration_policy_query, _parse_immigration_policy_query_with_llm,
+        query_to_process, state.get("slots", []),
+    )
 
     search_queries = []
     if parsed_queries and parsed_queries.get("requests"):
@@ -52,19 +55,14 @@ def immigration_policy_handler(state: ChatState) -> ChatState:
 
     all_retrieved_docs_text = []
     try:
-        for query in search_queries:
-            print(f"디버그: '{query}'에 대해 검색 시작...")
-            
-            # 📌 수정된 부분: 검색을 위해 query_embedding에 query를 전달합니다.
-            query_embedding = get_query_embedding(query)
-            retrieved_docs_text = perform_vector_search(
-                query_embedding,
-                collection_name=collection_name,
-                vector_index_name=vector_index_name,
-                query_filter=query_filter,
-                top_k=5
-            )
-            all_retrieved_docs_text.extend(retrieved_docs_text)
+        # 하위 질의를 한 번에 임베딩하고 벡터 검색은 동시에 실행 (중복 문서 제거)
+        all_retrieved_docs_text = retrieve_documents_for_queries(
+            search_queries,
+            collection_name=collection_name,
+            vector_index_name=vector_index_name,
+            query_filter=query_filter,
+            top_k=5
+        )
             
         print(f"디버그: MongoDB에서 총 {len(all_retrieved_docs_text)}개 문서 검색 완료.")
 
@@ -94,7 +92,10 @@ def baggage_claim_info_handler(state: ChatState) -> ChatState:
     query_to_process = state.get("rephrased_query") or state.get("user_input", "")
     print(f"디버그: 핸들러가 처리할 최종 쿼리 - '{query_to_process}'")
 
-    parsed_queries = _parse_flight_baggage_query_with_llm(query_to_process)
+    parsed_queries = parse_with_fallback(
+        "baggage_claim_info", parse_flight_baggage_query, _parse_flight_baggage_query_with_llm,
+        query_to_process, state.get("slots", []),
+    )
 
     if not parsed_queries or not isinstance(parsed_queries, list):
         response_text = "죄송합니다. 요청을 처리하는 중 문제가 발생했습니다. 다시 시도해 주세요."
@@ -233,19 +234,14 @@ def baggage_rule_query_handler(state: ChatState) -> ChatState:
 
     all_retrieved_docs_text = []
     try:
-        for query in search_queries:
-            print(f"디버그: '{query}'에 대해 검색 시작...")
-            
-            # 📌 수정된 부분: 검색을 위해 query_embedding에 query를 전달합니다.
-            query_embedding = get_query_embedding(query)
-            retrieved_docs_text = perform_vector_search(
-                query_embedding,
-                collection_name=collection_name,
-                vector_index_name=vector_index_name,
-                query_filter=query_filter,
-                top_k=5
-            )
-            all_retrieved_docs_text.extend(retrieved_docs_text)
+        # 하위 질의를 한 번에 임베딩하고 벡터 검색은 동시에 실행 (중복 문서 제거)
+        all_retrieved_docs_text = retrieve_documents_for_queries(
+            search_queries,
+            collection_name=collection_name,
+            vector_index_name=vector_index_name,
+            query_filter=query_filter,
+            top_k=5
+        )
             
         print(f"디버그: MongoDB에서 총 {len(all_retrieved_docs_text)}개 문서 검색 완료.")
 
@@ -1,8 +1,11 @@
 from chatbot.graph.state import ChatState
 
-from chatbot.rag.utils import get_query_embedding, perform_vector_search, close_mongo_client
+from chatbot.rag.utils import (
+    get_query_embeddings, fan_out_vector_search, retrieve_documents_for_queries
+)
 from chatbot.rag.config import RAG_SEARCH_CONFIG, common_llm_rag_caller
 from chatbot.rag.transfer_route_helper import _parse_transfer_route_query_with_llm
+from chatbot.rag.rule_parsers import parse_with_fallback, parse_transfer_route_query
 
 def transfer_info_handler(state: ChatState) -> ChatState:
     """
@@ -54,19 +57,14 @@ def transfer_info_handler(state: ChatState) -> ChatState:
 
     all_retrieved_docs_text = []
     try:
-        for keyword in search_keywords:
-            print(f"디버그: '{keyword}'에 대해 검색 시작...")
-
-            # 📌 수정된 부분: 검색을 위해 query_embedding에 keyword를 전달합니다.
-            query_embedding = get_query_embedding(keyword)
-            retrieved_docs_text = perform_vector_search(
-                query_embedding,
-                collection_name=collection_name,
-                vector_index_name=vector_index_name,
-                query_filter=query_filter,
-                top_k=5
-            )
-            all_retrieved_docs_text.extend(retrieved_docs_text)
+        # 하위 질의를 한 번에 임베딩하고 벡터 검색은 동시에 실행 (중복 문서 제거)
+        all_retrieved_docs_text = retrieve_documents_for_queries(
+            search_keywords,
+            collection_name=collection_name,
+            vector_index_name=vector_index_name,
+            query_filter=query_filter,
+            top_k=5
+        )
 
         print(f"디버그: MongoDB에서 총 {len(all_retrieved_docs_text)}개 문서 검색 완료.")
         
@@ -105,9 +103,11 @@ def transfer_route_guide_handler(state: ChatState) -> ChatState:
     print(f"\n--- {intent_name.upper()} 핸들러 실행 ---")
     print(f"디버그: 핸들러가 처리할 최종 쿼리 - '{query_to_process}'")
 
-    # ⭐ LLM으로 복합 질문을 분해합니다.
-    # 📌 수정된 부분: _parse_transfer_route_query_with_llm 함수에 재구성된 쿼리를 전달합니다.
-    parsed_queries = _parse_transfer_route_query_with_llm(query_to_process)
+    # ⭐ 복합 질문을 분해합니다. (규칙 기반으로 먼저 시도하고, 부족할 때만 LLM 사용)
+    parsed_queries = parse_with_fallback(
+        "transfer_route_guide", parse_transfer_route_query, _parse_transfer_route_query_with_llm,
+        query_to_process, state.get("slots", []),
+    )
 
     search_queries = []
     if parsed_queries and parsed_queries.get("requests"):
@@ -131,39 +131,39 @@ def transfer_route_guide_handler(state: ChatState) -> ChatState:
 
     all_retrieved_docs_text = []
     try:
-        # ⭐ 분해된 각 질문에 대해 RAG 검색을 개별적으로 수행합니다.
-        for query in search_queries:
-            print(f"디버그: '{query}'에 대해 검색 시작...")
-            
-            # 📌 수정된 부분: 검색을 위해 query_embedding에 query를 전달합니다.
-            query_embedding = get_query_embedding(query)
-            print(f"디버그: '{query}' 쿼리 임베딩 완료.")
+        # ⭐ 분해된 질문들을 한 번에 임베딩하고, 메인/추가 컬렉션 검색을 동시에 수행합니다.
+        search_queries = list(dict.fromkeys(q for q in search_queries if q))
+        query_embeddings = get_query_embeddings(search_queries)
+        print(f"디버그: 하위 질의 {len(search_queries)}개 배치 임베딩 완료.")
 
+        search_specs = []
+        for query_embedding in query_embeddings:
             # 메인 컬렉션에서 벡터 검색
-            main_collection_name = main_collection_info["name"]
-            main_vector_index = main_collection_info["vector_index"]
-            main_docs_text = perform_vector_search(
-                query_embedding,
-                collection_name=main_collection_name,
-                vector_index_name=main_vector_index,
-                query_filter=query_filter,
-                top_k=3
-            )
-            all_retrieved_docs_text.extend(main_docs_text)
-            
+            search_specs.append({
+                "query_embedding": query_embedding,
+                "collection_name": main_collection_info["name"],
+                "vector_index_name": main_collection_info["vector_index"],
+                "query_filter": query_filter,
+                "top_k": 3,
+                "timeout_sec": main_collection_info.get("timeout_sec"),
+            })
             # 추가 컬렉션들에서 벡터 검색
             for col_info in additional_collections_info:
                 col_name = col_info.get("name")
                 col_vector_index = col_info.get("vector_index")
                 if col_name and col_vector_index:
-                    additional_docs_text = perform_vector_search(
-                        query_embedding,
-                        collection_name=col_name,
-                        vector_index_name=col_vector_index,
-                        query_filter=query_filter,
-                        top_k=2
-                    )
-                    all_retrieved_docs_text.extend(additional_docs_text)
+                    search_specs.append({
+                        "query_embedding": query_embedding,
+                        "collection_name": col_name,
+                        "vector_index_name": col_vector_index,
+                        "query_filter": query_filter,
+                        "top_k": 2,
+                        "timeout_sec": col_info.get("timeout_sec"),
+                    })
+
+        # 모든 컬렉션 검색을 동시에 실행하고 점수 순으로 병합 (제한 시간을 넘긴 컬렉션은 제외)
+        scored_docs = fan_out_vector_search(search_specs)
+        all_retrieved_docs_text = [text for text, _, _ in scored_docs]
 
         if not all_retrieved_docs_text:
             print("디버그: 검색된 관련 문서가 없습니다.")
@@ -8,16 +8,6 @@ def classify_intent(state: ChatState) -> ChatState:
     # get() 메서드를 사용하여 키가 없을 경우 빈 리스트를 반환해 오류를 방지합니다.
     messages = state.get("messages", [])
     
-    # 📌 수정된 부분: 의도 분류와 슬롯 추출을 분리합니다.
-    # 의도 분류: 전체 맥락 사용, 슬롯 추출: 현재 사용자 질문만 사용
-    if len(messages) > 1:
-        # 의도 분류를 위해 전체 대화 기록 사용
-        full_text_with_history = " ".join([m.content for m in messages])
-        text_to_classify = full_text_with_history
-    else:
-        # 대화가 첫 번째 턴일 경우, 사용자 입력만 사용
-        text_to_classify = state["user_input"]
-
     # 📌 수정된 부분: 의도 분류와 슬롯 추출 모두 현재 질문만 사용
     # 현재 사용자의 순수한 질문만 추출
     current_user_question = messages[-1].content if messages else state["user_input"]
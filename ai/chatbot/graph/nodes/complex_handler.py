@@ -1,11 +1,17 @@
+import html
 import json
-from typing import Dict, Any, List
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Tuple
 from langgraph.graph import StateGraph, END
 from functools import partial
 from chatbot.graph.state import ChatState
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage
 import re
 from chatbot.graph.utils.formatting_utils import get_enhanced_prompt
+from chatbot.graph.utils.history_context import build_history_context, record_prompt_usage
 
 # 환경 변수를 로드합니다.
 from dotenv import load_dotenv
@@ -13,6 +19,21 @@ load_dotenv()
 
 # 설정된 openai 클라이언트를 사용합니다.
 from chatbot.rag.config import client
+from chatbot.rag.streaming import llm_response, streaming_mode
+
+# 하위 질문 동시 처리 설정
+COMPLEX_INTENT_MAX_WORKERS = int(os.getenv("COMPLEX_INTENT_MAX_WORKERS", "4"))
+COMPLEX_INTENT_BRANCH_TIMEOUT_SEC = float(os.getenv("COMPLEX_INTENT_BRANCH_TIMEOUT_SEC", "30"))
+# 스레드 풀이 바빠 하위 질문이 시작되지 못하고 기다릴 수 있는 최대 시간 (처리 제한 시간과 별도)
+COMPLEX_INTENT_QUEUE_TIMEOUT_SEC = float(os.getenv("COMPLEX_INTENT_QUEUE_TIMEOUT_SEC", "30"))
+# 하위 답변 병합 방식: html(기본, 결정적 섹션 병합) | llm(기존 방식, LLM으로 재정리)
+COMPLEX_INTENT_MERGE_MODE = os.getenv("COMPLEX_INTENT_MERGE_MODE", "html").lower()
+
+_HTML_TAG_PATTERN = re.compile(r"<(p|ul|ol|li|h[1-6]|div|strong|span|br|table)\b", re.IGNORECASE)
+
+_branch_executor = None
+_branch_executor_pid = None
+_branch_executor_lock = threading.Lock()
 
 DISCLAIMER = (
     "\n\n"
@@ -25,7 +46,8 @@ def _remove_disclaimer(text: str) -> str:
     """텍스트에서 미리 정의된 주의 문구를 제거합니다."""
     return re.sub(re.escape(DISCLAIMER), "", text, flags=re.DOTALL).strip()
 
-def _decompose_and_classify_queries(user_query: str, supported_intents: List[str], messages: List[Any]) -> List[Dict[str, str]]:
+def _decompose_and_classify_queries(user_query: str, supported_intents: List[str], messages: List[Any],
+                                    carried_slots: List[Any] = None) -> List[Dict[str, str]]:
     """
     LLM을 사용하여 복합 의도 질문을 단일 질문으로 분해하고 의도를 분류합니다.
     이전 대화 맥락을 활용하여 후속 질문을 처리합니다.
@@ -60,15 +82,12 @@ def _decompose_and_classify_queries(user_query: str, supported_intents: List[str
     messages_for_llm = [
         {"role": "system", "content": system_prompt}
     ]
-    # 전체 대화 기록을 프롬프트에 추가
-    for msg in messages:
-        if isinstance(msg, HumanMessage):
-            messages_for_llm.append({"role": "user", "content": msg.content})
-        elif isinstance(msg, AIMessage):
-            messages_for_llm.append({"role": "assistant", "content": msg.content})
+    # 최근 대화 창 + 이전 대화 요약을 프롬프트에 추가 (이전 답변 HTML 제거, 토큰 예산 적용)
+    messages_for_llm.extend(build_history_context(messages, carried_slots, name="complex_decompose"))
     
-    # 현재 질문을 가장 마지막에 추가
-    messages_for_llm.append({"role": "user", "content": user_query})
+    # 현재 질문을 가장 마지막에 추가 (대화 기록의 마지막 질문과 같으면 중복 추가하지 않음)
+    if not (messages and isinstance(messages[-1], HumanMessage) and messages[-1].content == user_query):
+        messages_for_llm.append({"role": "user", "content": user_query})
 
     try:
         response = client.chat.completions.create(
@@ -77,6 +96,7 @@ def _decompose_and_classify_queries(user_query: str, supported_intents: List[str
             temperature=0.1,
             response_format={"type": "json_object"}
         )
+        record_prompt_usage("complex_decompose", response)
         result = response.choices[0].message.content
         parsed_result = json.loads(result)
         return parsed_result.get("decomposed_queries", [])
@@ -100,21 +120,59 @@ def _combine_responses(original_query: str, responses: List[str]) -> str:
     
     return combined_text.strip()
 
-# ----------------------------------------------------------------------
-# 챗봇의 메인 그래프에서 호출되는 함수
-def handle_complex_intent(state: ChatState, handlers: Dict[str, Any], supported_intents: List[str]):
-    """복합 의도 질문을 분리하고 처리하는 메인 함수"""
-    user_input = state["user_input"]
-    messages = state.get("messages", [])
-    print("--- 복합 의도 처리 시작 ---")
+def _merge_with_llm(user_input: str, responses: List[str]):
+    """하위 답변들을 LLM으로 다시 정리합니다. (COMPLEX_INTENT_MERGE_MODE=llm)"""
+    final_response_text = _combine_responses(user_input, responses)
+    
+    # 포맷팅 지침이 포함된 프롬프트로 최종 응답 생성
+    enhanced_prompt = get_enhanced_prompt("당신은 인천국제공항 AI 어시스턴트입니다. 복합적인 질문에 체계적으로 답변해주세요.", "complex_intent")
+    
+    # 스트리밍 모드에서는 LLMStream 반환
+    return llm_response(
+        client,
+        {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": enhanced_prompt},
+                {"role": "user", "content": final_response_text}
+            ],
+            "temperature": 0.1,
+            "max_tokens": 1200,
+        },
+        suffix=DISCLAIMER,
+        clean=False,
+    )
 
-    # 📌 핵심 변경점: LLM을 사용하여 전체 맥락을 고려한 질문 분해
-    decomposed_queries = _decompose_and_classify_queries(user_input, supported_intents, messages)
-    print(f"분해된 질문: {decomposed_queries}")
+def _to_html_block(text: str) -> str:
+    """하위 답변을 섹션 본문으로 변환 (HTML이 아니면 <p>로 감싸고, 답변 안의 <h3>은 <h4>로 낮춤)"""
+    text = text.strip()
+    if not _HTML_TAG_PATTERN.search(text):
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+        return "".join(f"<p>{html.escape(p)}</p>".replace("\n", "<br>") for p in paragraphs)
+    return re.sub(r"<(/?)h3\b", r"<\1h4", text, flags=re.IGNORECASE)
 
-    all_responses = []
-    
-    # 단일 의도 처리를 위한 서브그래프 생성
+def _assemble_html_sections(question_responses: List[Tuple[str, str]]) -> str:
+    """
+    (질문, 답변) 리스트를 질문별 제목이 붙은 하나의 HTML 문서로 합칩니다. (LLM 호출 없음, 결정적)
+    """
+    if not question_responses:
+        return "<p>죄송합니다. 요청하신 정보를 찾을 수 없습니다. 다시 질문해주세요.</p>"
+    if len(question_responses) == 1:
+        return _to_html_block(question_responses[0][1])
+
+    sections = []
+    for question, response in question_responses:
+        sections.append(
+            f'<h3 style="color: #1976D2;">{html.escape(question)}</h3>\n'
+            f"{_to_html_block(response)}"
+        )
+    return "\n<hr>\n".join(sections)
+
+def build_dispatch_subgraph(handlers: Dict[str, Any]):
+    """
+    분해된 단일 질문을 의도별 핸들러로 보내는 서브그래프를 만듭니다.
+    핸들러 구성이 바뀌지 않으므로 그래프 빌드 시 한 번만 컴파일해 재사용합니다.
+    """
     subgraph_builder = StateGraph(ChatState)
     subgraph_builder.add_node("entry_point", partial(_initial_dispatch, handlers=handlers))
     for name, handler in handlers.items():
@@ -128,40 +186,119 @@ def handle_complex_intent(state: ChatState, handlers: Dict[str, Any], supported_
         return f"{intent}_handler" if f"{intent}_handler" in handlers else "default_handler"
 
     subgraph_builder.add_conditional_edges("entry_point", subgraph_router)
-    subgraph = subgraph_builder.compile()
+    return subgraph_builder.compile()
+
+def _get_branch_executor() -> ThreadPoolExecutor:
+    """하위 질문 처리용 스레드 풀 (fork 이후 워커 프로세스별로 새로 생성)"""
+    global _branch_executor, _branch_executor_pid
+    if _branch_executor is None or _branch_executor_pid != os.getpid():
+        with _branch_executor_lock:
+            if _branch_executor is None or _branch_executor_pid != os.getpid():
+                _branch_executor = ThreadPoolExecutor(
+                    max_workers=COMPLEX_INTENT_MAX_WORKERS, thread_name_prefix="complex-intent"
+                )
+                _branch_executor_pid = os.getpid()
+    return _branch_executor
 
-    for item in decomposed_queries:
-        question = item["question"]
-        intent = item["intent"]
-        
-        # 분해된 각 질문에 대해 새로운 상태를 만들고 서브그래프 호출
+def _invoke_sub_question(subgraph, question: str, intent: str) -> str:
+    # 분해된 각 질문에 대해 새로운 상태를 만들고 서브그래프 호출
+    # 하위 질문의 답변은 합쳐서 다시 정리하므로 스트리밍 모드에서도 완성된 문자열로 받음
+    with streaming_mode(False):
         sub_state = {"user_input": question, "intent": intent, "response": None}
         result = subgraph.invoke(sub_state)
-        response_content = result.get("response", "")
-        if response_content:
-            cleaned_response = _remove_disclaimer(response_content)
-            all_responses.append(cleaned_response)
+    response_content = result.get("response", "")
+    return _remove_disclaimer(str(response_content)) if response_content else ""
 
-    final_response_text = _combine_responses(user_input, all_responses)
-    
-    # 포맷팅 지침이 포함된 프롬프트로 최종 응답 생성
-    enhanced_prompt = get_enhanced_prompt("당신은 인천국제공항 AI 어시스턴트입니다. 복합적인 질문에 체계적으로 답변해주세요.", "complex_intent")
-    
-    llm_response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": enhanced_prompt},
-            {"role": "user", "content": final_response_text}
-        ],
-        temperature=0.1,
-        max_tokens=1200
+class _Branch:
+    """하위 질문 하나의 실행 상태 (처리 제한 시간은 스레드 풀에서 실제로 시작한 시점부터 계산)"""
+
+    def __init__(self):
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+
+    def run(self, subgraph, question: str, intent: str) -> str:
+        self.started_at = time.monotonic()
+        return _invoke_sub_question(subgraph, question, intent)
+
+    def wait(self, future) -> str:
+        while True:
+            now = time.monotonic()
+            if self.started_at is None:
+                # 아직 스레드 풀 대기열에 있음 (다른 요청의 하위 질문이 처리 중)
+                remaining = COMPLEX_INTENT_QUEUE_TIMEOUT_SEC - (now - self.submitted_at)
+                wait_sec = min(remaining, 0.05)
+            else:
+                remaining = COMPLEX_INTENT_BRANCH_TIMEOUT_SEC - (now - self.started_at)
+                wait_sec = remaining
+            if remaining <= 0:
+                raise FutureTimeoutError()
+            try:
+                return future.result(timeout=wait_sec)
+            except FutureTimeoutError:
+                continue
+
+def _run_sub_questions(subgraph, decomposed_queries: List[Dict[str, str]]) -> Tuple[List[Tuple[str, str]], bool]:
+    """
+    분해된 질문들을 스레드 풀에서 동시에 실행하고 입력 순서대로 (질문, 답변) 리스트를 반환합니다.
+    제한 시간(COMPLEX_INTENT_BRANCH_TIMEOUT_SEC, 실제 시작 시점부터)을 넘기거나 실패한 질문은 안내 문구로 대신하고,
+    이 경우 두 번째 반환값(partial)이 True입니다. (단일 질문도 같은 경로로 처리)
+    """
+    executor = _get_branch_executor()
+    branches = [_Branch() for _ in decomposed_queries]
+    futures = [
+        executor.submit(branch.run, subgraph, item["question"], item["intent"])
+        for branch, item in zip(branches, decomposed_queries)
+    ]
+
+    all_responses, is_partial = [], False
+    for item, branch, future in zip(decomposed_queries, branches, futures):
+        try:
+            response = branch.wait(future)
+        except FutureTimeoutError:
+            future.cancel()
+            is_partial = True
+            print(f"디버그: 하위 질문 '{item['question']}' 처리 시간 초과 ({COMPLEX_INTENT_BRANCH_TIMEOUT_SEC}초)")
+            response = f"'{item['question']}'에 대한 정보는 지금 바로 확인하기 어렵습니다. 잠시 후 다시 질문해주세요."
+        except Exception as e:
+            is_partial = True
+            print(f"디버그: 하위 질문 '{item['question']}' 처리 중 오류 발생 - {e}")
+            response = f"'{item['question']}'에 대한 정보를 처리하는 중 문제가 발생했습니다."
+        if response:
+            all_responses.append((item["question"], response))
+    return all_responses, is_partial
+
+# ----------------------------------------------------------------------
+# 챗봇의 메인 그래프에서 호출되는 함수
+def handle_complex_intent(state: ChatState, handlers: Dict[str, Any], supported_intents: List[str], subgraph=None):
+    """복합 의도 질문을 분리하고 처리하는 메인 함수"""
+    user_input = state["user_input"]
+    messages = state.get("messages", [])
+    print("--- 복합 의도 처리 시작 ---")
+
+    # 📌 핵심 변경점: LLM을 사용하여 전체 맥락을 고려한 질문 분해
+    decomposed_queries = _decompose_and_classify_queries(
+        user_input, supported_intents, messages, state.get("previous_slots", [])
     )
-    final_response = llm_response.choices[0].message.content
-    final_response += DISCLAIMER
+    print(f"분해된 질문: {decomposed_queries}")
+
+    # 단일 의도 처리를 위한 서브그래프 (build_chat_graph에서 한 번만 컴파일해 전달)
+    if subgraph is None:
+        subgraph = build_dispatch_subgraph(handlers)
+
+    # 분해된 각 질문을 동시에 처리하고, 원래 질문 순서대로 답변을 모음
+    question_responses, is_partial = _run_sub_questions(subgraph, decomposed_queries)
+
+    if COMPLEX_INTENT_MERGE_MODE == "llm":
+        final_response = _merge_with_llm(user_input, [response for _, response in question_responses])
+    else:
+        # 하위 답변은 이미 HTML이므로 LLM 재호출 없이 섹션으로 합침
+        final_response = _assemble_html_sections(question_responses) + DISCLAIMER
     
     print("--- 복합 의도 처리 완료 ---")
     
     state["response"] = final_response
     state["intent"] = "complex_intent"
+    # 안내 문구로 대신한 하위 답변이 있으면 시맨틱 캐시에 저장하지 않음 (cache_policy.resolve_cache_policy)
+    state["partial"] = is_partial
     
     return state
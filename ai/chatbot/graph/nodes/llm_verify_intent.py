@@ -1,23 +1,20 @@
 import json
 from typing import Dict, Any
-from openai import OpenAI
 from chatbot.graph.state import ChatState
-from dotenv import load_dotenv
-from pathlib import Path
-import os
-from langchain_core.messages import HumanMessage, AIMessage
+from chatbot.graph.utils.history_context import build_history_context, record_prompt_usage
 
-env_path = Path(__file__).resolve().parents[2] / ".env"
-load_dotenv(dotenv_path=env_path, override=True)
+# OpenAI 클라이언트는 rag/config.py의 공용 클라이언트를 사용 (첫 사용 시 생성)
+from chatbot.rag.config import client, async_client
 
-api_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=api_key)
 
-def llm_verify_intent_node(state: ChatState) -> ChatState:
+def _build_verify_messages(state: ChatState) -> list:
+    """의도 검증/질문 재구성용 LLM 메시지 (이전 대화 기록 포함)"""
     user_input = state["user_input"]
     initial_intent = state["intent"]
     messages = state.get("messages", [])
     current_slots = state.get("slots", [])
+    # 이전 질문에서 넘어온 슬롯 (아래에서 현재 슬롯으로 덮어쓰기 전에 보관)
+    carried_slots = state.get("previous_slots", [])
 
     # ✅ 추가된 로직: 현재 슬롯을 다음 턴에서 사용할 수 있도록 previous_slots에 저장
     if current_slots:
@@ -71,44 +68,62 @@ def llm_verify_intent_node(state: ChatState) -> ChatState:
     messages_for_llm = [
         {"role": "system", "content": system_prompt}
     ]
-    # 전체 대화 기록을 `messages_for_llm`에 추가
-    for msg in messages:
-        if isinstance(msg, HumanMessage):
-            messages_for_llm.append({"role": "user", "content": msg.content})
-        elif isinstance(msg, AIMessage):
-            messages_for_llm.append({"role": "assistant", "content": msg.content})
+    # 최근 대화 창 + 이전 대화 요약만 추가 (이전 답변 HTML 제거, 토큰 예산 적용)
+    messages_for_llm.extend(build_history_context(messages, carried_slots, name="llm_verify_intent"))
+    return messages_for_llm
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=messages_for_llm,
-            temperature=0.1,
-            response_format={"type": "json_object"}
-        )
-        
-        result = response.choices[0].message.content
-        parsed_result = json.loads(result)
-        
-        final_intents = parsed_result.get("final_intents", [])
-        rephrased_query = parsed_result.get("rephrased_query", "")
-
-        if final_intents:
-            # 상태에 복수 의도를 저장하거나, 'complex_intent'로 설정 후 실제 의도들을 별도 저장
-            # 여기서는 'complex_intent'로 라우팅하고 실제 의도들은 'detected_intents'에 저장하는 것이 좋습니다.
-            print(f"디버그: LLM 검증 결과, 최종 의도: {final_intents}, 재구성된 질문: '{rephrased_query}'")
-            state["intent"] = "complex_intent"  # 라우팅을 위해 복합 의도로 설정
-            state["detected_intents"] = [(intent, 1.0) for intent in final_intents] # 핸들러가 처리할 실제 의도 리스트
+
+def _verify_request(messages_for_llm: list) -> dict:
+    return {
+        "model": "gpt-4o-mini",
+        "messages": messages_for_llm,
+        "temperature": 0.1,
+        "response_format": {"type": "json_object"},
+    }
+
+
+def _apply_verify_result(state: ChatState, result: str) -> ChatState:
+    """LLM 검증 결과(JSON 문자열)를 state에 반영합니다."""
+    parsed_result = json.loads(result)
+    
+    final_intents = parsed_result.get("final_intents", [])
+    rephrased_query = parsed_result.get("rephrased_query", "")
+
+    if final_intents:
+        # 상태에 복수 의도를 저장하거나, 'complex_intent'로 설정 후 실제 의도들을 별도 저장
+        # 여기서는 'complex_intent'로 라우팅하고 실제 의도들은 'detected_intents'에 저장하는 것이 좋습니다.
+        print(f"디버그: LLM 검증 결과, 최종 의도: {final_intents}, 재구성된 질문: '{rephrased_query}'")
+        state["intent"] = "complex_intent"  # 라우팅을 위해 복합 의도로 설정
+        state["detected_intents"] = [(intent, 1.0) for intent in final_intents] # 핸들러가 처리할 실제 의도 리스트
+        state["rephrased_query"] = rephrased_query
+    else:
+        # 복합 의도가 아닌 경우, 기존처럼 단일 의도를 처리하는 로직 추가
+        single_intent = parsed_result.get("final_intent")
+        if single_intent:
+            print(f"디버그: LLM 검증 결과, 최종 의도: {single_intent}, 재구성된 질문: '{rephrased_query}'")
+            state["intent"] = single_intent
             state["rephrased_query"] = rephrased_query
-        else:
-            # 복합 의도가 아닌 경우, 기존처럼 단일 의도를 처리하는 로직 추가
-            single_intent = parsed_result.get("final_intent")
-            if single_intent:
-                print(f"디버그: LLM 검증 결과, 최종 의도: {single_intent}, 재구성된 질문: '{rephrased_query}'")
-                state["intent"] = single_intent
-                state["rephrased_query"] = rephrased_query
-        
+    return state
+
+
+def llm_verify_intent_node(state: ChatState) -> ChatState:
+    messages_for_llm = _build_verify_messages(state)
+    try:
+        response = client.chat.completions.create(**_verify_request(messages_for_llm))
+        record_prompt_usage("llm_verify_intent", response)
+        _apply_verify_result(state, response.choices[0].message.content)
+    except Exception as e:
+        print(f"디버그: LLM 의도 검증 또는 파싱 실패 - {e}")
+    return state
+
+
+async def allm_verify_intent_node(state: ChatState) -> ChatState:
+    """llm_verify_intent_node의 비동기 버전 (AsyncOpenAI, chat_graph.ainvoke 경로)"""
+    messages_for_llm = _build_verify_messages(state)
+    try:
+        response = await async_client.chat.completions.create(**_verify_request(messages_for_llm))
+        record_prompt_usage("llm_verify_intent", response)
+        _apply_verify_result(state, response.choices[0].message.content)
     except Exception as e:
         print(f"디버그: LLM 의도 검증 또는 파싱 실패 - {e}")
-        pass
-        
-    return state
\ No newline at end of file
+    return state
@@ -5,6 +5,8 @@ class ChatState(TypedDict, total=False):
     user_input: str
     intent: str
     slots: list
+    # 이전 턴의 슬롯 (classify_intent가 채움, 대화 기록 요약에서 이어지는 개체로 사용)
+    previous_slots: list
     response: str
     confidence: float
     top_k_intents_and_probs: List[Tuple[str, float]]
@@ -14,4 +16,6 @@ class ChatState(TypedDict, total=False):
     rephrased_query: str
     # 복합 의도 처리를 위한 키들
     detected_intents: List[Tuple[str, float]]
-    is_multi_intent: bool 
\ No newline at end of file
+    is_multi_intent: bool
+    # 복합 의도 하위 질문 중 시간 초과/실패로 안내 문구를 넣은 답변 (시맨틱 캐시에 저장하지 않음)
+    partial: bool 
\ No newline at end of file
@@ -1,5 +1,6 @@
 # formatting_utils.py - 공통 포맷팅 지침 관리
 from chatbot.rag.config import DISCLAIMER, client
+from chatbot.rag.streaming import llm_response
 
 # 공통 포맷팅 지침 (모든 의도에서 공통으로 사용)
 COMMON_FORMATTING_SUFFIX = """
@@ -77,25 +78,21 @@ def get_formatted_llm_response(original_prompt, user_query, intent_name=None, te
     # 포맷팅 지침이 포함된 프롬프트 생성
     enhanced_prompt = get_enhanced_prompt(original_prompt, intent_name)
     
-    # LLM 호출
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": enhanced_prompt},
-            {"role": "user", "content": user_query}
-        ],
-        temperature=temperature,
-        max_tokens=max_tokens
-    )
-    
-    final_response = response.choices[0].message.content
-    
+    # LLM 호출 (스트리밍 모드에서는 LLMStream 반환)
     # DISCLAIMER 추가 (complex_intent가 아닌 경우에만)
-    if intent_name != "complex_intent":
-        final_response += DISCLAIMER
-    
-    final = final_response.replace("```html", "").replace("```", "").replace("**", "")
-    return final
+    return llm_response(
+        client,
+        {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": enhanced_prompt},
+                {"role": "user", "content": user_query}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        suffix=DISCLAIMER if intent_name != "complex_intent" else "",
+    )
 
 def get_formatted_llm_response_single_message(full_prompt, intent_name=None, temperature=0.5, max_tokens=800, role="user"):
     """
@@ -114,23 +111,18 @@ def get_formatted_llm_response_single_message(full_prompt, intent_name=None, tem
     # 포맷팅 지침 추가
     enhanced_prompt = get_enhanced_prompt(full_prompt, intent_name)
     
-    # LLM 호출
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": role, "content": enhanced_prompt}
-        ],
-        temperature=temperature,
-        max_tokens=max_tokens
-    )
-    
-    final_response = response.choices[0].message.content
-    
+    # LLM 호출 (스트리밍 모드에서는 LLMStream 반환)
     # DISCLAIMER 추가 (complex_intent가 아닌 경우에만)
-    if intent_name != "complex_intent":
-        final_response += DISCLAIMER
-    
-    final = final_response.replace("```html", "").replace("```", "").replace("**", "")
-
-    return final
+    return llm_response(
+        client,
+        {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": role, "content": enhanced_prompt}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        suffix=DISCLAIMER if intent_name != "complex_intent" else "",
+    )
 
@@ -0,0 +1,147 @@
+# history_context.py - LLM 호출용 대화 기록 창(window) + 요약
+"""
+의도 검증(llm_verify_intent)과 복합 질문 분해(complex_handler)에 넘기는 대화 기록을 제한합니다.
+
+- 최근 HISTORY_WINDOW_TURNS턴(사용자 질문 + 답변)만 원문으로 넣고, 이전 AI 답변은 HTML을 제거해 HISTORY_AI_MESSAGE_MAX_CHARS로 자릅니다.
+- 창 밖의 이전 턴은 질문/답변 첫머리만 모은 요약 한 건(system 메시지)으로 넣고, 이전 질문에서 넘어온 슬롯(개체)도 함께 적습니다.
+- 추정 토큰 수가 HISTORY_TOKEN_BUDGET을 넘으면 오래된 메시지부터 뺍니다. (현재 질문은 항상 유지)
+- 메트릭: llm_context.<이름>.tokens_full(전체 기록 기준) / tokens_sent(실제 전송) / tokens_saved, prompt_tokens(OpenAI usage)
+"""
+import html
+import os
+import re
+from typing import List, Optional
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from shared.metrics import get_counter, get_histogram
+
+HISTORY_WINDOW_TURNS = int(os.getenv("HISTORY_WINDOW_TURNS", "2"))
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "800"))
+HISTORY_AI_MESSAGE_MAX_CHARS = int(os.getenv("HISTORY_AI_MESSAGE_MAX_CHARS", "400"))
+HISTORY_SUMMARY_ITEM_CHARS = int(os.getenv("HISTORY_SUMMARY_ITEM_CHARS", "60"))
+
+TOKEN_BUCKETS = (50, 100, 200, 400, 800, 1600, 3200, 6400)
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_BLOCK_TAG_PATTERN = re.compile(r"</?(p|li|ul|ol|h[1-6]|div|br|tr|table)\b[^>]*>", re.IGNORECASE)
+_SPACE_PATTERN = re.compile(r"\s+")
+
+
+def strip_html(text: str) -> str:
+    """HTML 태그/엔티티 제거 (블록 태그는 공백으로 바꿔 문장이 붙지 않도록)"""
+    text = _BLOCK_TAG_PATTERN.sub(" ", text or "")
+    text = _TAG_PATTERN.sub("", text)
+    return _SPACE_PATTERN.sub(" ", html.unescape(text)).strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (tokenizer 없이)
+    gpt-4o 계열 기준 한글 등 비ASCII 문자는 약 1.5자, ASCII는 약 4자당 1토큰으로 계산합니다.
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return int(non_ascii / 1.5 + (len(text) - non_ascii) / 4) + 1
+
+
+def _message_tokens(message: dict) -> int:
+    # 메시지마다 role 등 고정 오버헤드 약 4토큰
+    return estimate_tokens(message["content"]) + 4
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def _to_llm_message(message) -> Optional[dict]:
+    if isinstance(message, HumanMessage):
+        return {"role": "user", "content": message.content}
+    if isinstance(message, AIMessage):
+        return {"role": "assistant", "content": _clip(strip_html(message.content), HISTORY_AI_MESSAGE_MAX_CHARS)}
+    return None
+
+
+def _split_turns(messages) -> list:
+    """메시지 목록을 사용자 질문으로 시작하는 턴 단위로 나눕니다."""
+    turns = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _summarize_turns(turns) -> List[str]:
+    lines = []
+    for turn in turns:
+        question = next((m.content for m in turn if isinstance(m, HumanMessage)), "")
+        answer = next((strip_html(m.content) for m in turn if isinstance(m, AIMessage)), "")
+        line = f"- 사용자: {_clip(question, HISTORY_SUMMARY_ITEM_CHARS)}"
+        if answer:
+            line += f" / 답변: {_clip(answer, HISTORY_SUMMARY_ITEM_CHARS)}"
+        lines.append(line)
+    return lines
+
+
+def _summary_message(summary_lines: List[str], carried_slots) -> Optional[dict]:
+    entities = [f"{word}({tag[2:] if tag[:2] in ('B-', 'I-') else tag})"
+                for word, tag in carried_slots or [] if tag and tag != "O"]
+    parts = []
+    if summary_lines:
+        parts.append("이전 대화 요약:\n" + "\n".join(summary_lines))
+    if entities:
+        parts.append("이전 질문의 주요 정보: " + ", ".join(entities))
+    if not parts:
+        return None
+    return {"role": "system", "content": "\n".join(parts)}
+
+
+def build_history_context(messages, carried_slots=None, name: str = "history",
+                          window_turns: int = None, token_budget: int = None) -> List[dict]:
+    """
+    대화 기록(LangChain 메시지) → LLM 메시지 목록 (system 프롬프트 뒤에 이어 붙일 부분)
+
+    Args:
+        messages: state["messages"] (마지막 항목이 현재 질문)
+        carried_slots: 이전 턴에서 넘어온 슬롯 [(단어, BIO 태그)]
+        name: 메트릭 이름 (호출 위치 구분)
+    """
+    window_turns = HISTORY_WINDOW_TURNS if window_turns is None else window_turns
+    token_budget = HISTORY_TOKEN_BUDGET if token_budget is None else token_budget
+
+    turns = _split_turns(messages or [])
+    # 최근 window_turns턴 + 현재 질문 턴은 원문, 그 이전은 요약
+    keep = max(0, window_turns) + 1
+    older, recent = turns[:-keep], turns[-keep:]
+    summary_lines = _summarize_turns(older)
+
+    window = [m for m in (_to_llm_message(message) for turn in recent for message in turn) if m]
+    summary = _summary_message(summary_lines, carried_slots)
+
+    # 토큰 예산 초과 시 현재 질문을 제외한 오래된 창 메시지 → 요약의 오래된 줄 순으로 제거
+    def total():
+        return sum(_message_tokens(m) for m in window) + (_message_tokens(summary) if summary else 0)
+
+    while total() > token_budget and len(window) > 1:
+        window.pop(0)
+    while total() > token_budget and summary_lines:
+        summary_lines.pop(0)
+        summary = _summary_message(summary_lines, carried_slots)
+
+    context = ([summary] if summary else []) + window
+
+    tokens_full = sum(_message_tokens({"content": m.content}) for m in messages or [])
+    tokens_sent = total()
+    get_counter(f"llm_context.{name}.tokens_full").inc(tokens_full)
+    get_counter(f"llm_context.{name}.tokens_sent").inc(tokens_sent)
+    get_histogram(f"llm_context.{name}.tokens_saved", TOKEN_BUCKETS).observe(max(0, tokens_full - tokens_sent))
+    return context
+
+
+def record_prompt_usage(name: str, response):
+    """OpenAI 응답의 실제 프롬프트 토큰 수 기록 (usage가 없으면 무시)"""
+    usage = getattr(response, "usage", None)
+    if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+        get_histogram(f"llm_context.{name}.prompt_tokens", TOKEN_BUCKETS).observe(usage.prompt_tokens)
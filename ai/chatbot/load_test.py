@@ -0,0 +1,100 @@
+"""
+/chatbot/generate(동기, WSGI) vs /chatbot/generate/async(비동기, ASGI) 동시성 부하 테스트
+
+같은 질문 세트를 동시 요청 수(concurrency)만큼 병렬로 보내 처리량과 지연 시간을 비교합니다.
+서버는 미리 띄워 두어야 합니다. (워커 수를 같게 맞춰 비교)
+
+    # WSGI (sync 워커 1개)
+    GUNICORN_WORKERS=1 gunicorn -c gunicorn.conf.py chatbot_core.wsgi:application
+    # ASGI (uvicorn 워커 1개)
+    GUNICORN_WORKERS=1 GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+        gunicorn -c gunicorn.conf.py chatbot_core.asgi:application
+
+ai/ 디렉토리에서 실행:
+    python -m chatbot.load_test --base-url http://127.0.0.1:8000 --concurrency 20 --requests 100
+    python -m chatbot.load_test --endpoints generate/async --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+DEFAULT_QUESTIONS = [
+    "1터미널 혼잡도 알려줘",
+    "대한항공 고객센터 전화번호 알려줘",
+    "제2터미널 약국 어디야?",
+    "장기주차장 요금 얼마야?",
+    "환승할 때 짐 다시 찾아야 해?",
+    "보조배터리 기내 반입 돼?",
+    "탑승동에서 제2터미널로 가는 길 알려줘",
+    "인천공항 지금 날씨 어때?",
+]
+
+
+async def _send(client, url, question, latencies, errors):
+    payload = {
+        "session_id": f"load-{uuid.uuid4().hex}",  # 세션 캐시 영향을 받지 않도록 요청마다 새 세션
+        "message_id": uuid.uuid4().hex,
+        "parent_id": None,
+        "content": question,
+    }
+    started = time.perf_counter()
+    try:
+        response = await client.post(url, json=payload)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    except Exception as e:
+        errors.append(str(e))
+
+
+async def run(url, questions, total_requests, concurrency, timeout_sec):
+    latencies, errors = [], []
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=timeout_sec, limits=limits) as client:
+        async def worker(i):
+            async with semaphore:
+                await _send(client, url, questions[i % len(questions)], latencies, errors)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(total_requests)))
+        elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "ok": len(latencies),
+        "errors": len(errors),
+        "elapsed_sec": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(ordered) if ordered else 0.0,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0,
+        "sample_error": errors[0] if errors else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동기/비동기 generate 엔드포인트 동시성 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoints", nargs="+", default=["generate", "generate/async"])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    print(f"요청 수: {args.requests}, 동시 요청: {args.concurrency}")
+    print(f"{'엔드포인트':<24}{'성공':>6}{'실패':>6}{'req/s':>10}{'p50(ms)':>12}{'p95(ms)':>12}")
+    for endpoint in args.endpoints:
+        url = f"{args.base_url.rstrip('/')}/chatbot/{endpoint}"
+        result = asyncio.run(run(url, DEFAULT_QUESTIONS, args.requests, args.concurrency, args.timeout))
+        print(f"{endpoint:<24}{result['ok']:>6}{result['errors']:>6}{result['rps']:>10.2f}"
+              f"{result['p50_ms']:>12.1f}{result['p95_ms']:>12.1f}")
+        if result["sample_error"]:
+            print(f"  예시 오류: {result['sample_error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 import sys
 from langchain_core.messages import HumanMessage, AIMessage
-from chatbot.graph.flow import build_chat_graph
 
-# 챗봇 그래프를 빌드합니다.
-chat_graph = build_chat_graph()
+from shared.lazy import LazyResource
+
+
+def _build_chat_graph():
+    # 그래프 모듈(핸들러, 의도 분류 모델 등)은 그래프가 처음 필요할 때 import
+    from chatbot.graph.flow import build_chat_graph
+    return build_chat_graph()
+
+
+# 챗봇 그래프를 빌드합니다. (첫 invoke 또는 warmup 시점에 빌드)
+chat_graph = LazyResource("chat_graph", _build_chat_graph)
 
 # 대화 기록을 담을 리스트를 초기 상태에 설정합니다.
 state = {
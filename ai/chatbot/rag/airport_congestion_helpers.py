@@ -1,5 +1,6 @@
 import json
 from chatbot.rag.config import db_client, client, db_name
+from chatbot.rag.llm_parse_cache import cached_llm_parser
 from datetime import datetime
 from pymongo.errors import ConnectionFailure, OperationFailure
 import re
@@ -127,6 +128,7 @@ def _get_daily_congestion_data_from_db() -> dict | None:
         print(f"디버그: 하루 합계 데이터 조회 중 오류 발생 - {e}")
         return None
     
+@cached_llm_parser("congestion_query")
 def _parse_query_with_llm(user_query: str) -> dict | None:
     # 📌 수정된 부분: 프롬프트 지시사항을 더 명확하게 강화
     prompt_content = (
@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 
 from chatbot.rag.config import client
 from chatbot.graph.utils.formatting_utils import get_enhanced_prompt
+from chatbot.rag.flight_status_client import fetch_flight_status
 
 load_dotenv()
 
@@ -12,10 +13,6 @@ SERVICE_KEY = os.getenv("SERVICE_KEY")
 if not SERVICE_KEY:
     raise ValueError("SERVICE_KEY 환경 변수가 설정되지 않았습니다.")
 
-FLIGHT_API_BASE_URL = "http://apis.data.go.kr/B551177/StatusOfPassengerFlightsDeOdp"
-FLIGHT_ARRIVAL_URL = f"{FLIGHT_API_BASE_URL}/getPassengerArrivalsDeOdp"
-
-
 
 def call_arrival_flight_api(params: dict):
     """
@@ -27,27 +24,12 @@ def call_arrival_flight_api(params: dict):
         **params
     }
     print(params_with_key)
-    api_url = FLIGHT_ARRIVAL_URL
     
     try:
-        response = requests.get(api_url, params=params_with_key)
-        response.raise_for_status()
-        response_data = response.json()
-        
-        body = response_data.get("response", {}).get("body", {})
-        total_count = body.get("totalCount", 0)
+        # 항공편 정보 핸들러와 같은 단기 캐시를 사용 (같은 편명 재조회 방지)
+        items = fetch_flight_status("arrival", {k: v for k, v in params_with_key.items() if v})
 
-        if total_count == 0:
-            return None
-        
-        items = body.get("items", {})
-        
-        flight_info = None
-        if isinstance(items, dict) and "item" in items:
-            item_data = items["item"]
-            flight_info = item_data[0] if isinstance(item_data, list) else item_data
-        elif isinstance(items, list) and len(items) > 0:
-            flight_info = items[0]
+        flight_info = items[0] if items else None
             
         if not flight_info or not isinstance(flight_info, dict):
             return None
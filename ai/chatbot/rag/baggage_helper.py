@@ -1,6 +1,8 @@
 import json
 from chatbot.rag.config import client
+from chatbot.rag.llm_parse_cache import cached_llm_parser
 
+@cached_llm_parser("baggage_rule_query")
 def _parse_baggage_rule_query_with_llm(user_query: str) -> dict | None:
     """
     LLM을 사용하여 복합 수하물 규정 질문을 개별 요청으로 분해하는 함수.
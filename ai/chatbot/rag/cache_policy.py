@@ -0,0 +1,120 @@
+"""
+시맨틱 답변 캐시의 의도별 정책 (TTL + 데이터 도메인)
+
+답변을 만든 의도에 따라 캐시 유지 시간을 다르게 둡니다.
+- 실시간 데이터(항공편 현황, 주차장 현황 등)는 짧게, 하루 한 번 갱신되는 정책/시설 정보는 길게 유지합니다.
+- TTL이 0인 의도는 캐시하지 않습니다.
+- '오늘', '내일', '지금'처럼 상대 날짜/시간 표현이 있는 질문은 KST 자정을 넘기지 않습니다.
+- 복합 의도는 하위 의도 중 가장 짧은 TTL, 도메인은 합집합을 사용합니다.
+- 하위 질문이 시간 초과/실패해 안내 문구가 들어간 답변(state["partial"])은 캐시하지 않습니다.
+- 이전 대화 맥락에 기대어 만든 답변도 캐시하지 않습니다. 캐시 키는 사용자 원문 질문인데 답변은
+  재구성된 질문(rephrased_query)이나 이전 질문에서 넘어온 슬롯(previous_slots)을 기준으로 하기 때문입니다.
+
+도메인은 DB/doit.py 일일 갱신 작업과 공유하는 이름입니다. 갱신 작업이 끝나면 DataVersion 컬렉션에
+도메인별 갱신 시각을 기록하고(DB/MongoDB/cache_invalidation.py), 시맨틱 캐시는 그보다 먼저 만든 항목을 버립니다.
+
+SEMANTIC_CACHE_INTENT_TTL(JSON, 예: '{"flight_info": 30}')로 의도별 TTL을 덮어쓸 수 있습니다.
+"""
+import json
+import os
+from typing import Optional
+
+from chatbot.rag.llm_parse_cache import RELATIVE_DATE_PATTERN, seconds_until_kst_midnight
+from chatbot.rag.semantic_cache import SEMANTIC_CACHE_TTL_SEC
+
+REALTIME_TTL_SEC = 60
+DAILY_TTL_SEC = 24 * 3600
+
+INTENT_CACHE_TTL_SEC = {
+    # 실시간 API/수집 데이터
+    "flight_info": REALTIME_TTL_SEC,
+    "baggage_claim_info": REALTIME_TTL_SEC,
+    "parking_availability_query": REALTIME_TTL_SEC,
+    "airport_weather_current": 300,
+    "airport_congestion_prediction": 600,
+    "parking_congestion_prediction": 600,
+    # 일일 갱신 데이터 (갱신 시 도메인 단위로 무효화)
+    "regular_schedule_query": 6 * 3600,
+    "airline_info_query": DAILY_TTL_SEC,
+    "airport_info": DAILY_TTL_SEC,
+    "facility_guide": DAILY_TTL_SEC,
+    "immigration_policy": DAILY_TTL_SEC,
+    "baggage_rule_query": DAILY_TTL_SEC,
+    "transfer_info": DAILY_TTL_SEC,
+    "transfer_route_guide": DAILY_TTL_SEC,
+    "parking_fee_info": DAILY_TTL_SEC,
+    "parking_walk_time_info": DAILY_TTL_SEC,
+    "parking_location_recommendation": DAILY_TTL_SEC,
+    "default_greeting": DAILY_TTL_SEC,
+}
+INTENT_CACHE_TTL_SEC.update(json.loads(os.getenv("SEMANTIC_CACHE_INTENT_TTL", "{}")))
+
+# 의도 → 답변 근거 데이터 도메인 (DB/doit.py의 갱신 작업 도메인과 같은 이름)
+INTENT_DATA_DOMAINS = {
+    "airline_info_query": ["airline"],
+    "airport_info": ["airport"],
+    "regular_schedule_query": ["flight_schedule", "airline"],
+    "facility_guide": ["facility"],
+    "immigration_policy": ["airport_policy"],
+    "baggage_rule_query": ["airport_policy"],
+    "transfer_info": ["airport_policy"],
+    "transfer_route_guide": ["airport_policy"],
+    "parking_fee_info": ["parking"],
+    "parking_walk_time_info": ["parking"],
+    "parking_location_recommendation": ["parking"],
+    "airport_congestion_prediction": ["congestion"],
+}
+
+
+def _entity_slots(slots) -> list:
+    """BIO 슬롯 중 개체 토큰만 [단어, 태그]로 (캐시 항목 태그용)"""
+    return [[word, tag] for word, tag in (slots or []) if tag and tag != "O"]
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def _depends_on_history(state: dict, question: str) -> bool:
+    """답변이 원문 질문만으로는 정해지지 않는 경우 (재구성된 질문 사용 또는 이전 슬롯 이어받음)"""
+    user_input = _normalize(state.get("user_input") or question)
+    rephrased = _normalize(state.get("rephrased_query"))
+    if rephrased and rephrased != user_input:
+        return True
+    # 현재 질문에 없는 이전 질문의 개체(예: 항공편명)가 넘어온 경우
+    return any(word not in user_input for word, _ in _entity_slots(state.get("previous_slots")))
+
+
+def resolve_cache_policy(state: dict, question: str) -> Optional[dict]:
+    """
+    그래프 실행 결과 state로 캐시 정책을 정합니다.
+
+    Returns:
+        {"intent", "slots", "domains", "ttl_sec"} 또는 캐시하지 않을 경우 None
+    """
+    if state.get("partial"):
+        return None
+    if _depends_on_history(state, question):
+        return None
+
+    intent = state.get("intent") or "default"
+    if intent == "complex_intent":
+        sub_intents = [name for name, _ in state.get("detected_intents") or []]
+    else:
+        sub_intents = [intent]
+    if not sub_intents:
+        return None
+
+    ttl_sec = min(INTENT_CACHE_TTL_SEC.get(name, SEMANTIC_CACHE_TTL_SEC) for name in sub_intents)
+    if RELATIVE_DATE_PATTERN.search(question or ""):
+        ttl_sec = min(ttl_sec, seconds_until_kst_midnight())
+    if ttl_sec <= 0:
+        return None
+
+    domains = sorted({domain for name in sub_intents for domain in INTENT_DATA_DOMAINS.get(name, [])})
+    return {
+        "intent": intent,
+        "slots": _entity_slots(state.get("slots")),
+        "domains": domains,
+        "ttl_sec": int(ttl_sec),
+    }
@@ -1,38 +1,48 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import os # API 키를 환경 변수에서 로드하기 위해 필요
 from dotenv import load_dotenv # dotenv 라이브러리 임포트
 from pathlib import Path # Path 객체 임포트
-from pymongo import MongoClient
+
+from shared.lazy import LazyResource
+from chatbot.rag.streaming import llm_response
+from chatbot.graph.db.mongo_client import get_mongo_client
 
 env_path = Path(__file__).resolve().parents[2] / ".env"
 load_dotenv(dotenv_path=env_path, override=True) # override=True 추가 권장
 
-api_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=api_key)
+# 외부 서비스 연결 타임아웃 (워커 기동/첫 요청이 외부 서비스 상태에 묶이지 않도록 상한 설정)
+OPENAI_TIMEOUT_SEC = float(os.getenv("OPENAI_TIMEOUT_SEC", "30"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
 
-# MongoDB 클라이언트
-try:
-    mongo_uri = os.getenv("MONGO_URI")
-    mongo_db_name = os.getenv("MONGO_DB_NAME")
-    if not mongo_uri or not mongo_db_name:
+# MongoDB 클라이언트 (공용 커넥션 풀, 첫 사용 시 연결)
+def _create_mongo_client():
+    if not os.getenv("MONGO_URI") or not os.getenv("MONGO_DB_NAME"):
         raise ValueError("MongoDB 환경 변수가 설정되지 않았습니다.")
-    mongo_client = MongoClient(mongo_uri)
-    mongo_client.admin.command('ping')
-    print("MongoDB에 성공적으로 연결되었습니다!")
-except Exception as e:
-    print(f"MongoDB 연결 오류: {e}")
-    mongo_client = None
-
-# OpenAI 클라이언트
-openai_api_key = os.getenv("OPENAI_API_KEY")
-if not openai_api_key:
-    raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
-openai_client = OpenAI(api_key=openai_api_key)
+    return get_mongo_client()
+
+
+# OpenAI 클라이언트 (프로세스 전체에서 하나만 사용, 첫 사용 시 생성)
+def _create_openai_client():
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key:
+        raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
+    return OpenAI(api_key=openai_api_key, timeout=OPENAI_TIMEOUT_SEC, max_retries=OPENAI_MAX_RETRIES)
+
+
+# 비동기 OpenAI 클라이언트 (chat_graph.ainvoke / ASGI 경로에서 사용)
+def _create_async_openai_client():
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key:
+        raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
+    return AsyncOpenAI(api_key=openai_api_key, timeout=OPENAI_TIMEOUT_SEC, max_retries=OPENAI_MAX_RETRIES)
+
 
 # 다른 파일에서 불러올 변수들
-db_client = mongo_client
-client = openai_client
-db_name = mongo_db_name
+db_client = LazyResource("mongo_client.rag_config", _create_mongo_client)
+client = LazyResource("openai_client", _create_openai_client)
+async_client = LazyResource("async_openai_client", _create_async_openai_client)
+db_name = os.getenv("MONGO_DB_NAME")
 
 
 # 각 의도(또는 핸들러)별 RAG 검색 설정을 정의합니다.
@@ -78,7 +88,7 @@ RAG_SEARCH_CONFIG = {
             "name": "TransitPathVector",
             "vector_index": "transitPath_vector_index"
         },
-        "additional_collections": [ # 추가 컬렉션 리스트
+        "additional_collections": [ # 추가 컬렉션 리스트 (컬렉션별 "timeout_sec"로 검색 제한 시간 지정 가능, 기본 RAG_SEARCH_TIMEOUT_SEC)
             {
                 "name": "ConnectionTimeVector",
                 "vector_index": "connectionTime_vector_index"
@@ -370,24 +380,23 @@ def common_llm_rag_caller(user_query: str, retrieved_context: str, intent_descri
             "8. 항공편 상태 정보는 적절한 색상으로 표시하세요 (출발: #E65100, 도착: #388E3C, 지연: #D32F2F)."
         )
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": html_system_prompt},
-                {"role": "user", "content": final_prompt}
-            ],
-            temperature=0.5,
-            max_tokens=700
+        # 스트리밍 모드(/api/generate/stream)에서는 LLMStream을 반환하고, 아니면 완성된 문자열을 반환
+        final_response = llm_response(
+            client,
+            {
+                "model": "gpt-4o-mini",
+                "messages": [
+                    {"role": "system", "content": html_system_prompt},
+                    {"role": "user", "content": final_prompt}
+                ],
+                "temperature": 0.5,
+                "max_tokens": 700,
+            },
+            suffix=DISCLAIMER if intent_name != "complex_intent" else "",
         )
-        
-        styled_response = response.choices[0].message.content
-        print(f"\n--- [최적화된 단일 LLM 응답] ---")
-        print(styled_response)
-
-        if intent_name != "complex_intent":
-            styled_response += DISCLAIMER
-
-        final_response = styled_response.replace("```html", "").replace("```", "").replace("**", "")
+        if isinstance(final_response, str):
+            print(f"\n--- [최적화된 단일 LLM 응답] ---")
+            print(final_response)
         return final_response
     
     except Exception as e:
@@ -0,0 +1,153 @@
+"""
+쿼리 임베딩 캐시
+
+같은 문자열(항공사 이름, "약국"/"환전소" 같은 시설명, 슬롯으로 만든 수하물 질의 등)이 반복해서 임베딩되므로
+(모델 ID, 정규화된 텍스트) 키로 결과를 메모이즈합니다.
+
+- 1차: 프로세스 내 LRU (EMBEDDING_CACHE_SIZE)
+- 2차: Redis (EMBEDDING_CACHE_REDIS=true일 때, 워커/인스턴스 간 공유)
+- 메트릭: embedding_cache.lru_hit / redis_hit / miss, embedding_cache.encode_ms / encode_batch_size
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+from shared.metrics import get_counter, get_histogram
+from shared.redis_client import get_redis, mark_redis_failed
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+EMBEDDING_CACHE_REDIS = os.getenv("EMBEDDING_CACHE_REDIS", "true").lower() == "true"
+EMBEDDING_CACHE_REDIS_TTL_SEC = int(os.getenv("EMBEDDING_CACHE_REDIS_TTL_SEC", str(7 * 24 * 3600)))
+
+_lru_hit = get_counter("embedding_cache.lru_hit")
+_redis_hit = get_counter("embedding_cache.redis_hit")
+_miss = get_counter("embedding_cache.miss")
+_encode_ms = get_histogram("embedding_cache.encode_ms")
+_encode_batch_size = get_histogram("embedding_cache.encode_batch_size", (1, 2, 4, 8, 16, 32, 64))
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키/임베딩 입력용 정규화 (유니코드 NFC + 공백 정리)"""
+    text = unicodedata.normalize("NFC", str(text))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class EmbeddingCache:
+    def __init__(self, model_getter, model_id, maxsize=EMBEDDING_CACHE_SIZE, use_redis=EMBEDDING_CACHE_REDIS):
+        """
+        Args:
+            model_getter: SentenceTransformer 인스턴스를 반환하는 함수 (첫 미스 때 호출)
+            model_id: 캐시 키에 포함할 모델 식별자 (모델이 바뀌면 키도 바뀜)
+        """
+        self._model_getter = model_getter
+        self.model_id = model_id
+        self.maxsize = maxsize
+        self.use_redis = use_redis
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, normalized: str) -> str:
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        return f"emb:{self.model_id}:{digest}"
+
+    # --- LRU ---
+    def _lru_get(self, key):
+        with self._lock:
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+            return vector
+
+    def _lru_put(self, key, vector):
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    # --- Redis ---
+    def _redis_get_many(self, keys):
+        redis_client = get_redis() if self.use_redis else None
+        if redis_client is None or not keys:
+            return {}
+        try:
+            values = redis_client.mget(keys)
+        except Exception as e:
+            print(f"디버그: 임베딩 캐시 Redis 조회 실패 - {e}")
+            mark_redis_failed()
+            return {}
+        return {
+            key: np.frombuffer(value, dtype=np.float32).tolist()
+            for key, value in zip(keys, values) if value
+        }
+
+    def _redis_put_many(self, items):
+        redis_client = get_redis() if self.use_redis else None
+        if redis_client is None or not items:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for key, vector in items.items():
+                pipe.set(key, np.asarray(vector, dtype=np.float32).tobytes(), ex=EMBEDDING_CACHE_REDIS_TTL_SEC)
+            pipe.execute()
+        except Exception as e:
+            print(f"디버그: 임베딩 캐시 Redis 저장 실패 - {e}")
+            mark_redis_failed()
+
+    # --- 조회 ---
+    def get_many(self, texts):
+        """여러 문자열의 임베딩을 반환합니다. 캐시에 없는 것만 한 번의 배치로 인코딩합니다."""
+        normalized = [normalize_text(t) for t in texts]
+        keys = [self._key(n) for n in normalized]
+        results = [None] * len(texts)
+
+        missing = {}
+        for i, key in enumerate(keys):
+            vector = self._lru_get(key)
+            if vector is not None:
+                _lru_hit.inc()
+                results[i] = vector
+            else:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            found = self._redis_get_many(list(missing.keys()))
+            for key, vector in found.items():
+                _redis_hit.inc(len(missing[key]))
+                self._lru_put(key, vector)
+                for i in missing.pop(key):
+                    results[i] = vector
+
+        if missing:
+            to_encode = list(missing.keys())
+            inputs = [normalized[missing[key][0]] for key in to_encode]
+            _miss.inc(sum(len(v) for v in missing.values()))
+
+            started = time.perf_counter()
+            vectors = self._model_getter().encode(inputs)
+            _encode_ms.observe((time.perf_counter() - started) * 1000)
+            _encode_batch_size.observe(len(inputs))
+
+            new_items = {}
+            for key, vector in zip(to_encode, vectors):
+                vector = vector.tolist()
+                new_items[key] = vector
+                self._lru_put(key, vector)
+                for i in missing[key]:
+                    results[i] = vector
+            self._redis_put_many(new_items)
+
+        return results
+
+    def get(self, text):
+        return self.get_many([text])[0]
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
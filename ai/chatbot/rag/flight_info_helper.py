@@ -10,70 +10,48 @@ import re
 from chatbot.rag.config import common_llm_rag_caller
 from chatbot.rag.config import client
 from zoneinfo import ZoneInfo
+from chatbot.rag.llm_parse_cache import cached_llm_parser
+from chatbot.rag.flight_status_client import fetch_flight_status
+from chatbot.rag.flight_snapshot import lookup_flight_snapshot
 
 # 기존 코드는 그대로 유지합니다.
 BASE_URL = "http://apis.data.go.kr/B551177/StatusOfPassengerFlightsDeOdp"
 SERVICE_KEY = os.getenv("SERVICE_KEY")
 
 
-def _convert_slots_to_query_format(slots: List[tuple], user_query: str) -> List[Dict[str, Any]]:
-    """
-    의도분류기에서 추출된 slot 정보를 flight API 파라미터 형식으로 변환
+# 일자 키워드 → 오늘 기준 날짜 오프셋
+DATE_OFFSET_KEYWORDS = {
+    -3: ["사흘 전", "3일 전", "사흘전", "3일전", "삼일전", "삼일 전"],
+    -2: ["그제", "이틀 전", "이틀전", "그저께", "2일 전", "2일전"],
+    -1: ["어제", "어저께", "작일", "하루 전", "하루전", "1일 전", "1일전"],
+    0: ["오늘", "금일", "당일", "투데이", "today"],
+    1: ["내일", "하루 뒤", "하루뒤", "1일 뒤", "1일뒤", "명일", "익일", "tomorrow"],
+    2: ["모레", "이틀 뒤", "이틀뒤", "내일모레", "내일 모레", "명후일", "2일 뒤", "2일뒤"],
+    3: ["글피", "사흘 뒤", "사흘뒤", "삼명일", "3일 뒤", "3일뒤"],
+    4: ["나흘 뒤", "나흘뒤", "4일 뒤", "4일뒤"],
+    5: ["닷새 뒤", "닷새뒤", "5일 뒤", "5일뒤"],
+    6: ["엿새 뒤", "엿새뒤", "6일 뒤", "6일뒤"],
+}
 
-    Args:
-        slots: [(word, slot_tag), ...] 형식의 slot 정보
-        user_query: 사용자 원본 질문
 
-    Returns:
-        flight API 호출에 필요한 파라미터 딕셔너리 리스트
-    """
-    if not slots:
-        return []
+def resolve_date_offset(date_str: str) -> Optional[int]:
+    """일자 키워드('어제', '내일', '3일 뒤' 등)를 날짜 오프셋으로 변환합니다. 모르는 표현이면 None."""
+    for offset, keywords in DATE_OFFSET_KEYWORDS.items():
+        if date_str in keywords:
+            return offset
+    return None
 
-    # slot에서 정보 추출
-    flight_ids = [word for word, slot in slots if slot in ['B-flight_id', 'I-flight_id']]
-    airports = [word for word, slot in slots if slot in ['B-airport_name', 'I-airport_name']]
-    airlines = [word for word, slot in slots if slot in ['B-airline_name', 'I-airline_name']]
-    terminals = [word for word, slot in slots if slot in ['B-terminal', 'I-terminal']]
-    departure_airports = [word for word, slot in slots if
-                          slot in ['B-departure_airport_name', 'I-departure_airport_name']]
-    vague_times = [word for word, slot in slots if slot in ['B-vague_time', 'I-vague_time']]
-    time_periods = [word for word, slot in slots if slot in ['B-time_period', 'I-time_period']]
-    date = [word for word, slot in slots if slot in ['B-date', 'I-date']]
 
-    # vague_time과 time_period에 따른 시간 범위 설정
+def resolve_time_range(time_period: Optional[str], vague_time: Optional[str]):
+    """
+    time_period('오전', '저녁' 등) 또는 vague_time('곧', '이따가' 등)을 (from_time, to_time) HHMM 문자열로 변환합니다.
+    time_period가 더 구체적이므로 우선합니다. 해당 없으면 (None, None).
+    """
     from_time, to_time = None, None
-    date_offset = 0 
-    # date에 따라서 검색 날짜 처리
-    if date:
-        date_str = date[0]  # 리스트에서 첫 번째 값 추출
-        if date_str in ["사흘 전", "3일 전", "사흘전", "3일전", "삼일전", "삼일 전"]:
-            date_offset = -3
-        elif date_str in ["그제", "이틀 전", "이틀전", "그저께", "2일 전", "2일전"]:
-            date_offset = -2
-        elif date_str in ["어제", "어저께", "작일", "하루 전", "하루전", "1일 전", "1일전"]:
-            date_offset = -1
-        elif date_str in ["오늘", "금일", "당일", "투데이", "today"]:
-            date_offset = 0
-        elif date_str in ["내일", "하루 뒤", "하루뒤", "1일 뒤", "1일뒤", "명일", "익일", "tomorrow"]:
-            date_offset = 1
-        elif date_str in ["모레", "이틀 뒤", "이틀뒤", "내일모레", "내일 모레", "명후일", "2일 뒤", "2일뒤"]:
-            date_offset = 2
-        elif date_str in ["글피", "사흘 뒤", "사흘뒤", "삼명일", "3일 뒤", "3일뒤"]:
-            date_offset = 3
-        elif date_str in ["나흘 뒤", "나흘뒤", "4일 뒤", "4일뒤"]:
-            date_offset = 4
-        elif date_str in ["닷새 뒤", "닷새뒤", "5일 뒤", "5일뒤"]:
-            date_offset = 5
-        elif date_str in ["엿새 뒤", "엿새뒤", "6일 뒤", "6일뒤"]:
-            date_offset = 6
-
-        print(f"디버그: 일자 키워드 '{date_str}' 감지 → date_offset: {date_offset}")
 
-    
     # time_period 우선 처리 (더 구체적)
-    if time_periods:
-        time_period = time_periods[0].lower()
+    if time_period:
+        time_period = time_period.lower()
         
         if time_period in ["아침", "오전"]:
             from_time, to_time = "0600", "1200"
@@ -83,11 +61,10 @@ def _convert_slots_to_query_format(slots: List[tuple], user_query: str) -> List[
             from_time, to_time = "1800", "2359"
         elif time_period in ["새벽", "밤늦은"]:
             from_time, to_time = "0000", "0600"
-        print(f"디버그: time_period '{time_period}' 감지 → 시간 범위: {from_time}-{to_time}")
     
     # vague_time 처리 (time_period가 없을 때만)
-    elif vague_times:
-        vague_time = vague_times[0].lower()
+    elif vague_time:
+        vague_time = vague_time.lower()
         current_time = datetime.now(ZoneInfo("Asia/Seoul"))
 
         if vague_time in ["곧", "잠깐", "잠시", "조금"]:
@@ -102,7 +79,48 @@ def _convert_slots_to_query_format(slots: List[tuple], user_query: str) -> List[
             # 현재부터 자정까지
             from_time = current_time.strftime("%H%M")
             to_time = "2359"
-        print(f"디버그: vague_time '{vague_time}' 감지 → 시간 범위: {from_time}-{to_time}")
+
+    return from_time, to_time
+
+
+def _convert_slots_to_query_format(slots: List[tuple], user_query: str) -> List[Dict[str, Any]]:
+    """
+    의도분류기에서 추출된 slot 정보를 flight API 파라미터 형식으로 변환
+
+    Args:
+        slots: [(word, slot_tag), ...] 형식의 slot 정보
+        user_query: 사용자 원본 질문
+
+    Returns:
+        flight API 호출에 필요한 파라미터 딕셔너리 리스트
+    """
+    if not slots:
+        return []
+
+    # slot에서 정보 추출
+    flight_ids = [word for word, slot in slots if slot in ['B-flight_id', 'I-flight_id']]
+    airports = [word for word, slot in slots if slot in ['B-airport_name', 'I-airport_name']]
+    airlines = [word for word, slot in slots if slot in ['B-airline_name', 'I-airline_name']]
+    terminals = [word for word, slot in slots if slot in ['B-terminal', 'I-terminal']]
+    departure_airports = [word for word, slot in slots if
+                          slot in ['B-departure_airport_name', 'I-departure_airport_name']]
+    vague_times = [word for word, slot in slots if slot in ['B-vague_time', 'I-vague_time']]
+    time_periods = [word for word, slot in slots if slot in ['B-time_period', 'I-time_period']]
+    date = [word for word, slot in slots if slot in ['B-date', 'I-date']]
+
+    # date / time_period / vague_time에 따른 검색 날짜와 시간 범위 설정
+    date_offset = 0 
+    if date:
+        date_str = date[0]  # 리스트에서 첫 번째 값 추출
+        date_offset = resolve_date_offset(date_str) or 0
+        print(f"디버그: 일자 키워드 '{date_str}' 감지 → date_offset: {date_offset}")
+
+    from_time, to_time = resolve_time_range(
+        time_periods[0] if time_periods else None,
+        vague_times[0] if vague_times else None,
+    )
+    if time_periods or vague_times:
+        print(f"디버그: 시간 키워드 {time_periods or vague_times} 감지 → 시간 범위: {from_time}-{to_time}")
 
     # 기본 쿼리 구조 생성
     query = {
@@ -141,6 +159,7 @@ def _convert_slots_to_query_format(slots: List[tuple], user_query: str) -> List[
         return []
 
 
+@cached_llm_parser("flight_query")
 def _parse_flight_query_with_llm(user_query: str) -> List[Dict[str, Any]]:
     system_prompt = (
         "사용자의 질문을 분석하여 항공편 정보에 대한 필수 정보를 JSON 리스트 형식으로 추출해줘. "
@@ -219,11 +238,7 @@ def _call_flight_api(
         from_time: Optional[str] = None,
         to_time: Optional[str] = None
 ) -> Dict[str, Any]:
-    if direction == "departure":
-        url = f"{BASE_URL}/getPassengerDeparturesDeOdp"
-    elif direction == "arrival":
-        url = f"{BASE_URL}/getPassengerArrivalsDeOdp"
-    else:
+    if direction not in ("departure", "arrival"):
         return {"error": "Invalid direction"}
 
     today = datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y%m%d")
@@ -233,6 +248,12 @@ def _call_flight_api(
     found_date = None
 
     for date in date_to_search:
+        # 스케줄러가 갱신하는 FlightRealtime 스냅샷에서 먼저 찾고, 없거나 오래됐으면 API 호출
+        snapshot_results = lookup_flight_snapshot(direction, date, flight_id=flight_id, f_id=f_id,
+                                                  airport_code=airport_code, from_time=from_time, to_time=to_time)
+        if snapshot_results:
+            return {"data": snapshot_results, "found_date": date, "total_count": len(snapshot_results)}
+
         params = {
             "serviceKey": SERVICE_KEY,
             "type": "json",
@@ -253,12 +274,8 @@ def _call_flight_api(
         print(f"디버그: API 호출 시도 - {direction} 방향, 날짜: {date}, 파라미터: {call_params}")
 
         try:
-            response = requests.get(url, params=call_params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-
-            items = data.get("response", {}).get("body", {}).get("items", {})
-            results = items.get("item", []) if isinstance(items, dict) else items
+            # 같은 조회는 단기 캐시/요청 병합으로 API를 한 번만 호출
+            results = fetch_flight_status(direction, call_params)
 
             if results:
                 all_results.extend(results)
@@ -266,7 +283,7 @@ def _call_flight_api(
                 print(f"디버그: {date} 날짜에서 정보 발견! 총 {len(results)}건")
                 return {"data": all_results, "found_date": found_date, "total_count": len(all_results)}
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"API 호출 오류 (날짜: {date}): {e}")
             continue
 
@@ -0,0 +1,111 @@
+"""
+FlightRealtime 스냅샷 조회 (DB/doit.py 스케줄러가 몇 분마다 갱신하는 오늘자 출발/도착 현황판)
+
+항공편 질문마다 운항 현황 API를 호출하는 대신 스냅샷에서 먼저 찾고,
+다음 경우에만 None을 반환해 호출부가 API로 조회하게 합니다.
+- 스냅샷에 없는 날짜(오늘이 아닌 날짜) 또는 조건(f_id 등)
+- 조건에 맞는 항목이 없음 (miss)
+- 스냅샷이 FLIGHT_SNAPSHOT_MAX_AGE_SEC보다 오래됨 (stale)
+
+반환 항목은 수집 시 저장한 API 원본 item(raw)이므로 API 응답과 같은 방식으로 처리할 수 있습니다.
+메트릭: flight_snapshot.hit / miss / stale / error
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from chatbot.rag.utils import get_mongo_collection
+from shared.metrics import get_counter
+
+FLIGHT_SNAPSHOT_ENABLED = os.getenv("FLIGHT_SNAPSHOT_ENABLED", "true").lower() == "true"
+FLIGHT_SNAPSHOT_COLLECTION = os.getenv("FLIGHT_SNAPSHOT_COLLECTION", "FlightRealtime")
+# 수집 주기(기본 3분)보다 넉넉하게. 이보다 오래된 스냅샷은 API로 대체
+FLIGHT_SNAPSHOT_MAX_AGE_SEC = int(os.getenv("FLIGHT_SNAPSHOT_MAX_AGE_SEC", "600"))
+
+KST = ZoneInfo("Asia/Seoul")
+DIRECTION_LABELS = {"departure": "출발", "arrival": "도착"}
+
+_hit = get_counter("flight_snapshot.hit")
+_miss = get_counter("flight_snapshot.miss")
+_stale = get_counter("flight_snapshot.stale")
+_error = get_counter("flight_snapshot.error")
+
+
+def _time_range(search_date: str, from_time: Optional[str], to_time: Optional[str]) -> Optional[Dict[str, datetime]]:
+    """searchday + HHMM 구간을 scheduled_datetime 비교용 KST datetime 범위로 변환 (2400은 다음날 0시)"""
+    if not from_time and not to_time:
+        return None
+
+    def to_datetime(hhmm: str) -> datetime:
+        hhmm = hhmm.replace(":", "")
+        base = datetime.strptime(search_date, "%Y%m%d").replace(tzinfo=KST)
+        return base + timedelta(hours=int(hhmm[:2]), minutes=int(hhmm[2:4]))
+
+    time_range = {}
+    if from_time:
+        time_range["$gte"] = to_datetime(from_time)
+    if to_time:
+        time_range["$lte"] = to_datetime(to_time)
+    return time_range
+
+
+def _age_sec(snapshot_at: datetime) -> float:
+    # pymongo는 기본적으로 tz 정보 없는 UTC datetime을 반환
+    if snapshot_at.tzinfo is None:
+        snapshot_at = snapshot_at.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - snapshot_at).total_seconds()
+
+
+def lookup_flight_snapshot(
+        direction: str,
+        search_date: str,
+        flight_id: Optional[str] = None,
+        f_id: Optional[str] = None,
+        airport_code: Optional[str] = None,
+        from_time: Optional[str] = None,
+        to_time: Optional[str] = None
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    _call_flight_api와 같은 조건으로 스냅샷을 조회합니다.
+
+    Returns:
+        API item 형식의 리스트. 스냅샷으로 답할 수 없으면 None
+    """
+    if not FLIGHT_SNAPSHOT_ENABLED or direction not in DIRECTION_LABELS or f_id:
+        return None
+    if search_date != datetime.now(KST).strftime("%Y%m%d"):
+        return None
+
+    query = {"direction": DIRECTION_LABELS[direction], "searchday": search_date}
+    if flight_id:
+        query["flight_id"] = flight_id.upper()
+    if airport_code:
+        query["airport_code"] = airport_code
+
+    try:
+        time_range = _time_range(search_date, from_time, to_time)
+        if time_range:
+            query["scheduled_datetime"] = time_range
+
+        collection = get_mongo_collection(collection_name=FLIGHT_SNAPSHOT_COLLECTION)
+        docs = list(collection.find(query, {"raw": 1, "snapshot_at": 1, "_id": 0}).sort("scheduled_datetime", 1))
+    except Exception as e:
+        _error.inc()
+        print(f"디버그: 항공편 스냅샷 조회 실패, API로 대체 - {e}")
+        return None
+
+    if not docs:
+        _miss.inc()
+        print(f"디버그: 항공편 스냅샷 miss - {query}")
+        return None
+
+    age = _age_sec(docs[0]["snapshot_at"])
+    if age > FLIGHT_SNAPSHOT_MAX_AGE_SEC:
+        _stale.inc()
+        print(f"디버그: 항공편 스냅샷이 오래됨 ({age:.0f}초 전), API로 대체")
+        return None
+
+    _hit.inc()
+    print(f"디버그: ⚡ 항공편 스냅샷 적중 - {direction}, {len(docs)}건 ({age:.0f}초 전 수집)")
+    return [doc["raw"] for doc in docs if doc.get("raw")]
@@ -0,0 +1,59 @@
+"""
+실시간 여객 항공편 운항 현황 API(StatusOfPassengerFlightsDeOdp) 조회 + 단기 캐시
+
+방향을 모르면 출발/도착을 모두 조회하고, 수하물 수취대 질문도 같은 항공편을 다시 조회하는 등
+같은 (방향, searchday, 편명, 공항, 시간대) 조합이 짧은 시간에 반복 호출되므로
+결과를 FLIGHT_STATUS_CACHE_TTL_SEC 동안 재사용하고, 동시에 들어온 같은 조회는 한 번만 호출합니다.
+
+- 키: 방향 + 호출 파라미터 (serviceKey 제외)
+- 오류(HTTP/네트워크/JSON)는 캐시하지 않고 그대로 예외를 냅니다. (호출부의 기존 예외 처리 사용)
+- 항목 dict는 호출부에서 수정하므로(_api_direction 등) 매번 복사해서 반환합니다.
+"""
+import os
+from typing import Any, Dict, List
+
+from shared.http_client import get_endpoint
+from shared.ttl_cache import TTLCache
+
+FLIGHT_STATUS_BASE_URL = "http://apis.data.go.kr/B551177/StatusOfPassengerFlightsDeOdp"
+FLIGHT_STATUS_URLS = {
+    "departure": f"{FLIGHT_STATUS_BASE_URL}/getPassengerDeparturesDeOdp",
+    "arrival": f"{FLIGHT_STATUS_BASE_URL}/getPassengerArrivalsDeOdp",
+}
+
+FLIGHT_STATUS_CACHE_TTL_SEC = float(os.getenv("FLIGHT_STATUS_CACHE_TTL_SEC", "60"))
+FLIGHT_STATUS_CACHE_MAX_ENTRIES = int(os.getenv("FLIGHT_STATUS_CACHE_MAX_ENTRIES", "512"))
+
+_CACHE_EXCLUDED_PARAMS = {"serviceKey"}
+
+_flight_status_cache = TTLCache(
+    "flight_status", ttl_sec=FLIGHT_STATUS_CACHE_TTL_SEC, max_entries=FLIGHT_STATUS_CACHE_MAX_ENTRIES
+)
+
+
+def _request_items(direction: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    response = get_endpoint("flight_status").get(FLIGHT_STATUS_URLS[direction], params=params)
+    response.raise_for_status()
+    body = response.json().get("response", {}).get("body", {})
+
+    items = body.get("items", {})
+    if isinstance(items, dict):
+        items = items.get("item", [])
+    if isinstance(items, dict):
+        items = [items]
+    return items or []
+
+
+def fetch_flight_status(direction: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    운항 현황 API를 (캐시를 거쳐) 조회해 항목 리스트를 반환합니다.
+
+    Args:
+        direction: "departure" 또는 "arrival"
+        params: serviceKey/type을 포함한 API 호출 파라미터 (None 값은 제외된 상태여야 함)
+    """
+    key = (direction,) + tuple(sorted(
+        (name, str(value)) for name, value in params.items() if name not in _CACHE_EXCLUDED_PARAMS
+    ))
+    items = _flight_status_cache.get_or_load(key, lambda: _request_items(direction, params))
+    return [dict(item) for item in items]
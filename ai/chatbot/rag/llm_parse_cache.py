@@ -0,0 +1,130 @@
+"""
+LLM 질의 파서 결과 캐시
+
+"1터미널 혼잡도", "인천 도착 곧", "대한항공 월요일 하노이"처럼 같은 질문이 반복되므로
+LLM 파서(JSON 추출 함수)의 결과를 Redis에 저장해 두고 재사용합니다.
+
+- 키: 파서 이름 + normalize_with_morph(질문) (+ 상대 날짜 표현이 있으면 KST 기준 오늘 날짜)
+- 값: 파싱 결과 JSON, TTL은 LLM_PARSE_CACHE_TTL_SEC
+- '오늘', '내일', '곧', '요일' 같은 상대 날짜/시간 표현이 있는 질문은 KST 자정에 만료됩니다.
+- None/빈 결과(파싱 실패)는 저장하지 않습니다.
+- 메트릭: llm_parse_cache.<파서>.hit / miss (hit_rates()로 파서별 적중률 확인)
+- Redis를 쓸 수 없으면 캐시 없이 파서를 그대로 호출합니다.
+"""
+import functools
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from shared.metrics import get_counter
+from shared.redis_client import get_redis, mark_redis_failed
+
+LLM_PARSE_CACHE_ENABLED = os.getenv("LLM_PARSE_CACHE_ENABLED", "true").lower() == "true"
+LLM_PARSE_CACHE_TTL_SEC = int(os.getenv("LLM_PARSE_CACHE_TTL_SEC", str(24 * 3600)))
+# 프롬프트를 바꾸면 올려서 이전 캐시를 무효화
+LLM_PARSE_CACHE_VERSION = os.getenv("LLM_PARSE_CACHE_VERSION", "1")
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 결과가 오늘 날짜에 따라 달라지는 표현 (어제/내일 → date_offset, 요일 → 이번 주 등)
+RELATIVE_DATE_PATTERN = re.compile(
+    r"오늘|금일|당일|내일|명일|익일|모레|글피|어제|어저께|그제|그저께|작일|"
+    r"지금|현재|방금|곧|잠시|이따|있다가|나중|요일|이번\s*주|다음\s*주|주말|"
+    r"\d+\s*일\s*(전|뒤|후)|(하루|이틀|사흘|나흘|닷새|엿새)\s*(전|뒤|후)|today|tomorrow|yesterday",
+    re.IGNORECASE,
+)
+
+_parser_names = []
+
+
+def _normalize(user_query: str) -> str:
+    # 의도 분류기와 같은 정규화 (항공편/터미널 표기 통일, 형태소 단위 띄어쓰기)
+    from shared.normalize_with_morph import normalize_with_morph
+    return normalize_with_morph(user_query)
+
+
+def seconds_until_kst_midnight(now: datetime = None) -> int:
+    now = now or datetime.now(KST)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return max(1, int((midnight - now).total_seconds()))
+
+
+def _cache_key(parser_name: str, normalized: str, date_context: str) -> str:
+    digest = hashlib.sha1(f"{normalized}|{date_context}".encode("utf-8")).hexdigest()
+    return f"llmparse:{LLM_PARSE_CACHE_VERSION}:{parser_name}:{digest}"
+
+
+def cached_llm_parser(parser_name: str, ttl_sec: int = None, date_sensitive: bool = False):
+    """
+    LLM 파서 함수(첫 번째 인자가 사용자 질문)의 결과를 Redis에 캐시하는 데코레이터.
+
+    Args:
+        parser_name: 메트릭/키에 쓰는 파서 이름
+        ttl_sec: 캐시 유지 시간 (기본 LLM_PARSE_CACHE_TTL_SEC)
+        date_sensitive: 프롬프트에 오늘 날짜/연도가 들어가는 파서면 True (항상 자정에 만료)
+    """
+    hit = get_counter(f"llm_parse_cache.{parser_name}.hit")
+    miss = get_counter(f"llm_parse_cache.{parser_name}.miss")
+    _parser_names.append(parser_name)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(user_query, *args, **kwargs):
+            redis_client = get_redis() if LLM_PARSE_CACHE_ENABLED and isinstance(user_query, str) else None
+            if redis_client is None or args or kwargs:
+                return func(user_query, *args, **kwargs)
+
+            try:
+                normalized = _normalize(user_query)
+            except Exception as e:
+                print(f"디버그: LLM 파서 캐시 키 생성 실패 ({parser_name}) - {e}")
+                return func(user_query)
+
+            relative = date_sensitive or bool(RELATIVE_DATE_PATTERN.search(user_query))
+            now = datetime.now(KST)
+            key = _cache_key(parser_name, normalized, now.strftime("%Y%m%d") if relative else "")
+
+            try:
+                cached = redis_client.get(key)
+            except Exception as e:
+                print(f"디버그: LLM 파서 캐시 조회 실패 - {e}")
+                mark_redis_failed()
+                return func(user_query)
+
+            if cached is not None:
+                hit.inc()
+                print(f"디버그: ⚡ LLM 파서 캐시 적중 ({parser_name}) - '{normalized}'")
+                return json.loads(cached)
+
+            miss.inc()
+            result = func(user_query)
+            if not result:
+                return result
+
+            ttl = ttl_sec or LLM_PARSE_CACHE_TTL_SEC
+            if relative:
+                ttl = min(ttl, seconds_until_kst_midnight(now))
+            try:
+                redis_client.set(key, json.dumps(result, ensure_ascii=False), ex=ttl)
+            except Exception as e:
+                print(f"디버그: LLM 파서 캐시 저장 실패 - {e}")
+                mark_redis_failed()
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def hit_rates() -> dict:
+    """파서별 {hit, miss, hit_rate}"""
+    rates = {}
+    for name in _parser_names:
+        hits = get_counter(f"llm_parse_cache.{name}.hit").value
+        misses = get_counter(f"llm_parse_cache.{name}.miss").value
+        total = hits + misses
+        rates[name] = {"hit": hits, "miss": misses, "hit_rate": round(hits / total, 3) if total else 0.0}
+    return rates
@@ -1,18 +1,12 @@
-import os
-from openai import OpenAI
-from dotenv import load_dotenv
-from pathlib import Path 
 import json
 from typing import List, Dict
 from typing import Optional
 
-# OpenAI 클라이언트를 전역으로 초기화
-env_path = Path(__file__).resolve().parents[2] / ".env"
-load_dotenv(dotenv_path=env_path, override=True) # override=True 추가 권장
-
-api_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=api_key)
+# OpenAI 클라이언트는 rag/config.py의 공용 클라이언트를 사용 (첫 사용 시 생성)
+from chatbot.rag.config import client
+from chatbot.rag.llm_parse_cache import cached_llm_parser
 
+@cached_llm_parser("location")
 def extract_location_with_llm(user_query: str) -> str:
     """
     LLM을 사용하여 사용자 질문에서 공항 위치(터미널, 탑승동)를 추출합니다.
@@ -40,6 +34,7 @@ def extract_location_with_llm(user_query: str) -> str:
         print(f"오류: LLM 위치 추출 실패 - {e}")
         return None
     
+@cached_llm_parser("airline_name")
 def _extract_airline_name_with_llm(user_query: str) -> Optional[str]:
     """
     LLM을 사용하여 사용자 쿼리에서 항공사 이름만 추출합니다.
@@ -74,6 +69,7 @@ def _extract_airline_name_with_llm(user_query: str) -> Optional[str]:
         return None
 
 
+@cached_llm_parser("facility_names")
 def _extract_facility_names_with_llm(user_query: str) -> List[str]:
     """
     LLM을 사용하여 사용자 쿼리에서 시설 이름(명사)만 정확하게 추출합니다.
@@ -0,0 +1,263 @@
+"""
+로컬 벡터 인덱스 (Atlas $vectorSearch 대체용)
+
+RAG 컬렉션들은 작고 하루에 한 번 정도만 바뀌므로, 임베딩을 프로세스 메모리에
+정규화된 float32 행렬로 올려두고 내적(코사인 유사도)으로 정확한 top-k 검색을 합니다.
+
+- VECTOR_SEARCH_BACKEND=local 이면 perform_vector_search가 이 인덱스를 사용합니다. (기본값: atlas)
+- 컬렉션별로 첫 검색 시(또는 warmup 시) Mongo에서 한 번 로드합니다.
+- VECTOR_INDEX_RELOAD_SEC 간격으로 컬렉션 시그니처(문서 수 + 최신 _id)를 확인해
+  바뀌었으면 백그라운드에서 다시 로드합니다. (로드 중에도 이전 인덱스로 계속 검색)
+- 점수는 Atlas cosine vectorSearchScore와 같은 (1 + cos) / 2 스케일로 반환합니다.
+- LocalVectorIndex.from_documents()로 Mongo 없이 인덱스를 만들 수 있습니다. (오프라인 검증용)
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from shared.lazy import LazyResource, record
+from shared.metrics import get_counter, get_histogram
+
+VECTOR_SEARCH_BACKEND = os.getenv("VECTOR_SEARCH_BACKEND", "atlas").lower()  # atlas | local
+VECTOR_INDEX_RELOAD_SEC = int(os.getenv("VECTOR_INDEX_RELOAD_SEC", "600"))
+VECTOR_INDEX_COLLECTIONS = [
+    name.strip() for name in os.getenv(
+        "VECTOR_INDEX_COLLECTIONS",
+        "AirportFacilityVector,AirportPolicyVector,ParkingLotPolicyVector,"
+        "TransitPathVector,ConnectionTimeVector,AirlineVector,AirportVector",
+    ).split(",") if name.strip()
+]
+
+_search_ms = get_histogram("local_index.search_ms", (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100))
+_reloads = get_counter("local_index.reloads")
+_filter_fallbacks = get_counter("local_index.filter_fallbacks")
+
+
+class UnsupportedFilterError(ValueError):
+    """로컬 인덱스에서 처리할 수 없는 query_filter (호출 측에서 Atlas로 폴백)"""
+
+
+_COMPARATORS = {
+    "$eq": lambda value, target: value == target,
+    "$ne": lambda value, target: value != target,
+    "$gt": lambda value, target: value is not None and value > target,
+    "$gte": lambda value, target: value is not None and value >= target,
+    "$lt": lambda value, target: value is not None and value < target,
+    "$lte": lambda value, target: value is not None and value <= target,
+    "$in": lambda value, target: value in target,
+    "$nin": lambda value, target: value not in target,
+}
+
+
+def _match_field(value, condition):
+    if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+        for op, target in condition.items():
+            if op == "$exists":
+                if (value is not None) != bool(target):
+                    return False
+                continue
+            comparator = _COMPARATORS.get(op)
+            if comparator is None:
+                raise UnsupportedFilterError(f"지원하지 않는 연산자: {op}")
+            try:
+                if not comparator(value, target):
+                    return False
+            except TypeError:
+                return False
+        return True
+    if isinstance(value, list) and not isinstance(condition, list):
+        return condition in value
+    return value == condition
+
+
+def matches_filter(doc: dict, query_filter: dict) -> bool:
+    """Mongo $match 필터의 일부(필드 비교, $and/$or)를 파이썬에서 평가합니다."""
+    for key, condition in (query_filter or {}).items():
+        if key == "$and":
+            if not all(matches_filter(doc, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(doc, sub) for sub in condition):
+                return False
+        elif key.startswith("$"):
+            raise UnsupportedFilterError(f"지원하지 않는 연산자: {key}")
+        else:
+            value = doc
+            for part in key.split("."):
+                value = value.get(part) if isinstance(value, dict) else None
+            if not _match_field(value, condition):
+                return False
+    return True
+
+
+class LocalVectorIndex:
+    def __init__(self, documents: list, embeddings, text_content_field: str, signature=None):
+        """
+        Args:
+            documents: 임베딩을 제외한 문서 필드 dict 리스트 (필터링/텍스트 반환용)
+            embeddings: (문서 수, 차원) 배열
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(documents), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = matrix / norms
+        self.documents = documents
+        self.text_content_field = text_content_field
+        self.signature = signature
+        self.loaded_at = time.time()
+
+    @classmethod
+    def from_documents(cls, documents: list, embedding_field: str, text_content_field: str, signature=None):
+        """embedding 필드를 포함한 Mongo 문서 리스트로 인덱스를 만듭니다."""
+        docs, vectors = [], []
+        for doc in documents:
+            vector = doc.get(embedding_field)
+            if not vector:
+                continue
+            docs.append({k: v for k, v in doc.items() if k not in ("_id", embedding_field)})
+            vectors.append(vector)
+        return cls(docs, np.asarray(vectors, dtype=np.float32) if vectors else np.zeros((0, 0), np.float32),
+                   text_content_field, signature)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def search(self, query_embedding, top_k: int = 5, query_filter: dict = None) -> list:
+        """[(텍스트, 점수), ...]를 점수 내림차순으로 반환합니다."""
+        if not self.documents:
+            return []
+        started = time.perf_counter()
+
+        candidates = None
+        if query_filter:
+            candidates = np.fromiter(
+                (i for i, doc in enumerate(self.documents) if matches_filter(doc, query_filter)), dtype=np.int64
+            )
+            if candidates.size == 0:
+                return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        matrix = self.matrix if candidates is None else self.matrix[candidates]
+        similarities = matrix @ query
+        k = min(top_k, similarities.shape[0])
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+
+        results = []
+        for idx in top:
+            doc = self.documents[idx if candidates is None else candidates[idx]]
+            if self.text_content_field in doc:
+                results.append((doc[self.text_content_field], float((1.0 + similarities[idx]) / 2.0)))
+        _search_ms.observe((time.perf_counter() - started) * 1000)
+        return results
+
+
+def _collection_signature(collection):
+    """문서 수 + 가장 최근 _id (재적재/추가/삭제 시 바뀜)"""
+    latest = collection.find_one({}, projection={"_id": 1}, sort=[("_id", -1)])
+    return collection.count_documents({}), latest["_id"] if latest else None
+
+
+class LocalIndexRegistry:
+    """컬렉션별 LocalVectorIndex 보관 및 주기적 갱신"""
+
+    def __init__(self, collection_getter, embedding_field: str, text_content_field: str,
+                 reload_interval_sec: int = VECTOR_INDEX_RELOAD_SEC):
+        self._collection_getter = collection_getter
+        self.embedding_field = embedding_field
+        self.text_content_field = text_content_field
+        self.reload_interval_sec = reload_interval_sec
+        self._indexes = {}
+        self._checked_at = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _build(self, collection_name: str, signature=None) -> LocalVectorIndex:
+        started = time.perf_counter()
+        collection = self._collection_getter(collection_name)
+        if signature is None:
+            signature = _collection_signature(collection)
+        index = LocalVectorIndex.from_documents(
+            list(collection.find({}, projection={"_id": 0})),
+            self.embedding_field, self.text_content_field, signature,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        record(f"local_index.{collection_name}", elapsed_ms)
+        print(f"디버그: 로컬 벡터 인덱스 '{collection_name}' 로드 완료 ({len(index)}개 문서, {elapsed_ms:.1f}ms)")
+        return index
+
+    def load(self, collection_name: str) -> LocalVectorIndex:
+        index = self._indexes.get(collection_name)
+        if index is not None:
+            return index
+        with self._lock:
+            if collection_name not in self._indexes:
+                self._indexes[collection_name] = self._build(collection_name)
+                self._checked_at[collection_name] = time.monotonic()
+            return self._indexes[collection_name]
+
+    def _refresh(self, collection_name: str):
+        try:
+            signature = _collection_signature(self._collection_getter(collection_name))
+            current = self._indexes.get(collection_name)
+            if current is None or current.signature != signature:
+                self._indexes[collection_name] = self._build(collection_name, signature)
+                _reloads.inc()
+        except Exception as e:
+            print(f"디버그: 로컬 벡터 인덱스 '{collection_name}' 갱신 실패 (이전 인덱스 유지) - {e}")
+        finally:
+            with self._lock:
+                self._checked_at[collection_name] = time.monotonic()
+                self._refreshing.discard(collection_name)
+
+    def _maybe_refresh(self, collection_name: str):
+        if not self.reload_interval_sec:
+            return
+        with self._lock:
+            checked_at = self._checked_at.get(collection_name, 0)
+            if collection_name in self._refreshing or time.monotonic() - checked_at < self.reload_interval_sec:
+                return
+            self._refreshing.add(collection_name)
+        threading.Thread(target=self._refresh, args=(collection_name,), daemon=True).start()
+
+    def search(self, query_embedding, collection_name: str, top_k: int = 5, query_filter: dict = None) -> list:
+        index = self.load(collection_name)
+        self._maybe_refresh(collection_name)
+        try:
+            return index.search(query_embedding, top_k=top_k, query_filter=query_filter)
+        except UnsupportedFilterError:
+            _filter_fallbacks.inc()
+            raise
+
+    def reload(self, collection_name: str = None):
+        """지정한(또는 로드된 모든) 컬렉션을 즉시 다시 로드합니다."""
+        names = [collection_name] if collection_name else list(self._indexes)
+        for name in names:
+            self._indexes[name] = self._build(name)
+            self._checked_at[name] = time.monotonic()
+
+    def loaded(self) -> dict:
+        return {name: len(index) for name, index in self._indexes.items()}
+
+
+def create_registry(collection_getter, embedding_field: str, text_content_field: str) -> LocalIndexRegistry:
+    """
+    로컬 인덱스 레지스트리를 만들고, VECTOR_SEARCH_BACKEND=local이면 warmup 시
+    VECTOR_INDEX_COLLECTIONS를 미리 로드하도록 등록합니다.
+    """
+    registry = LocalIndexRegistry(collection_getter, embedding_field, text_content_field)
+    if VECTOR_SEARCH_BACKEND == "local":
+        def _preload():
+            for name in VECTOR_INDEX_COLLECTIONS:
+                registry.load(name)
+            return registry
+        LazyResource("local_vector_indexes", _preload)
+    return registry
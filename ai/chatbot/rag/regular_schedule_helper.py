@@ -1,5 +1,6 @@
 import json
 from chatbot.rag.config import db_client, db_name, client
+from chatbot.rag.llm_parse_cache import cached_llm_parser
 from pymongo.errors import ConnectionFailure, OperationFailure
 from datetime import datetime, timedelta
 import re
@@ -92,6 +93,8 @@ def _get_schedule_from_db(
         return "데이터 조회 중 오류 발생"
 
 
+# 프롬프트에 올해 연도가 들어가므로 날짜 기준으로 캐시
+@cached_llm_parser("schedule_query", date_sensitive=True)
 def _parse_schedule_query_with_llm(user_query: str) -> dict | None:
     prompt_content = (
         "사용자 쿼리에서 정기 운항 스케줄 관련 정보를 JSON 리스트 형식으로 추출해줘."
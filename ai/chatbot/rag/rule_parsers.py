@@ -0,0 +1,413 @@
+"""
+규칙/슬롯 기반 질의 파서 (핸들러별 LLM 파싱 호출 대체)
+
+혼잡도, 정기 운항 스케줄, 수하물 수취대, 주차장 도보 시간, 입출국 정책, 환승 경로 핸들러는
+질의 구조화를 위해 매번 gpt-4o-mini를 호출했습니다. 대부분의 질문은 터미널/구역/시각/요일/도시명 등
+정해진 표현으로 이루어져 있으므로 정규식과 KoBERT 슬롯으로 먼저 파싱하고,
+규칙이 질문을 충분히 설명하지 못할 때(coverage < RULE_PARSER_MIN_COVERAGE)만 기존 LLM 파서를 호출합니다.
+
+- 각 규칙 파서는 (LLM 파서와 같은 형식의 결과, coverage 0.0~1.0)을 반환합니다.
+- parse_with_fallback()이 규칙 → LLM 순서로 시도하고 메트릭을 남깁니다.
+    rule_parser.<의도>.llm_avoided / rule_parser.<의도>.llm_fallback
+- RULE_PARSER_ENABLED=false 이면 항상 LLM 파서를 사용합니다.
+"""
+import os
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from chatbot.rag.flight_info_helper import DATE_OFFSET_KEYWORDS, resolve_time_range
+from shared.airline_codes import AIRLINE_CODES
+from shared.metrics import get_counter
+
+RULE_PARSER_ENABLED = os.getenv("RULE_PARSER_ENABLED", "true").lower() == "true"
+RULE_PARSER_MIN_COVERAGE = float(os.getenv("RULE_PARSER_MIN_COVERAGE", "0.8"))
+
+# 도시/국가명 → 주요 공항 IATA 코드 (regular_schedule_helper 프롬프트의 예시 기준)
+CITY_AIRPORT_CODES = {
+    "일본": ["NRT", "HND", "KIX", "FUK", "CTS", "OKA"],
+    "도쿄": ["NRT", "HND"], "나리타": ["NRT"], "하네다": ["HND"],
+    "오사카": ["KIX"], "간사이": ["KIX"], "후쿠오카": ["FUK"], "삿포로": ["CTS"],
+    "오키나와": ["OKA"], "나고야": ["NGO"],
+    "중국": ["PEK", "PKX", "PVG", "CAN", "TAO"],
+    "베이징": ["PEK", "PKX"], "북경": ["PEK", "PKX"], "상하이": ["PVG"], "상해": ["PVG"],
+    "광저우": ["CAN"], "칭다오": ["TAO"], "청도": ["TAO"], "홍콩": ["HKG"], "마카오": ["MFM"],
+    "대만": ["TPE"], "타이베이": ["TPE"],
+    "베트남": ["HAN", "SGN", "DAD", "CXR"], "하노이": ["HAN"], "호치민": ["SGN"],
+    "다낭": ["DAD"], "나트랑": ["CXR"], "냐짱": ["CXR"],
+    "태국": ["BKK"], "방콕": ["BKK"], "싱가포르": ["SIN"], "쿠알라룸푸르": ["KUL"],
+    "필리핀": ["MNL", "CEB"], "마닐라": ["MNL"], "세부": ["CEB"], "발리": ["DPS"],
+    "괌": ["GUM"], "사이판": ["SPN"], "울란바토르": ["UBN"], "블라디보스토크": ["VVO"],
+    "미국": ["JFK", "LAX", "SFO", "ORD", "ATL"],
+    "뉴욕": ["JFK"], "로스앤젤레스": ["LAX"], "엘에이": ["LAX"], "샌프란시스코": ["SFO"],
+    "시카고": ["ORD"], "애틀랜타": ["ATL"], "시애틀": ["SEA"], "하와이": ["HNL"], "호놀룰루": ["HNL"],
+    "캐나다": ["YVR", "YYZ"], "밴쿠버": ["YVR"], "토론토": ["YYZ"],
+    "파리": ["CDG"], "런던": ["LHR"], "프랑크푸르트": ["FRA"], "암스테르담": ["AMS"],
+    "로마": ["FCO"], "두바이": ["DXB"], "시드니": ["SYD"],
+}
+
+# 일반 명사로도 쓰이는 도시명 ('세부 내용', '세부 정보'): 뒤에 장소 표현이 오거나 공항 슬롯으로 태깅된 경우만 인정
+AMBIGUOUS_CITY_NAMES = {"세부"}
+_PLACE_SUFFIX_PATTERN = re.compile(r"\s*(?:공항|행|발|에서|으로|로|에|까지|가는|출발|도착|노선|항공편|비행기)")
+
+# 공식 항공사명 → 질문에서 쓰이는 표현
+# '대한'처럼 다른 단어('대한민국')의 일부로 자주 쓰이는 줄임말은 넣지 않음
+AIRLINE_ALIASES = {
+    "대한항공": ["대한항공"],
+    "아시아나항공": ["아시아나항공", "아시아나"],
+    "제주항공": ["제주항공"],
+    "진에어": ["진에어"],
+    "티웨이항공": ["티웨이항공", "티웨이"],
+    "에어부산": ["에어부산"],
+    "에어서울": ["에어서울"],
+    "이스타항공": ["이스타항공", "이스타"],
+    "에어프레미아": ["에어프레미아"],
+    "에어로케이": ["에어로케이"],
+}
+
+_TERMINAL_PATTERN = re.compile(r"(?:제\s*)?([12])\s*(?:여객\s*)?터미널|(?<![A-Za-z])[Tt]\s*([12])(?![0-9])")
+_AREA_PATTERN = re.compile(r"(입국장|출국장)\s*([A-Fa-f]|[1-6])?(?![0-9])")
+_HOUR_PATTERN = re.compile(r"(오전|오후|아침|낮|저녁|밤|새벽)?\s*(\d{1,2})\s*시(?!간)")
+_TIME_PERIOD_PATTERN = re.compile(r"오전|오후|아침|점심|낮|저녁|밤|야간|새벽")
+_RELATIVE_TIME_PATTERN = re.compile(r"(\d+|한|두|세|네)\s*(시간|분)\s*(뒤|후|전)")
+_EXPLICIT_DATE_PATTERN = re.compile(r"\d{1,2}\s*월\s*\d{1,2}\s*일|(?<![0-9])\d{1,2}\s*일(?!\s*(전|뒤|후))")
+_WEEKDAY_PATTERN = re.compile(r"([월화수목금토일])요일")
+_YEAR_PATTERN = re.compile(r"(20\d{2}|\d{2})\s*년")
+# 편명은 실제 IATA 항공사 코드로 시작하는 경우만 인정 ('T1 5시', 'T2 3번'의 터미널 표기는 제외)
+_FLIGHT_AIRLINE_CODES = sorted(set(AIRLINE_CODES) - {"T1", "T2"})
+_FLIGHT_ID_PATTERN = re.compile(
+    r"(?<![A-Za-z0-9])(" + "|".join(_FLIGHT_AIRLINE_CODES) + r")\s?(\d{1,4})(?![A-Za-z0-9])", re.IGNORECASE
+)
+# 단어 시작 경계 (앞에 한글/영문/숫자가 붙어 있으면 다른 단어의 일부)
+_WORD_START = r"(?<![가-힣A-Za-z0-9])"
+_AMBIGUOUS_AND_PATTERN = re.compile(r"[가-힣](와|과)\s")
+
+# 복합 질문 분리 기준 (쉼표, '그리고', '및', 명사 뒤 '이랑/랑')
+# '하고'는 '환승하고 싶어'처럼 연결어미로 더 자주 쓰여 분리 기준에서 제외
+_SPLIT_PATTERN = re.compile(r"\s*(?:,|그리고|또한|및|(?<=[가-힣])(?:이랑|랑)\s)\s*")
+
+
+def _record(intent_name: str, avoided: bool):
+    suffix = "llm_avoided" if avoided else "llm_fallback"
+    get_counter(f"rule_parser.{intent_name}.{suffix}").inc()
+
+
+def parse_with_fallback(intent_name: str, rule_parser, llm_parser, user_query: str, slots: list = None):
+    """
+    rule_parser(user_query, slots) 결과의 coverage가 충분하면 그대로 사용하고,
+    아니면 llm_parser(user_query)를 호출합니다. 반환 형식은 llm_parser와 같습니다.
+    """
+    if RULE_PARSER_ENABLED:
+        try:
+            parsed, coverage = rule_parser(user_query, slots or [])
+        except Exception as e:
+            print(f"디버그: 규칙 파서 오류 ({intent_name}) - {e}")
+            parsed, coverage = None, 0.0
+
+        if parsed and coverage >= RULE_PARSER_MIN_COVERAGE:
+            _record(intent_name, avoided=True)
+            print(f"디버그: ⚡ 규칙 기반 파싱 사용 ({intent_name}, coverage={coverage:.2f}) - {parsed}")
+            return parsed
+        print(f"디버그: 규칙 기반 파싱 coverage 부족 ({intent_name}, coverage={coverage:.2f}), LLM 파서로 전환")
+
+    _record(intent_name, avoided=False)
+    return llm_parser(user_query)
+
+
+# --- 공통 추출 함수 ---
+
+def _slot_phrases(slots: list, slot_name: str) -> list:
+    """B-/I- 태그를 이어 붙인 슬롯 값 목록"""
+    phrases = []
+    for word, tag in slots:
+        if tag == f"B-{slot_name}" or (tag == f"I-{slot_name}" and not phrases):
+            phrases.append(word)
+        elif tag == f"I-{slot_name}":
+            phrases[-1] = f"{phrases[-1]} {word}"
+    return phrases
+
+
+def _terminals(text: str) -> list:
+    found = []
+    for match in _TERMINAL_PATTERN.finditer(text):
+        number = int(match.group(1) or match.group(2))
+        if number not in found:
+            found.append(number)
+    return found
+
+
+def _to_24h(prefix: str, hour: int) -> int:
+    if prefix in ("오후", "저녁", "밤") and hour < 12:
+        return hour + 12
+    if prefix in ("오전", "아침", "새벽") and hour == 12:
+        return 0
+    return hour
+
+
+def _hours(text: str) -> list:
+    """[(24시 기준 시각, 오전/오후 표현 여부), ...]"""
+    hours = []
+    for match in _HOUR_PATTERN.finditer(text):
+        hour = int(match.group(2))
+        if 0 <= hour <= 24:
+            hours.append((_to_24h(match.group(1), hour) % 24, bool(match.group(1)) or hour >= 13 or hour == 0))
+    return hours
+
+
+def _date_offset(text: str):
+    """질문에 포함된 가장 긴 일자 키워드의 날짜 오프셋 (없으면 None)"""
+    best, best_length = None, 0
+    for offset, keywords in DATE_OFFSET_KEYWORDS.items():
+        for keyword in keywords:
+            # '하루 전체'의 '하루 전'처럼 다른 단어의 일부인 경우 제외
+            if len(keyword) > best_length and re.search(re.escape(keyword) + r"(?!체)", text):
+                best, best_length = offset, len(keyword)
+    return best
+
+
+def _find_word(text: str, word: str):
+    """단어 시작 경계에서 시작하는 word의 첫 위치 (없으면 None, 뒤에 붙는 조사는 허용)"""
+    match = re.search(_WORD_START + re.escape(word), text)
+    return match.start() if match else None
+
+
+def _airports(text: str, slots: list = None) -> list:
+    """질문에 나온 도시/국가명 (긴 이름 우선, 겹치는 이름 제외)"""
+    slot_airports = " ".join(
+        phrase for slot_name in ("airport_name", "arrival_airport_name", "departure_airport_name")
+        for phrase in _slot_phrases(slots or [], slot_name)
+    )
+    found = {}
+    for name in sorted(CITY_AIRPORT_CODES, key=len, reverse=True):
+        position = _find_word(text, name)
+        if position is None or any(name in longer for longer in found):
+            continue
+        if name in AMBIGUOUS_CITY_NAMES and name not in slot_airports \
+                and not _PLACE_SUFFIX_PATTERN.match(text, position + len(name)):
+            continue
+        found[name] = position
+    return sorted(found, key=found.get)
+
+
+def _airlines(text: str) -> list:
+    found = []
+    for official, aliases in AIRLINE_ALIASES.items():
+        if any(_find_word(text, alias) is not None for alias in aliases):
+            found.append(official)
+    return found
+
+
+def _unknown_slot_values(slots: list, slot_names: tuple, known: list) -> bool:
+    """규칙 사전에 없는 슬롯 값(처음 보는 도시/항공사 등)이 있는지"""
+    for slot_name in slot_names:
+        for phrase in _slot_phrases(slots, slot_name):
+            if not any(name in phrase or phrase in name for name in known):
+                return True
+    return False
+
+
+def _split_segments(text: str, keyword_pattern) -> list:
+    """
+    복합 질문을 분리합니다. 도메인 키워드가 없는 조각은 앞(또는 뒤) 조각에 붙여
+    '알려줘, 고마워'처럼 질문이 아닌 조각이 별도 요청이 되지 않도록 합니다.
+    """
+    parts = [part for part in _SPLIT_PATTERN.split(text) if part and part.strip()]
+    segments = []
+    for part in parts:
+        if segments and not keyword_pattern.search(part):
+            segments[-1] = f"{segments[-1]} {part}"
+        elif segments and not keyword_pattern.search(segments[-1]):
+            segments[-1] = f"{segments[-1]} {part}"
+        else:
+            segments.append(part)
+    return segments or [text]
+
+
+def _complete_predicates(segments: list, predicate_pattern) -> list:
+    """'A에서 B로, C에서 D로 가는 길' → 앞 조각에 마지막 조각의 서술부('가는 길')를 붙입니다."""
+    match = predicate_pattern.search(segments[-1])
+    if not match:
+        return segments
+    predicate = segments[-1][match.start():]
+    return [
+        segment if predicate_pattern.search(segment) else f"{segment.rstrip()} {predicate}"
+        for segment in segments[:-1]
+    ] + [segments[-1]]
+
+
+def _split_coverage(text: str, segments: list) -> float:
+    # '와/과'로 이어진 복합 질문은 규칙으로 안전하게 나누기 어려움
+    if len(segments) == 1 and _AMBIGUOUS_AND_PATTERN.search(text):
+        return 0.6
+    return 1.0
+
+
+def _decompose(text: str, keyword_pattern, predicate_pattern=None):
+    segments = [segment.strip() for segment in _split_segments(text, keyword_pattern)]
+    if predicate_pattern is not None and len(segments) > 1:
+        segments = _complete_predicates(segments, predicate_pattern)
+    return {"requests": [{"query": segment} for segment in segments]}, _split_coverage(text, segments)
+
+
+# --- 의도별 규칙 파서 ---
+
+_CONGESTION_KEYWORDS = re.compile(r"터미널|[Tt][12]|입국장|출국장|혼잡|붐비|사람")
+_DAILY_PATTERN = re.compile(r"하루|전체|종일|총|합계")
+_NOW_PATTERN = re.compile(r"지금|현재|당장")
+
+
+def parse_congestion_query(user_query: str, slots: list):
+    """_parse_query_with_llm과 같은 {"requests": [...]} 형식"""
+    segments = _split_segments(user_query, _CONGESTION_KEYWORDS)
+    requests, coverage = [], 1.0
+
+    for segment in segments:
+        if _RELATIVE_TIME_PATTERN.search(segment):
+            coverage = min(coverage, 0.5)
+
+        offset = _date_offset(segment)
+        if _EXPLICIT_DATE_PATTERN.search(segment) or (offset is not None and offset < 0):
+            date = "unsupported"
+        elif offset:
+            date = "tomorrow"
+        else:
+            date = "today"
+
+        terminals = _terminals(segment)
+        areas = [f"{kind}{(code or '').upper()}" for kind, code in _AREA_PATTERN.findall(segment) if code]
+        hours = [hour for hour, _ in _hours(segment)]
+        is_daily = bool(_DAILY_PATTERN.search(segment))
+        if not is_daily and not hours and not _NOW_PATTERN.search(segment):
+            if _TIME_PERIOD_PATTERN.search(segment):
+                coverage = min(coverage, 0.5)  # '오후 혼잡도'처럼 시각이 모호한 경우
+            elif not terminals and not areas:
+                is_daily = True  # '공항 혼잡도' → 하루 전체
+
+        if areas:
+            if len(terminals) > 1:
+                coverage = min(coverage, 0.5)  # 어느 터미널의 구역인지 모호
+            targets = [(terminals[0] if terminals else None, area) for area in areas]
+        else:
+            targets = [(terminal, None) for terminal in terminals] or [(None, None)]
+
+        times = ["합계"] if is_daily else (hours or [None])
+        if len(times) > 1 and len(targets) > 1:
+            coverage = min(coverage, 0.5)  # 시각과 구역의 짝이 모호
+
+        for terminal, area in targets:
+            for time in times:
+                requests.append({
+                    "date": date, "time": time, "terminal": terminal, "area": area, "is_daily": is_daily,
+                })
+
+    return {"requests": requests}, coverage
+
+
+_SCHEDULE_ARRIVAL_PATTERN = re.compile(r"도착|오는|들어오|입국")
+_SCHEDULE_PERIODS = {"오전": "오전", "아침": "오전", "오후": "오후", "낮": "오후", "저녁": "저녁", "밤": "저녁", "새벽": "새벽"}
+
+
+def parse_schedule_query(user_query: str, slots: list):
+    """_parse_schedule_query_with_llm과 같은 {"requests": [...]} 형식"""
+    current_year = datetime.now(ZoneInfo("Asia/Seoul")).year
+    coverage = 1.0
+
+    airports = _airports(user_query, slots)
+    airlines = _airlines(user_query)
+    if len(airports) > 1 or len(airlines) > 1:
+        coverage = 0.5  # 여러 조건은 LLM이 요청별로 분리
+    if _unknown_slot_values(slots, ("airport_name", "arrival_airport_name", "departure_airport_name"), list(CITY_AIRPORT_CODES)):
+        coverage = min(coverage, 0.5)
+    if _unknown_slot_values(slots, ("airline_name",), [a for aliases in AIRLINE_ALIASES.values() for a in aliases]):
+        coverage = min(coverage, 0.5)
+    if re.search(r"[가-힣A-Za-z]+항공", user_query) and not airlines:
+        coverage = min(coverage, 0.5)
+
+    weekday = _WEEKDAY_PATTERN.search(user_query)
+    if weekday:
+        day_of_week = f"{weekday.group(1)}요일"
+    elif "내일" in user_query:
+        day_of_week = "내일"
+    else:
+        day_of_week = "오늘"
+
+    period_match = _TIME_PERIOD_PATTERN.search(user_query)
+    year_match = _YEAR_PATTERN.search(user_query)
+    requested_year = current_year
+    if year_match:
+        year = int(year_match.group(1))
+        requested_year = year + 2000 if year < 100 else year
+
+    airport_name = airports[0] if airports else None
+    request = {
+        "airline_name": airlines[0] if airlines else None,
+        "airport_name": airport_name,
+        "airport_codes": list(CITY_AIRPORT_CODES[airport_name]) if airport_name else [],
+        "day_of_week": day_of_week,
+        "direction": "도착" if _SCHEDULE_ARRIVAL_PATTERN.search(user_query) else "출발",
+        "time_period": _SCHEDULE_PERIODS.get(period_match.group(0)) if period_match else None,
+        "requested_year": requested_year,
+    }
+    return {"requests": [request]}, coverage
+
+
+def parse_flight_baggage_query(user_query: str, slots: list):
+    """_parse_flight_baggage_query_with_llm과 같은 [{...}] 형식 (시각은 HHMM 문자열)"""
+    if _EXPLICIT_DATE_PATTERN.search(user_query):
+        return None, 0.0
+
+    flight_match = _FLIGHT_ID_PATTERN.search(user_query)
+    flight_id = "".join(flight_match.groups()).upper() if flight_match else None
+
+    airports = _airports(user_query, slots)
+    airport_code = CITY_AIRPORT_CODES[airports[0]][0] if len(airports) == 1 else None
+
+    from_time = to_time = None
+    hours = _hours(user_query)
+    if hours:
+        hour = hours[0][0]
+        from_time = f"{(hour - 1) % 24:02d}00"
+        to_time = f"{(hour + 1) % 24:02d}00"
+    else:
+        period = _TIME_PERIOD_PATTERN.search(user_query)
+        from_time, to_time = resolve_time_range(period.group(0) if period else None, None)
+
+    if flight_id:
+        coverage = 1.0
+    elif airport_code and (hours or from_time):
+        coverage = 1.0 if not hours or hours[0][1] else 0.6  # '5시'처럼 오전/오후가 모호
+    else:
+        coverage = 0.4
+
+    offset = _date_offset(user_query)
+    return [{
+        "date_offset": offset if offset is not None else 0,
+        "flight_id": flight_id,
+        "searchday": None,
+        "from_time": from_time,
+        "to_time": to_time,
+        "airport_code": airport_code,
+    }], coverage
+
+
+_WALK_KEYWORDS = re.compile(r"주차|터미널|[Tt][12]|탑승동|게이트|출국장|입국장|체크인|카운터")
+_WALK_PREDICATE = re.compile(r"(가는|걸어|도보|걸리|얼마|몇\s*분|시간).*$")
+
+
+def parse_parking_walk_time_query(user_query: str, slots: list):
+    return _decompose(user_query, _WALK_KEYWORDS, _WALK_PREDICATE)
+
+
+_IMMIGRATION_KEYWORDS = re.compile(r"입국|출국|심사|세관|면세|신고|여권|비자|검역|자동출입국|반입|한도|규정|서류")
+
+
+def parse_immigration_policy_query(user_query: str, slots: list):
+    return _decompose(user_query, _IMMIGRATION_KEYWORDS)
+
+
+_TRANSFER_KEYWORDS = re.compile(r"터미널|[Tt][12]|탑승동|게이트|환승|라운지|출국장|입국장")
+_TRANSFER_PREDICATE = re.compile(r"(가는|가려면|이동|환승|걸리|경로|길|방법).*$")
+
+
+def parse_transfer_route_query(user_query: str, slots: list):
+    return _decompose(user_query, _TRANSFER_KEYWORDS, _TRANSFER_PREDICATE)
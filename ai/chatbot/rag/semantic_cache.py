@@ -0,0 +1,387 @@
+"""
+시맨틱 답변 캐시 (프로세스 내 인덱스 + Redis 복제)
+
+같거나 충분히 비슷한 질문의 답변을 재사용합니다. 조회는 Atlas를 거치지 않고 워커 메모리에서만 합니다.
+
+- 1단계(exact): 정규화한 질문 문자열 해시로 바로 확인 (임베딩 불필요)
+- 2단계(vector): 최근 Q/A 임베딩을 정규화된 float32 링 버퍼에 올려 두고 내적으로 가장 가까운 질문을 찾습니다.
+  점수는 Atlas cosine vectorSearchScore와 같은 (1 + cos) / 2 스케일이며 SEMANTIC_CACHE_MIN_SCORE 이상이면 적중입니다.
+  유효한 항목이 하나도 없으면 질문 임베딩도 하지 않습니다.
+  편명/숫자(KE907, 1터미널 등)가 다른 질문은 유사도가 높아도 적중으로 보지 않습니다.
+- 항목마다 TTL(의도별, cache_policy.py)이 있으며 로컬에서도 그 시각에 만료됩니다. (Atlas Cached TTL 인덱스와 동일)
+- 항목에는 답변을 만든 의도/슬롯/데이터 도메인이 태그됩니다. version_loader로 도메인별 갱신 시각(DataVersion)을
+  SEMANTIC_CACHE_VERSION_POLL_SEC마다 확인해, 데이터가 갱신되기 전에 만든 항목은 버립니다.
+- 복제: add()한 항목을 Redis Stream(SEMANTIC_CACHE_STREAM)에 올리고, 워커마다 백그라운드 스레드가
+  SEMANTIC_CACHE_SYNC_SEC 간격으로 새 항목을 읽어 로컬 인덱스에 반영합니다. 워커 기동 시에는 스트림 전체를 재생합니다.
+- Redis를 쓸 수 없으면 bootstrap_loader(Atlas Cached 컬렉션의 최근 항목)로 한 번 채우고 로컬만으로 동작합니다.
+- Atlas는 영속화 용도로만 사용합니다. (저장은 호출부에서)
+- 메트릭: semantic_cache.exact_hit / vector_hit / miss / replicated / invalidated, semantic_cache.lookup_ms (stats()로 적중률 확인)
+"""
+import hashlib
+import json
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+
+from chatbot.rag.embedding_cache import normalize_text
+from shared.metrics import get_counter, get_histogram
+from shared.redis_client import get_redis, mark_redis_failed
+
+SEMANTIC_CACHE_TTL_SEC = int(os.getenv("SEMANTIC_CACHE_TTL_SEC", "300"))
+SEMANTIC_CACHE_MIN_SCORE = float(os.getenv("SEMANTIC_CACHE_MIN_SCORE", "0.97"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "4096"))
+SEMANTIC_CACHE_STREAM = os.getenv("SEMANTIC_CACHE_STREAM", "semcache:stream")
+SEMANTIC_CACHE_SYNC_SEC = float(os.getenv("SEMANTIC_CACHE_SYNC_SEC", "0.5"))
+SEMANTIC_CACHE_VERSION_POLL_SEC = float(os.getenv("SEMANTIC_CACHE_VERSION_POLL_SEC", "30"))
+
+_SYNC_BATCH = 500
+
+_exact_hit = get_counter("semantic_cache.exact_hit")
+_vector_hit = get_counter("semantic_cache.vector_hit")
+_miss = get_counter("semantic_cache.miss")
+_replicated = get_counter("semantic_cache.replicated")
+_invalidated = get_counter("semantic_cache.invalidated")
+_lookup_ms = get_histogram("semantic_cache.lookup_ms", (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250))
+
+_TRAILING_PUNCT = re.compile(r"[\s?？!.。~]+$")
+_NUMBER_TOKEN = re.compile(r"[A-Za-z]*\d+")
+
+
+def exact_key(question: str) -> str:
+    """exact 단계 키 (NFC + 공백 정리 + 소문자 + 끝 문장부호 제거 후 해시)"""
+    normalized = _TRAILING_PUNCT.sub("", normalize_text(question).lower())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _number_tokens(question: str) -> set:
+    """편명/숫자 토큰 (KE907, 1, 2 ...) - 벡터 단계에서 이 값이 다르면 다른 질문으로 취급"""
+    return {token.upper() for token in _NUMBER_TOKEN.findall(normalize_text(question))}
+
+
+def _to_epoch(value) -> float:
+    if isinstance(value, datetime):
+        # pymongo는 기본적으로 tz 정보 없는 UTC datetime을 반환
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+class _VectorRing:
+    """최근 항목 임베딩 링 버퍼 (가득 차면 가장 오래된 자리부터 덮어씀)"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.matrix = None
+        self.expires_at = np.zeros(capacity, dtype=np.float64)
+        self.entries = [None] * capacity
+        self.size = 0
+        self._next = 0
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def add(self, vector, entry: dict):
+        vector = self._normalize(vector)
+        if self.matrix is None or self.matrix.shape[1] != vector.shape[0]:
+            # 첫 항목(또는 임베딩 모델 변경) 시 차원에 맞춰 새로 할당
+            self.matrix = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+            self.expires_at[:] = 0
+            self.entries = [None] * self.capacity
+            self.size, self._next = 0, 0
+
+        slot = self._next
+        self.matrix[slot] = vector
+        self.expires_at[slot] = entry["expires_at"]
+        self.entries[slot] = entry
+        self._next = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def live_count(self, now: float) -> int:
+        return int(np.count_nonzero(self.expires_at[:self.size] > now))
+
+    def search(self, vector, now: float):
+        """만료되지 않은 항목 중 가장 가까운 (항목, 점수). 없으면 (None, 0.0)"""
+        if self.matrix is None or self.size == 0:
+            return None, 0.0
+        query = self._normalize(vector)
+        if query.shape[0] != self.matrix.shape[1]:
+            return None, 0.0
+
+        live = self.expires_at[:self.size] > now
+        if not live.any():
+            return None, 0.0
+        similarities = self.matrix[:self.size] @ query
+        similarities[~live] = -np.inf
+        idx = int(np.argmax(similarities))
+        return self.entries[idx], float((1.0 + similarities[idx]) / 2.0)
+
+
+class SemanticCache:
+    def __init__(self, embed, ttl_sec: int = SEMANTIC_CACHE_TTL_SEC, min_score: float = SEMANTIC_CACHE_MIN_SCORE,
+                 max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES, stream: str = SEMANTIC_CACHE_STREAM,
+                 bootstrap_loader=None, version_loader=None):
+        """
+        Args:
+            embed: 질문 문자열 → 임베딩 리스트 함수 (임베딩 캐시를 거치는 get_query_embedding)
+            ttl_sec: add()에서 TTL을 지정하지 않았을 때의 기본값
+            bootstrap_loader: now(datetime) → 만료되지 않은 문서(question, answer, embedding, created_at, expires_at ...)
+                iterable. Redis를 쓸 수 없을 때 로컬 인덱스를 처음 한 번 채우는 데 사용
+            version_loader: () → {도메인: 마지막 데이터 갱신 시각}. 이보다 먼저 만든 해당 도메인 항목은 무효
+        """
+        self._embed = embed
+        self.ttl_sec = ttl_sec
+        self.min_score = min_score
+        self.max_entries = max_entries
+        self.stream = stream
+        self._bootstrap_loader = bootstrap_loader
+        self._version_loader = version_loader
+        self._domain_versions = {}
+        self._versions_checked_at = 0.0
+        self._exact = OrderedDict()
+        self._vectors = _VectorRing(max_entries)
+        self._lock = threading.Lock()
+        self._origin = None
+        self._sync_pid = None
+        self._last_id = None
+
+    # --- 로컬 인덱스 ---
+    def _is_valid(self, entry: dict, now: float) -> bool:
+        if entry["expires_at"] <= now:
+            return False
+        return all(self._domain_versions.get(domain, 0.0) <= entry["created_at"] for domain in entry.get("domains", ()))
+
+    def _insert(self, entry: dict, vector):
+        if not self._is_valid(entry, time.time()):
+            return
+        with self._lock:
+            self._exact[entry["key"]] = entry
+            self._exact.move_to_end(entry["key"])
+            while len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+            if vector is not None:
+                self._vectors.add(vector, entry)
+
+    def _reset_local(self):
+        self._exact = OrderedDict()
+        self._vectors = _VectorRing(self.max_entries)
+
+    def _purge_invalid(self) -> int:
+        """만료/무효 항목을 exact 사전과 벡터 링에서 제거합니다."""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for key in [key for key, entry in self._exact.items() if not self._is_valid(entry, now)]:
+                del self._exact[key]
+            for slot in range(self._vectors.size):
+                entry = self._vectors.entries[slot]
+                if entry is not None and self._vectors.expires_at[slot] > now and not self._is_valid(entry, now):
+                    self._vectors.expires_at[slot] = 0.0
+                    removed += 1
+        return removed
+
+    # --- 데이터 갱신에 따른 무효화 ---
+    def _poll_versions(self):
+        if self._version_loader is None:
+            return
+        self._versions_checked_at = time.monotonic()
+        try:
+            versions = {domain: _to_epoch(value) for domain, value in self._version_loader().items()}
+        except Exception as e:
+            print(f"디버그: 시맨틱 캐시 데이터 갱신 시각 조회 실패 - {e}")
+            return
+        changed = [domain for domain, value in versions.items() if value > self._domain_versions.get(domain, 0.0)]
+        if not changed:
+            return
+        self._domain_versions = versions
+        removed = self._purge_invalid()
+        _invalidated.inc(removed)
+        print(f"디버그: 시맨틱 캐시 데이터 갱신 감지 {changed} - {removed}개 항목 무효화")
+
+    # --- Redis 복제 ---
+    def _ensure_sync(self):
+        """워커 프로세스마다 복제 스레드를 한 번 시작합니다. (fork 이후에는 로컬 항목을 비우고 스트림으로 다시 채움)"""
+        if self._sync_pid == os.getpid():
+            return
+        with self._lock:
+            if self._sync_pid == os.getpid():
+                return
+            self._reset_local()
+            self._sync_pid = os.getpid()
+            self._origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+            self._last_id = None
+        threading.Thread(target=self._sync_loop, name="semantic-cache-sync", daemon=True).start()
+
+    def _publish(self, entry: dict, vector):
+        redis_client = get_redis()
+        if redis_client is None:
+            return
+        try:
+            redis_client.xadd(
+                self.stream,
+                {
+                    "origin": self._origin,
+                    "entry": json.dumps(entry, ensure_ascii=False),
+                    "embedding": np.asarray(vector, dtype=np.float32).tobytes(),
+                },
+                maxlen=self.max_entries,
+                approximate=True,
+            )
+        except Exception as e:
+            print(f"디버그: 시맨틱 캐시 Redis 복제 실패 - {e}")
+            mark_redis_failed()
+
+    def _ingest(self, fields: dict):
+        if fields.get(b"origin", b"").decode() == self._origin:
+            return  # 이 워커가 add()한 항목은 이미 로컬에 있음
+        entry = json.loads(fields[b"entry"])
+        if not self._is_valid(entry, time.time()):
+            return
+        self._insert(entry, np.frombuffer(fields[b"embedding"], dtype=np.float32))
+        _replicated.inc()
+
+    def _bootstrap(self):
+        count = 0
+        try:
+            for doc in self._bootstrap_loader(datetime.now(timezone.utc)):
+                if not doc.get("embedding"):
+                    continue
+                created_at = _to_epoch(doc["created_at"])
+                expires_at = _to_epoch(doc["expires_at"]) if doc.get("expires_at") else created_at + self.ttl_sec
+                entry = self._make_entry(
+                    doc["question"], doc["answer"], created_at, expires_at - created_at,
+                    doc.get("intent"), doc.get("slots"), doc.get("domains"),
+                )
+                self._insert(entry, doc["embedding"])
+                count += 1
+            print(f"디버그: 시맨틱 캐시를 영속 저장소에서 {count}개 항목으로 초기화했습니다.")
+        except Exception as e:
+            print(f"디버그: 시맨틱 캐시 초기화 실패 - {e}")
+
+    def _sync_loop(self):
+        # 스트림 재생 전에 갱신 시각을 먼저 읽어, 갱신 이전에 만든 항목이 다시 들어오지 않도록 함
+        self._poll_versions()
+        bootstrapped = False
+        while True:
+            if time.monotonic() - self._versions_checked_at >= SEMANTIC_CACHE_VERSION_POLL_SEC:
+                self._poll_versions()
+
+            redis_client = get_redis()
+            if redis_client is None:
+                if not bootstrapped and self._bootstrap_loader is not None:
+                    self._bootstrap()
+                bootstrapped = True
+                time.sleep(max(SEMANTIC_CACHE_SYNC_SEC, 1.0))
+                continue
+
+            try:
+                response = redis_client.xread({self.stream: self._last_id or "0-0"}, count=_SYNC_BATCH)
+            except Exception as e:
+                print(f"디버그: 시맨틱 캐시 Redis 동기화 실패 - {e}")
+                mark_redis_failed()
+                continue
+            bootstrapped = True
+
+            received = 0
+            for _stream, messages in response or []:
+                for message_id, fields in messages:
+                    self._last_id = message_id
+                    received += 1
+                    try:
+                        self._ingest(fields)
+                    except Exception as e:
+                        print(f"디버그: 시맨틱 캐시 복제 항목 처리 실패 - {e}")
+            if received < _SYNC_BATCH:
+                time.sleep(SEMANTIC_CACHE_SYNC_SEC)
+
+    # --- 조회/저장 ---
+    def _make_entry(self, question: str, answer: str, created_at: float, ttl_sec: float,
+                    intent: str = None, slots: list = None, domains: list = None) -> dict:
+        return {
+            "key": exact_key(question),
+            "question": question,
+            "answer": answer,
+            "intent": intent,
+            "slots": slots or [],
+            "domains": list(domains or []),
+            "created_at": created_at,
+            "expires_at": created_at + ttl_sec,
+        }
+
+    @staticmethod
+    def _hit(entry: dict, score: float, tier: str) -> dict:
+        return {"answer": entry["answer"], "question": entry["question"], "intent": entry.get("intent"),
+                "score": score, "tier": tier}
+
+    def lookup(self, question: str):
+        """적중하면 {"answer", "question", "intent", "score", "tier"}, 아니면 None"""
+        self._ensure_sync()
+        started = time.perf_counter()
+        now = time.time()
+        try:
+            with self._lock:
+                entry = self._exact.get(exact_key(question))
+            if entry is not None and self._is_valid(entry, now):
+                _exact_hit.inc()
+                return self._hit(entry, 1.0, "exact")
+
+            with self._lock:
+                live = self._vectors.live_count(now)
+            if not live:
+                _miss.inc()
+                return None
+
+            vector = self._embed(question)
+            with self._lock:
+                entry, score = self._vectors.search(vector, now)
+            if entry is not None and score >= self.min_score and self._is_valid(entry, now) \
+                    and _number_tokens(entry["question"]) == _number_tokens(question):
+                _vector_hit.inc()
+                return self._hit(entry, score, "vector")
+
+            _miss.inc()
+            return None
+        finally:
+            _lookup_ms.observe((time.perf_counter() - started) * 1000)
+
+    def add(self, question: str, answer: str, embedding=None, ttl_sec: int = None,
+            intent: str = None, slots: list = None, domains: list = None) -> dict:
+        """
+        로컬 인덱스에 추가하고 다른 워커로 복제합니다. 영속화(Atlas 저장)는 호출부에서 합니다.
+
+        Args:
+            ttl_sec: 항목 유지 시간 (의도별 정책, 기본 self.ttl_sec)
+            intent/slots/domains: 답변을 만든 의도, 개체 슬롯, 근거 데이터 도메인 (도메인 갱신 시 무효화)
+        """
+        self._ensure_sync()
+        if embedding is None:
+            embedding = self._embed(question)
+        entry = self._make_entry(question, answer, time.time(), ttl_sec or self.ttl_sec, intent, slots, domains)
+        self._insert(entry, embedding)
+        self._publish(entry, embedding)
+        return entry
+
+    def stats(self) -> dict:
+        exact_hits, vector_hits, misses = _exact_hit.value, _vector_hit.value, _miss.value
+        total = exact_hits + vector_hits + misses
+        with self._lock:
+            live = self._vectors.live_count(time.time())
+        return {
+            "entries": live,
+            "exact_hit": exact_hits,
+            "vector_hit": vector_hits,
+            "miss": misses,
+            "hit_rate": round((exact_hits + vector_hits) / total, 3) if total else 0.0,
+            "replicated": _replicated.value,
+            "invalidated": _invalidated.value,
+        }
@@ -0,0 +1,170 @@
+"""
+최종 답변 LLM 스트리밍
+
+스트리밍 모드(streaming_mode())에서는 common_llm_rag_caller / get_formatted_llm_response 등이
+완성된 문자열 대신 LLMStream을 반환합니다. 핸들러는 이를 그대로 state["response"]에 담아 넘기고,
+/api/generate/stream 뷰가 반복하며 HTML 조각을 클라이언트로 보냅니다.
+
+- LLMStream은 반복 시점에 OpenAI 스트리밍 호출을 시작합니다.
+- str()로 변환하면(문자열로 합치는 핸들러 등) 끝까지 받아 완성된 답변을 돌려주므로 기존 코드와 호환됩니다.
+- 스트리밍 모드가 아니면 모든 호출부는 기존처럼 문자열을 반환합니다.
+- OpenAI 호출이 실패하면 failed가 True가 되고 답변 끝에 error_message를 붙입니다. (첫 청크 이후 실패 포함)
+  뷰는 failed인 답변을 시맨틱 캐시에 저장하지 않습니다.
+- 비동기 경로(chat_graph.ainvoke)는 같은 방식으로 LLMStream을 받아 atext(async_client)로
+  AsyncOpenAI 호출을 이벤트 루프에서 기다립니다. (스레드를 점유하지 않음)
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+
+from shared.metrics import get_histogram
+
+_streaming = contextvars.ContextVar("llm_streaming", default=False)
+
+_first_token_ms = get_histogram("llm_stream.first_token_ms")
+_total_ms = get_histogram("llm_stream.total_ms")
+_async_total_ms = get_histogram("llm_async.total_ms")
+
+# 최종 응답에서 제거하던 마크다운 표시 (청크 경계에 걸쳐 올 수 있음)
+_MARKERS = ("```html", "```", "**")
+
+
+@contextmanager
+def streaming_mode(enabled: bool = True):
+    """이 블록 안에서 호출되는 최종 답변 LLM 함수들이 LLMStream을 반환하도록 합니다."""
+    token = _streaming.set(enabled)
+    try:
+        yield
+    finally:
+        _streaming.reset(token)
+
+
+def is_streaming() -> bool:
+    return _streaming.get()
+
+
+def _clean(text: str) -> str:
+    for marker in _MARKERS:
+        text = text.replace(marker, "")
+    return text
+
+
+def _partial_marker_length(text: str) -> int:
+    """text 끝부분 중 마커의 앞부분일 수 있는 가장 긴 길이"""
+    longest = 0
+    for marker in _MARKERS:
+        for size in range(1, len(marker) + 1):
+            if size > longest and text.endswith(marker[:size]):
+                longest = size
+    return longest
+
+
+class LLMStream:
+    def __init__(self, client, create_kwargs: dict, suffix: str = "", clean: bool = True,
+                 error_message: str = "죄송합니다. 답변을 생성하는 중 문제가 발생했습니다. 다시 시도해 주세요."):
+        """
+        Args:
+            client: OpenAI 클라이언트
+            create_kwargs: chat.completions.create 인자 (stream 제외)
+            suffix: 답변 끝에 붙일 문자열 (DISCLAIMER 등)
+            clean: ```html, ```, ** 표시 제거 여부
+        """
+        self._client = client
+        self._create_kwargs = create_kwargs
+        self._suffix = suffix
+        self._strip_markers = clean
+        self.error_message = error_message
+        # OpenAI 호출 실패 여부 (일부 청크를 보낸 뒤 실패한 경우 포함)
+        self.failed = False
+        self._chunks = []
+        self._done = False
+
+    def __iter__(self):
+        if self._done:
+            yield from self._chunks
+            return
+
+        started = time.perf_counter()
+        first_token = True
+        pending = ""
+        try:
+            stream = self._client.chat.completions.create(stream=True, **self._create_kwargs)
+            for event in stream:
+                delta = event.choices[0].delta.content if event.choices else None
+                if not delta:
+                    continue
+                if first_token:
+                    _first_token_ms.observe((time.perf_counter() - started) * 1000)
+                    first_token = False
+
+                if not self._strip_markers:
+                    self._chunks.append(delta)
+                    yield delta
+                    continue
+
+                pending += delta
+                hold = _partial_marker_length(pending)
+                ready, pending = pending[:len(pending) - hold], pending[len(pending) - hold:]
+                ready = _clean(ready)
+                if ready:
+                    self._chunks.append(ready)
+                    yield ready
+            tail = _clean(pending) + self._suffix
+        except Exception as e:
+            print(f"디버그: LLM 스트리밍 중 오류 발생: {e}")
+            self.failed = True
+            # 일부 청크를 보낸 뒤 실패하면 잘린 답변 뒤에 오류 문구를 붙임
+            tail = self.error_message if not self._chunks else "\n\n" + self.error_message
+
+        if tail:
+            self._chunks.append(tail)
+            yield tail
+        self._done = True
+        _total_ms.observe((time.perf_counter() - started) * 1000)
+
+    @property
+    def text(self) -> str:
+        """완성된 답변 (아직 스트리밍 전이면 끝까지 받음)"""
+        if not self._done:
+            for _ in self:
+                pass
+        return "".join(self._chunks)
+
+    async def atext(self, async_client) -> str:
+        """AsyncOpenAI 클라이언트로 (스트리밍 없이) 완성된 답변을 받습니다."""
+        if self._done:
+            return "".join(self._chunks)
+
+        started = time.perf_counter()
+        try:
+            response = await async_client.chat.completions.create(**self._create_kwargs)
+            text = response.choices[0].message.content + self._suffix
+            if self._strip_markers:
+                text = _clean(text)
+        except Exception as e:
+            print(f"디버그: 비동기 LLM 호출 중 오류 발생: {e}")
+            self.failed = True
+            text = self.error_message
+
+        self._chunks = [text]
+        self._done = True
+        _async_total_ms.observe((time.perf_counter() - started) * 1000)
+        return text
+
+    def __str__(self):
+        return self.text
+
+    def __contains__(self, item):
+        return item in self.text
+
+
+def llm_response(client, create_kwargs: dict, suffix: str = "", clean: bool = True):
+    """
+    스트리밍 모드면 LLMStream을, 아니면 완성된 답변 문자열을 반환합니다.
+    (```html, ```, ** 제거 및 suffix 추가는 기존 호출부와 동일)
+    """
+    if is_streaming():
+        return LLMStream(client, create_kwargs, suffix=suffix, clean=clean)
+    response = client.chat.completions.create(**create_kwargs)
+    text = response.choices[0].message.content + suffix
+    return _clean(text) if clean else text
@@ -1,13 +1,21 @@
 # ai/chatbot/rag/utils.py
 
-import pymongo
-from pymongo.mongo_client import MongoClient # 추가 임포트
-from pymongo.server_api import ServerApi     # 추가 임포트
-from sentence_transformers import SentenceTransformer
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
 from pathlib import Path
 
+from shared.model_registry import get_embedding_model as _get_registry_embedding_model
+from chatbot.rag.embedding_cache import EmbeddingCache
+from chatbot.rag.local_index import VECTOR_SEARCH_BACKEND, UnsupportedFilterError, create_registry
+from shared.metrics import get_counter, get_histogram
+from chatbot.graph.db.mongo_client import (
+    get_mongo_client as get_shared_mongo_client,
+    get_collection as get_shared_collection,
+)
+
 env_path = Path(__file__).resolve().parents[3] / ".env"
 load_dotenv(dotenv_path=env_path, override=True)  # ✅ 조건 없이 수행
 
@@ -20,49 +28,45 @@ VECTOR_INDEX_NAME = os.getenv("VECTOR_INDEX_NAME", "airline_vector_index")
 EMBEDDING_FIELD_NAME = os.getenv("EMBEDDING_FIELD_NAME", "embedding")
 TEXT_CONTENT_FIELD_NAME = os.getenv("TEXT_CONTENT_FIELD_NAME", "text_content")
 
-# --- MongoDB 클라이언트 및 임베딩 모델 전역으로 초기화 ---
-_mongo_client = None
+# --- 임베딩 모델 전역으로 초기화 ---
+# MongoDB 클라이언트는 chatbot/graph/db/mongo_client.py의 공용 커넥션 풀을 사용합니다.
 _embedding_model = None
 
-# get_mongo_collection 함수 대신, _mongo_client를 초기화하고 반환하는 함수를 만듭니다.
-def get_mongo_client():
-    """MongoDB 클라이언트 인스턴스를 반환하고, 연결 테스트를 수행합니다."""
-    global _mongo_client
-    if _mongo_client is None:
-        if not MONGO_URI:
-            raise ValueError("MONGO_URI 환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
-        try:
-            # pymongo.MongoClient 대신 MongoClient를 사용하고 server_api를 명시
-            _mongo_client = MongoClient(MONGO_URI, server_api=ServerApi('1'))
-            # 연결 테스트
-            _mongo_client.admin.command('ping')
-            print("디버그: MongoDB Atlas에 성공적으로 연결되었습니다!")
-        except Exception as e:
-            print(f"오류: MongoDB Atlas 연결에 실패했습니다. URI를 확인하거나, IP 접근 및 사용자 인증을 확인해주세요: {e}")
-            _mongo_client = None # 연결 실패 시 클라이언트 초기화
-            raise # 연결 실패 예외 발생
+_vector_search_ms = get_histogram("rag.vector_search_ms")
+_vector_search_timeouts = get_counter("rag.vector_search_timeouts")
+_vector_search_errors = get_counter("rag.vector_search_errors")
 
-    return _mongo_client
+def get_mongo_client():
+    """프로세스 공용 MongoDB 클라이언트(커넥션 풀)를 반환합니다."""
+    if not MONGO_URI:
+        raise ValueError("MONGO_URI 환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
+    return get_shared_mongo_client()
 
 
 def get_mongo_collection(collection_name: str = COLLECTION_NAME_DEFAULT):
     """지정된 MongoDB 컬렉션을 반환합니다."""
-    # 먼저 클라이언트를 가져옵니다.
-    client = get_mongo_client()
-    db = client[DB_NAME]
-    return db[collection_name]
+    return get_shared_collection(collection_name, DB_NAME)
 
 def get_embedding_model():
-    """임베딩 모델 인스턴스를 반환합니다."""
+    """임베딩 모델 인스턴스를 반환합니다. (모델 레지스트리에서 프로세스당 1회 로드)"""
     global _embedding_model
     if _embedding_model is None:
-        _embedding_model = SentenceTransformer(EMBEDDING_MODEL_PATH)
+        _embedding_model = _get_registry_embedding_model()
     return _embedding_model
 
+# VECTOR_SEARCH_BACKEND=local일 때 사용하는 컬렉션별 로컬 벡터 인덱스 (Mongo에서 로드, 주기적 갱신)
+_local_indexes = create_registry(get_mongo_collection, EMBEDDING_FIELD_NAME, TEXT_CONTENT_FIELD_NAME)
+
+# 정규화된 텍스트 + 모델 ID 기준 임베딩 캐시 (LRU + Redis)
+_embedding_cache = EmbeddingCache(get_embedding_model, EMBEDDING_MODEL_PATH)
+
 def get_query_embedding(query: str) -> list:
-    """사용자 쿼리를 벡터로 임베딩합니다."""
-    model = get_embedding_model()
-    return model.encode(query).tolist()
+    """사용자 쿼리를 벡터로 임베딩합니다. (캐시 사용)"""
+    return _embedding_cache.get(query)
+
+def get_query_embeddings(queries: list) -> list:
+    """여러 쿼리를 한 번에 임베딩합니다. 캐시에 없는 쿼리만 배치로 인코딩합니다."""
+    return _embedding_cache.get_many(queries)
 
 def perform_vector_search(
     query_embedding: list,
@@ -72,11 +76,50 @@ def perform_vector_search(
     vector_index_name: str = VECTOR_INDEX_NAME, # config.py에서 오버라이드될 것임
     embedding_field: str = EMBEDDING_FIELD_NAME,
     text_content_field: str = TEXT_CONTENT_FIELD_NAME,
-    query_filter: dict = None # 추가적인 필터링을 위한 인자
+    query_filter: dict = None, # 추가적인 필터링을 위한 인자
+    max_time_ms: int = None # 서버 측 실행 시간 제한
 ) -> list:
     """
     MongoDB에서 벡터 검색을 수행하고, 지정된 필드의 텍스트 내용을 반환합니다.
     """
+    results = perform_vector_search_with_scores(
+        query_embedding,
+        collection_name=collection_name,
+        top_k=top_k,
+        num_candidates=num_candidates,
+        vector_index_name=vector_index_name,
+        embedding_field=embedding_field,
+        text_content_field=text_content_field,
+        query_filter=query_filter,
+        max_time_ms=max_time_ms,
+    )
+    return [text for text, _ in results]
+
+def perform_vector_search_with_scores(
+    query_embedding: list,
+    collection_name: str = COLLECTION_NAME_DEFAULT,
+    top_k: int = 5,
+    num_candidates: int = 100,
+    vector_index_name: str = VECTOR_INDEX_NAME,
+    embedding_field: str = EMBEDDING_FIELD_NAME,
+    text_content_field: str = TEXT_CONTENT_FIELD_NAME,
+    query_filter: dict = None,
+    max_time_ms: int = None
+) -> list:
+    """
+    perform_vector_search와 같지만 [(텍스트, vectorSearchScore), ...]를 반환합니다.
+    VECTOR_SEARCH_BACKEND=local이면 프로세스 메모리의 로컬 인덱스에서 검색합니다.
+    """
+    if VECTOR_SEARCH_BACKEND == "local" and embedding_field == EMBEDDING_FIELD_NAME \
+            and text_content_field == TEXT_CONTENT_FIELD_NAME:
+        try:
+            return _local_indexes.search(
+                query_embedding, collection_name, top_k=top_k, query_filter=query_filter
+            )
+        except UnsupportedFilterError as e:
+            # 로컬에서 평가할 수 없는 필터는 Atlas로 검색
+            print(f"디버그: 로컬 인덱스 필터 미지원, Atlas로 검색합니다. - {e}")
+
     collection = get_mongo_collection(collection_name)
 
     pipeline = []
@@ -109,38 +152,162 @@ def perform_vector_search(
     # 디버그: 파이프라인 출력
     # print(f"디버그: MongoDB Aggregation Pipeline for '{collection_name}': {pipeline}")
 
-    search_results = collection.aggregate(pipeline)
-    return [doc[text_content_field] for doc in search_results if text_content_field in doc]
+    aggregate_options = {"maxTimeMS": max_time_ms} if max_time_ms else {}
+    started = time.perf_counter()
+    search_results = list(collection.aggregate(pipeline, **aggregate_options))
+    _vector_search_ms.observe((time.perf_counter() - started) * 1000)
+    return [
+        (doc[text_content_field], doc.get("score", 0.0))
+        for doc in search_results if text_content_field in doc
+    ]
+
+# --- 여러 벡터 검색을 동시에 실행하기 위한 공용 스레드 풀 ---
+RAG_SEARCH_MAX_WORKERS = int(os.getenv("RAG_SEARCH_MAX_WORKERS", "8"))
+# 컬렉션별 검색 제한 시간 (느린 인덱스 하나가 전체 답변을 막지 않도록)
+RAG_SEARCH_TIMEOUT_SEC = float(os.getenv("RAG_SEARCH_TIMEOUT_SEC", "3"))
+_search_executor = None
+_search_executor_pid = None
+_search_executor_lock = threading.Lock()
+
+def _get_search_executor() -> ThreadPoolExecutor:
+    """벡터 검색용 스레드 풀 (fork 이후 자식 프로세스에서는 새로 생성)"""
+    global _search_executor, _search_executor_pid
+    if _search_executor is None or _search_executor_pid != os.getpid():
+        with _search_executor_lock:
+            if _search_executor is None or _search_executor_pid != os.getpid():
+                _search_executor = ThreadPoolExecutor(max_workers=RAG_SEARCH_MAX_WORKERS, thread_name_prefix="rag-search")
+                _search_executor_pid = os.getpid()
+    return _search_executor
+
+
+def run_vector_searches(search_specs: list) -> list:
+    """
+    perform_vector_search 인자(dict) 리스트를 받아 Mongo 검색을 동시에 실행하고,
+    입력 순서대로 결과 리스트를 반환합니다.
+    """
+    if len(search_specs) == 1:
+        return [perform_vector_search(**search_specs[0])]
+    executor = _get_search_executor()
+    futures = [executor.submit(perform_vector_search, **spec) for spec in search_specs]
+    return [future.result() for future in futures]
+
+
+def merge_unique_docs(result_lists: list) -> list:
+    """여러 검색 결과를 순서를 유지하며 합치고 중복 문서를 제거합니다."""
+    merged = []
+    seen = set()
+    for docs in result_lists:
+        for doc in docs:
+            if doc not in seen:
+                seen.add(doc)
+                merged.append(doc)
+    return merged
+
+
+def retrieve_documents_for_queries(
+    queries: list,
+    collection_name: str,
+    vector_index_name: str,
+    query_filter: dict = None,
+    top_k: int = 5,
+) -> list:
+    """
+    분해된 여러 하위 질의를 한 번의 배치 임베딩으로 인코딩하고,
+    하위 질의별 벡터 검색을 동시에 실행한 뒤 중복을 제거해 합친 문서 리스트를 반환합니다.
+    """
+    queries = list(dict.fromkeys(q for q in queries if q))
+    if not queries:
+        return []
+
+    print(f"디버그: 하위 질의 {len(queries)}개 배치 임베딩 및 동시 검색 - {queries}")
+    query_embeddings = get_query_embeddings(queries)
+    results = run_vector_searches([
+        {
+            "query_embedding": query_embedding,
+            "collection_name": collection_name,
+            "vector_index_name": vector_index_name,
+            "query_filter": query_filter,
+            "top_k": top_k,
+        }
+        for query_embedding in query_embeddings
+    ])
+    return merge_unique_docs(results)
+
+def fan_out_vector_search(search_specs: list, timeout_sec: float = RAG_SEARCH_TIMEOUT_SEC) -> list:
+    """
+    여러 컬렉션의 벡터 검색을 동시에 실행하고 점수(vectorSearchScore) 순으로 병합합니다.
+
+    Args:
+        search_specs: perform_vector_search 인자(dict) 리스트. spec마다 'timeout_sec'로 제한 시간을 따로 줄 수 있습니다.
+        timeout_sec: spec에 제한 시간이 없을 때 사용할 기본값
+
+    Returns:
+        [(텍스트, 점수, 컬렉션 이름), ...] 점수 내림차순, 중복 텍스트 제거.
+        제한 시간 안에 끝나지 않거나 실패한 컬렉션은 결과에서 제외됩니다.
+    """
+    executor = _get_search_executor()
+    started = time.monotonic()
+    submitted = []
+    for spec in search_specs:
+        spec = dict(spec)
+        spec_timeout = spec.pop("timeout_sec", None) or timeout_sec
+        # 클라이언트에서 기다리지 않게 된 검색은 서버에서도 곧 중단되도록 maxTimeMS를 함께 설정
+        spec.setdefault("max_time_ms", int(spec_timeout * 1000))
+        future = executor.submit(perform_vector_search_with_scores, **spec)
+        submitted.append((spec.get("collection_name", COLLECTION_NAME_DEFAULT), spec_timeout, future))
+
+    scored = []
+    for collection_name, spec_timeout, future in submitted:
+        remaining = spec_timeout - (time.monotonic() - started)
+        try:
+            results = future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            future.cancel()
+            _vector_search_timeouts.inc()
+            print(f"디버그: '{collection_name}' 벡터 검색이 {spec_timeout}초 안에 끝나지 않아 결과에서 제외합니다.")
+            continue
+        except Exception as e:
+            _vector_search_errors.inc()
+            print(f"디버그: '{collection_name}' 벡터 검색 실패 - {e}")
+            continue
+        scored.extend((text, score, collection_name) for text, score in results)
+
+    scored.sort(key=lambda item: item[1], reverse=True)
+    merged = []
+    seen = set()
+    for text, score, collection_name in scored:
+        if text not in seen:
+            seen.add(text)
+            merged.append((text, score, collection_name))
+    return merged
 
 def perform_multi_collection_search(
     query_embedding: list,
     collection_names: list, # 컬렉션 이름 리스트
     top_k_per_collection: int = 3, # 각 컬렉션당 가져올 문서 수
+    timeout_sec: float = RAG_SEARCH_TIMEOUT_SEC, # 컬렉션별 검색 제한 시간
     **kwargs # perform_vector_search에 전달될 다른 인자들 (num_candidates, vector_index_name 등)
 ) -> str:
     """
-    여러 MongoDB 컬렉션에서 벡터 검색을 수행하고 결과를 병합하여 반환합니다.
+    여러 MongoDB 컬렉션에서 벡터 검색을 동시에 수행하고, 점수 순으로 병합하여 반환합니다.
     """
-    all_retrieved_texts = []
-    for col_name in collection_names:
-        print(f"디버그: '{col_name}' 컬렉션에서 검색 중...")
-        # 여기서 각 컬렉션에 맞는 vector_index_name을 kwargs에 명시적으로 전달해야 할 수 있습니다.
-        # RAG_SEARCH_CONFIG에서 각 컬렉션의 인덱스 이름을 가져와서 사용하도록 common_llm_rag_caller에서 처리하는 것이 더 일반적입니다.
-        texts = perform_vector_search(
-            query_embedding,
-            collection_name=col_name,
-            top_k=top_k_per_collection,
-            **kwargs # 나머지 인자 전달 (여기서 vector_index_name이 올바르게 전달되는지 중요)
-        )
-        all_retrieved_texts.extend(texts)
-    
-    return "\n\n".join(all_retrieved_texts)
+    print(f"디버그: {collection_names} 컬렉션 동시 검색 중...")
+    search_specs = [
+        {
+            "query_embedding": query_embedding,
+            "collection_name": col_name,
+            "top_k": top_k_per_collection,
+            **kwargs, # 나머지 인자 전달 (여기서 vector_index_name이 올바르게 전달되는지 중요)
+        }
+        for col_name in collection_names
+    ]
+    merged = fan_out_vector_search(search_specs, timeout_sec=timeout_sec)
+    return "\n\n".join(text for text, _, _ in merged)
 
 
 def close_mongo_client():
-    """MongoDB 클라이언트 연결을 종료합니다."""
-    global _mongo_client
-    if _mongo_client:
-        _mongo_client.close()
-        _mongo_client = None
-        print("디버그: MongoDB 클라이언트 연결이 종료되었습니다.")
\ No newline at end of file
+    """
+    이전 버전 호환용 함수입니다.
+    MongoDB 클라이언트는 프로세스 전체가 공유하는 커넥션 풀이므로 요청 단위로 닫지 않습니다.
+    """
+    pass
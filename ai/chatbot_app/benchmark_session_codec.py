@@ -0,0 +1,128 @@
+"""
+대화 세션 저장 형식 비교: 기존 pickle(ChatState 전체) vs session_codec(msgpack + zlib, 필요한 필드만)
+REDIS_URL의 Redis에 연결되면 SET/GET 지연도 측정합니다. (연결 실패 시 직렬화만 측정)
+
+ai/ 디렉토리에서 실행:
+    python -m chatbot_app.benchmark_session_codec --turns 5 --iterations 500
+"""
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import time
+from pathlib import Path
+
+AI_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(AI_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "chatbot_core.settings")
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from chatbot_app.session_codec import decode_session, encode_session
+from shared.redis_client import get_redis
+
+SAMPLE_ANSWER = (
+    "<p>✈️ <b>KE123</b> 항공편 정보입니다.</p>"
+    "<ul><li>출발: 인천(ICN) 2025-08-20 10:30 (예정 10:45)</li>"
+    "<li>도착: 나리타(NRT) 12:50</li><li>터미널: T2 / 탑승구 253</li>"
+    "<li>체크인 카운터: D01-D18</li><li>현황: 출발 지연</li></ul>"
+    "<p>출국장 혼잡도는 현재 <b>보통</b>이며, 2번 출국장을 이용하시면 더 빠릅니다.</p>"
+) * 6
+
+
+def build_state(turns: int) -> dict:
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"KE123 항공편 {i + 1}번째 질문인데 탑승구가 어디야?"))
+        # 턴마다 다른 문자열이어야 pickle memo로 크기가 줄어드는 왜곡이 없음
+        messages.append(AIMessage(content=SAMPLE_ANSWER.replace("KE123", f"KE{123 + i}")))
+    slots = [("KE123", "B-flight_id"), ("항공편", "O"), ("탑승구", "B-gate"), ("어디야", "O")]
+    top_k = [("flight_info", 0.93), ("baggage_claim_info", 0.04), ("facility_guide", 0.01)]
+    return {
+        "user_input": messages[-2].content,
+        "rephrased_query": messages[-2].content,
+        "intent": "flight_info",
+        "slots": slots,
+        "previous_slots": slots,
+        "response": messages[-1].content,
+        "confidence": 0.93,
+        "top_k_intents_and_probs": top_k,
+        "detected_intents": top_k[:1],
+        "is_multi_intent": False,
+        "pre_message_id": "msg-000123",
+        "messages": messages[-10:],
+    }
+
+
+def timed(func, iterations: int) -> float:
+    """1회 실행 시간 중앙값 (µs)"""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    state = build_state(args.turns)
+    pickled = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+    meta_blob, messages_blob = encode_session(state)
+
+    print(f"--- 세션 크기 ({args.turns}턴, 메시지 {len(state['messages'])}개) ---")
+    print(f"pickle(ChatState 전체)  : {len(pickled):>8,} bytes")
+    print(f"codec 메타 + 메시지     : {len(meta_blob) + len(messages_blob):>8,} bytes "
+          f"(메타 {len(meta_blob):,} / 메시지 {len(messages_blob):,})")
+
+    print("\n--- 직렬화 (중앙값, µs) ---")
+    print(f"pickle   dumps {timed(lambda: pickle.dumps(state, pickle.HIGHEST_PROTOCOL), args.iterations):8.1f}"
+          f"  loads {timed(lambda: pickle.loads(pickled), args.iterations):8.1f}")
+    print(f"codec   encode {timed(lambda: encode_session(state), args.iterations):8.1f}"
+          f"  decode {timed(lambda: decode_session(meta_blob, messages_blob), args.iterations):8.1f}"
+          f"  메타만 {timed(lambda: decode_session(meta_blob, include_messages=False), args.iterations):8.1f}")
+
+    client = get_redis()
+    if client is None:
+        print("\nRedis에 연결할 수 없어 SET/GET 지연 측정은 건너뜁니다.")
+        return
+
+    key = "bench:chatbot_session"
+    messages_key = key + ":messages"
+    print("\n--- Redis SET/GET (중앙값, µs, 직렬화 포함) ---")
+
+    def pickle_set():
+        client.set(key, pickle.dumps(state, pickle.HIGHEST_PROTOCOL), ex=60)
+
+    def pickle_get():
+        pickle.loads(client.get(key))
+
+    def codec_set():
+        meta, msgs = encode_session(state)
+        client.pipeline().set(key, meta, ex=60).set(messages_key, msgs, ex=60).execute()
+
+    def codec_get():
+        meta, msgs = client.mget([key, messages_key])
+        decode_session(meta, msgs)
+
+    def codec_get_meta():
+        decode_session(client.get(key), include_messages=False)
+
+    pickle_set_us = timed(pickle_set, args.iterations)
+    pickle_get_us = timed(pickle_get, args.iterations)
+    codec_set_us = timed(codec_set, args.iterations)
+    codec_get_us = timed(codec_get, args.iterations)
+    codec_meta_us = timed(codec_get_meta, args.iterations)
+    client.delete(key, messages_key)
+
+    print(f"pickle   SET {pickle_set_us:8.1f}  GET {pickle_get_us:8.1f}")
+    print(f"codec    SET {codec_set_us:8.1f}  GET {codec_get_us:8.1f}  GET(메타만) {codec_meta_us:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
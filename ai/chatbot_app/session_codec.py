@@ -0,0 +1,133 @@
+"""
+Redis 대화 세션(ChatState) 직렬화
+
+이전에는 ChatState 전체(LangChain 메시지 객체, HTML 답변, top-k 목록, previous_slots 등)를 pickle로 저장했습니다.
+다음 턴의 그래프는 messages(대화 맥락), slots(→ previous_slots), pre_message_id(수정/재생성 판별)만 사용하므로
+이 필드만 버전이 붙은 msgpack 스키마로 저장합니다.
+
+- chatbot_session_{id}           : 메타 {"v", "pre_message_id", "slots", "n"} (작음)
+- chatbot_session_{id}:messages  : [[역할, 본문], ...]을 msgpack + zlib 압축, 본문은 SESSION_MESSAGE_MAX_CHARS로 자름
+
+시맨틱 캐시 적중처럼 pre_message_id만 필요한 경우 include_messages=False로 메타 키만 읽습니다. (부분 조회)
+스키마 버전이 다르면 빈 세션으로 취급하고, 배포 전 pickle로 저장된 ChatState(dict)는 그대로 읽어 다음 저장 때 변환합니다.
+"""
+import os
+import time
+import zlib
+from typing import Optional
+
+import ormsgpack
+from django.core.cache import cache
+from langchain_core.messages import AIMessage, HumanMessage
+
+from shared.metrics import get_counter, get_histogram
+
+SESSION_SCHEMA_VERSION = 1
+SESSION_TTL_SEC = int(os.getenv("SESSION_TTL_SEC", "1800"))
+SESSION_MESSAGE_MAX_CHARS = int(os.getenv("SESSION_MESSAGE_MAX_CHARS", "2000"))
+SESSION_COMPRESS_LEVEL = int(os.getenv("SESSION_COMPRESS_LEVEL", "6"))
+
+MESSAGES_KEY_SUFFIX = ":messages"
+
+_ROLE_TO_CLASS = {"h": HumanMessage, "a": AIMessage}
+
+_get_ms = get_histogram("session.get_ms")
+_set_ms = get_histogram("session.set_ms")
+_bytes = get_histogram("session.bytes", (256, 512, 1024, 2048, 4096, 8192, 16384, 32768))
+_version_mismatch = get_counter("session.version_mismatch")
+_legacy = get_counter("session.legacy")
+
+
+def messages_key(cache_key: str) -> str:
+    return cache_key + MESSAGES_KEY_SUFFIX
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= SESSION_MESSAGE_MAX_CHARS:
+        return text
+    return text[:SESSION_MESSAGE_MAX_CHARS] + "…"
+
+
+def encode_messages(messages) -> bytes:
+    rows = []
+    for message in messages or []:
+        role = "h" if isinstance(message, HumanMessage) else "a"
+        rows.append([role, _truncate(str(message.content or ""))])
+    return zlib.compress(ormsgpack.packb(rows), SESSION_COMPRESS_LEVEL)
+
+
+def decode_messages(blob: bytes) -> list:
+    rows = ormsgpack.unpackb(zlib.decompress(blob))
+    return [_ROLE_TO_CLASS.get(role, AIMessage)(content=content) for role, content in rows]
+
+
+def encode_session(state: dict):
+    """ChatState → (메타 bytes, 메시지 bytes)"""
+    messages = state.get("messages") or []
+    meta = {
+        "v": SESSION_SCHEMA_VERSION,
+        "pre_message_id": state.get("pre_message_id"),
+        "slots": [[word, tag] for word, tag in state.get("slots") or []],
+        "n": len(messages),
+    }
+    return ormsgpack.packb(meta), encode_messages(messages)
+
+
+def decode_session(meta_blob, messages_blob=None, include_messages: bool = True) -> Optional[dict]:
+    """
+    저장된 값 → ChatState. 세션이 없거나 스키마 버전이 다르면 None
+    include_messages=False면 messages를 풀지 않고 메타 필드만 반환합니다.
+    """
+    if meta_blob is None:
+        return None
+    if isinstance(meta_blob, dict):
+        # 배포 전 pickle로 저장된 ChatState
+        _legacy.inc()
+        return meta_blob
+
+    meta = ormsgpack.unpackb(meta_blob)
+    if meta.get("v") != SESSION_SCHEMA_VERSION:
+        _version_mismatch.inc()
+        return None
+
+    state = {"pre_message_id": meta.get("pre_message_id"), "slots": meta.get("slots") or []}
+    if include_messages:
+        state["messages"] = decode_messages(messages_blob) if messages_blob and meta.get("n") else []
+    return state
+
+
+def load_session(cache_key: str, include_messages: bool = True) -> Optional[dict]:
+    """세션 상태 조회 (없으면 None). include_messages=False면 메타 키만 읽습니다."""
+    started = time.perf_counter()
+    try:
+        if not include_messages:
+            return decode_session(cache.get(cache_key), include_messages=False)
+        values = cache.get_many([cache_key, messages_key(cache_key)])
+        return decode_session(values.get(cache_key), values.get(messages_key(cache_key)))
+    finally:
+        _get_ms.observe((time.perf_counter() - started) * 1000)
+
+
+def save_session(cache_key: str, state: dict, timeout: int = SESSION_TTL_SEC):
+    started = time.perf_counter()
+    meta_blob, messages_blob = encode_session(state)
+    cache.set_many({cache_key: meta_blob, messages_key(cache_key): messages_blob}, timeout=timeout)
+    _bytes.observe(len(meta_blob) + len(messages_blob))
+    _set_ms.observe((time.perf_counter() - started) * 1000)
+
+
+def touch_session(cache_key: str, timeout: int = SESSION_TTL_SEC):
+    """내용은 그대로 두고 만료 시간만 연장"""
+    cache.touch(cache_key, timeout)
+    cache.touch(messages_key(cache_key), timeout)
+
+
+async def aload_session(cache_key: str, include_messages: bool = True) -> Optional[dict]:
+    started = time.perf_counter()
+    try:
+        if not include_messages:
+            return decode_session(await cache.aget(cache_key), include_messages=False)
+        values = await cache.aget_many([cache_key, messages_key(cache_key)])
+        return decode_session(values.get(cache_key), values.get(messages_key(cache_key)))
+    finally:
+        _get_ms.observe((time.perf_counter() - started) * 1000)
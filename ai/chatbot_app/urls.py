@@ -1,9 +1,13 @@
 # chatbot_app/urls.py
 from django.urls import path
-from .views import GenerateAPIView, RecommendAPIView, FileUploadAPIView
+from .views import GenerateAPIView, GenerateStreamAPIView, GenerateAsyncView, RecommendAPIView, FileUploadAPIView, MetricsAPIView, StartupReportAPIView
 
 urlpatterns = [
     path('generate', GenerateAPIView.as_view(), name='generate-api'),
+    path('generate/stream', GenerateStreamAPIView.as_view(), name='generate-stream-api'),
+    path('generate/async', GenerateAsyncView.as_view(), name='generate-async-api'),
     path('recommend', RecommendAPIView.as_view(), name='recommend-api'),
     path('upload', FileUploadAPIView.as_view(), name='file-upload'),
+    path('metrics', MetricsAPIView.as_view(), name='metrics-api'),
+    path('startup', StartupReportAPIView.as_view(), name='startup-api'),
 ]
\ No newline at end of file
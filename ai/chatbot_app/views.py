@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import status
 import json
+import asyncio
 
 import hashlib
 import traceback
@@ -15,42 +16,88 @@ from docx import Document # Python-Docx
 import zipfile # ZIP 파일 처리
 import xml.etree.ElementTree as ET # XML 파일 처리
 from chatbot.graph.state import ChatState
-from django.core.cache import cache
+from django.http import StreamingHttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from chatbot.main import chat_graph
-from pymongo import MongoClient
+from chatbot.rag.streaming import LLMStream, streaming_mode
+from chatbot.graph.db.mongo_client import get_mongo_client, get_database
 import os
 from dotenv import load_dotenv
 
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
-from sentence_transformers import SentenceTransformer
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from shared.predict_intent_and_slots import predict_top_k_intents_and_slots
-from chatbot.rag.utils import get_mongo_collection
+from chatbot.rag.utils import get_mongo_collection, get_query_embedding, get_query_embeddings
+from chatbot.rag.semantic_cache import SemanticCache
+from chatbot.rag.cache_policy import resolve_cache_policy
+from chatbot.rag.llm_parse_cache import hit_rates as llm_parse_cache_hit_rates
+from shared.metrics import snapshot as metrics_snapshot
+from shared.model_registry import get_embedding_model, loaded_artifacts
+from shared.memory_report import read_process_memory
+from shared.http_client import endpoint_states
+from shared.lazy import LazyResource, startup_report, record_once, warmup
+from shared.batch_writer import BatchWriter
+from chatbot_app.session_codec import load_session, aload_session, save_session, touch_session
 
-from threading import Thread
 
 COLLECTION_NAME_DEFAULT = "Cached"
 VECTOR_INDEX_NAME = "cached_vector_index"
 EMBEDDING_FIELD_NAME = "embedding"
 TEXT_CONTENT_FIELD_NAME = "answer"
 
+# 답변 캐시 쓰기 큐 (Cached 컬렉션 insert_many 배치)
+CACHE_WRITER_MAX_QUEUE = int(os.getenv("CACHE_WRITER_MAX_QUEUE", "1000"))
+CACHE_WRITER_MAX_BATCH = int(os.getenv("CACHE_WRITER_MAX_BATCH", "64"))
+CACHE_WRITER_FLUSH_MS = float(os.getenv("CACHE_WRITER_FLUSH_MS", "500"))
+CACHE_WRITER_OVERFLOW = os.getenv("CACHE_WRITER_OVERFLOW", "drop_oldest")
 
-embedding_model = SentenceTransformer('dragonkue/snowflake-arctic-embed-l-v2.0-ko')
+
+# 임베딩 모델은 RAG와 같은 인스턴스를 공유 (모델 레지스트리, 첫 사용 시 로드)
+embedding_model = LazyResource("embedding_model", get_embedding_model)
 
 
 # .env 파일에서 환경변수 불러오기 (MONGO_URI)
 load_dotenv()
 mongo_uri = os.getenv("MONGO_URI")
 
-client = MongoClient(mongo_uri)
-db = client["AirBot"]
-airport_collection = db["RecommendQuestion"] 
+# MongoDB 연결/컬렉션은 첫 사용 시점에 초기화 (워커 기동이 Atlas 상태에 묶이지 않도록)
+# 클라이언트는 ai/ 패키지 공용 커넥션 풀을 사용
+client = LazyResource("mongo_client.views", get_mongo_client)
+db = LazyResource("mongo_db.views", lambda: get_database("AirBot"))
+airport_collection = LazyResource("collection.RecommendQuestion", lambda: db["RecommendQuestion"])
+
+
+def _init_cached_collection():
+    collection = db["Cached"] # 캐시된 질문 콜렉션
+    # 의도별 TTL: 문서마다 expires_at 시각에 삭제 (이전의 created_at 고정 300초 TTL 인덱스는 제거)
+    if "created_at_1" in collection.index_information():
+        collection.drop_index("created_at_1")
+    collection.create_index("expires_at", expireAfterSeconds=0)
+    return collection
+
+
+cached_collection = LazyResource("collection.Cached", _init_cached_collection)
+
+
+def _load_recent_cached(now):
+    """Redis를 쓸 수 없을 때 시맨틱 캐시 로컬 인덱스를 채울 만료되지 않은 항목 (Cached 컬렉션)"""
+    return cached_collection.find({"expires_at": {"$gt": now}}, {"_id": 0})
+
+
+def _load_data_versions():
+    """DB/doit.py 일일 갱신 작업이 기록한 도메인별 마지막 갱신 시각 (DataVersion 컬렉션)"""
+    return {doc["_id"]: doc["refreshed_at"] for doc in db["DataVersion"].find({}, {"refreshed_at": 1})}
+
 
-cached_collection = db["Cached"] # 캐시된 질문 콜렉션
-cached_collection.create_index("created_at", expireAfterSeconds=300)
+# 시맨틱 캐시 조회는 워커 메모리(exact 해시 → 로컬 벡터 인덱스)에서만 하고, Cached 컬렉션은 영속화에만 사용
+semantic_cache = SemanticCache(
+    get_query_embedding, bootstrap_loader=_load_recent_cached, version_loader=_load_data_versions
+)
 
 # ChatState의 초기 상태를 반환하는 함수
 def get_initial_state() -> ChatState:
@@ -59,18 +106,132 @@ def get_initial_state() -> ChatState:
 # 캐시 키를 위한 상수 정의
 CHATBOT_SESSION_CACHE_KEY = 'chatbot_session_{}'
 
-# 캐시된 질문을 비동기로 저장하는 함수
-# 이 함수는 별도의 스레드에서 실행되어 메인 쓰레드의 블로킹을 방지
-def save_embedding_async(question, answer, cached_collection, embedding_model):
-    def task():
-        embedding = embedding_model.encode(question).tolist()
-        cached_collection.insert_one({
-            "question": question,
+def _write_cached_batch(items):
+    """
+    쓰기 큐에서 모은 캐시 항목을 한 번에 저장합니다. (BatchWriter 워커 스레드)
+    조회 때 계산한 임베딩은 임베딩 캐시에서 재사용하고, 없는 질문만 한 번에 배치 인코딩합니다.
+    """
+    embeddings = get_query_embeddings([item["question"] for item in items])
+    docs = []
+    for item, embedding in zip(items, embeddings):
+        policy = item["policy"]
+        entry = semantic_cache.add(
+            item["question"], item["answer"], embedding, ttl_sec=policy["ttl_sec"],
+            intent=policy["intent"], slots=policy["slots"], domains=policy["domains"],
+        )
+        docs.append({
+            "question": item["question"],
             "embedding": embedding,
-            "answer": answer,
-            "created_at": datetime.now(ZoneInfo("Asia/Seoul"))
+            "answer": item["answer"],
+            "intent": entry["intent"],
+            "slots": entry["slots"],
+            "domains": entry["domains"],
+            "created_at": datetime.fromtimestamp(entry["created_at"], ZoneInfo("Asia/Seoul")),
+            "expires_at": datetime.fromtimestamp(entry["expires_at"], ZoneInfo("Asia/Seoul")),
         })
-    Thread(target=task).start()
+    cached_collection.insert_many(docs, ordered=False)
+
+
+# 답변 캐시 저장은 요청마다 스레드를 만들지 않고, 제한된 큐 + 백그라운드 워커 하나가 모아서 insert_many
+# 큐가 가득 차면 가장 오래된 항목을 버림 (CACHE_WRITER_OVERFLOW=block이면 잠시 대기 후 새 항목을 버림)
+cache_writer = BatchWriter(
+    _write_cached_batch,
+    name="cache_writer",
+    max_queue_size=CACHE_WRITER_MAX_QUEUE,
+    max_batch_size=CACHE_WRITER_MAX_BATCH,
+    flush_interval_ms=CACHE_WRITER_FLUSH_MS,
+    overflow=CACHE_WRITER_OVERFLOW,
+)
+
+
+# 캐시된 질문을 비동기로 저장하는 함수
+# 쓰기 큐에 넣기만 하므로 메인 쓰레드를 블로킹하지 않음
+def save_embedding_async(question, answer, policy):
+    cache_writer.submit({
+        "question": question,
+        "answer": answer,
+        "policy": policy,
+    })
+
+
+# 시맨틱 캐시에 저장하지 않을 답변에 포함된 문구
+EXCLUDED_CACHE_PHRASES = [
+    "죄송합니다"
+]
+
+
+def _apply_regenerate(current_state, parent_id):
+    """
+    수정/재생성 요청이면(parent_id가 직전 메시지 ID) 마지막 질문/답변 쌍을 제거하고 re=1을 반환합니다.
+    """
+    if not (parent_id and current_state.get("pre_message_id") == parent_id):
+        return 0
+    if (len(current_state["messages"]) >= 2 and
+        isinstance(current_state["messages"][-2], HumanMessage) and
+        isinstance(current_state["messages"][-1], AIMessage)):
+        current_state["messages"] = current_state["messages"][:-2]
+    return 1
+
+
+def _finalize_turn(cache_key, new_state, answer, message_id, user_message, cacheable=True):
+    """
+    그래프 실행 후 세션 상태를 캐시에 저장하고, 답변을 시맨틱 캐시(Cached)에 비동기로 저장합니다.
+    cacheable=False(LLM 호출 실패로 잘린 답변 등)면 세션만 저장합니다.
+    """
+    new_state["response"] = answer
+    new_state["messages"].append(AIMessage(content=answer))
+    new_state["pre_message_id"] = message_id # 현재 메시지 ID를 pre_message_id로 저장
+    new_state["messages"] = new_state["messages"][-10:]
+
+    save_session(cache_key, new_state)
+    print(f"[DEBUG] 캐시 저장 완료 - Key: {cache_key}")
+
+    if not cacheable:
+        print("[DEBUG] 답변 생성이 실패해 시맨틱 캐시에 저장하지 않음")
+        return
+
+    if any(phrase in answer for phrase in EXCLUDED_CACHE_PHRASES):
+        print("[DEBUG] 답변이 제외 목록에 포함되어 있어 캐시하지 않음")
+        return
+
+    # 답변을 만든 의도에 따라 캐시 유지 시간/무효화 도메인 결정
+    # (TTL 0인 의도, 일부 하위 답변이 빠진 답변, 이전 대화 맥락에 기댄 답변은 캐시하지 않음)
+    policy = resolve_cache_policy(new_state, user_message)
+    if policy is None:
+        print(f"[DEBUG] 캐시 정책상 시맨틱 캐시에 저장하지 않음 (의도: {new_state.get('intent')})")
+        return
+    save_embedding_async(user_message, answer, policy)
+
+
+def _sse(event, data):
+    """Server-Sent Events 한 건"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _lookup_semantic_cache(user_message):
+    """시맨틱 캐시에서 같거나 충분히 유사한 질문의 답변을 찾습니다. 없으면 None."""
+    hit = semantic_cache.lookup(user_message)
+    if hit is None:
+        return None
+    print(f"[DEBUG] 캐시 검색 결과: {hit['answer']} ({hit['tier']}, 유사도: {hit['score']:.4f})")
+    return hit["answer"]
+
+
+def _apply_cached_answer(cache_key, parent_id):
+    """
+    시맨틱 캐시 히트 시 세션 상태만 갱신하고 re 값을 반환합니다.
+    수정/재생성 판별에는 pre_message_id만 필요하므로 메타만 읽고, 재생성일 때만 메시지까지 읽어 마지막 질문/답변 쌍을 제거합니다.
+    """
+    meta = load_session(cache_key, include_messages=False)
+    if not (meta and parent_id and meta.get("pre_message_id") == parent_id):
+        touch_session(cache_key)
+        return 0
+
+    current_state = load_session(cache_key) or get_initial_state()
+    re = _apply_regenerate(current_state, parent_id)
+    current_state["messages"] = current_state["messages"][-10:]
+    save_session(cache_key, current_state)
+    return re
 
 
 # PDF, DOCX 파일에서 텍스트를 추출하는 함수
@@ -216,6 +377,14 @@ class GenerateAPIView(APIView):
     """
     
     def post(self, request, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._post(request, *args, **kwargs)
+        finally:
+            # 워커별 첫 요청 지연 시간 (지연 초기화 비용 포함)
+            record_once("first_request.generate", (time.perf_counter() - started) * 1000)
+
+    def _post(self, request, *args, **kwargs):
         
         re = 0
         
@@ -254,64 +423,27 @@ class GenerateAPIView(APIView):
             )
             
 
-        # 1. 캐시에서 기존 대화 상태를 가져옴
         cache_key = CHATBOT_SESSION_CACHE_KEY.format(session_id)
-        current_state = cache.get(cache_key)
-        
-        print(f"[DEBUG] 캐시 조회 - Key: {cache_key}")
-        print(f"[DEBUG] 캐시 내용: {current_state}")
-        
-        input_embeddings = embedding_model.encode(user_message).tolist()
-
-        retrieved_docs = perform_vector_search(
-            input_embeddings,
-            collection_name="Cached",
-            vector_index_name="cached_vector_index",
-            query_filter={},
-            top_k=1,
-            min_score=0.97  # 유사도가 0.9 이상인 경우만
-        )
-
-        if retrieved_docs:
-            cached_answer = retrieved_docs[0]["text"]
-            similarity_score = retrieved_docs[0]["score"]
-            print(f"[DEBUG] 캐시 검색 결과: {cached_answer} (유사도: {similarity_score})")
-
-            if parent_id and current_state.get("pre_message_id") == parent_id:
-                re = 1
-
-            # 만약 이전 메시지가 HumanMessage이고 마지막 메시지가 AIMessage인 경우,
-            # 마지막 두 메시지를 제거하고 새로운 HumanMessage를 추가합니다.
-            # 그렇지 않으면, 단순히 새로운 HumanMessage를 추가합니다.
-            if re == 1:
-                if (len(current_state["messages"]) >= 2 and
-                    isinstance(current_state["messages"][-2], HumanMessage) and
-                    isinstance(current_state["messages"][-1], AIMessage)):
-                    current_state["messages"] = current_state["messages"][:-2]
+        cached_answer = _lookup_semantic_cache(user_message)
 
+        if cached_answer is not None:
+            # 수정/재생성 처리 후 상태를 캐시에 다시 저장 (세션 메타만 조회)
+            re = _apply_cached_answer(cache_key, parent_id)
             response_data = {
                 "answer": cached_answer,
                 "re": re,
             }
-            if not current_state: 
-                # 2. 상태가 없으면, 새로운 ChatState 객체를 생성
-                print(f"디버그: 세션 ID '{session_id}'에 대한 새로운 대화 상태를 생성합니다.")
-                # **(수정)** ChatState의 구조에 맞게 초기화
-                current_state = get_initial_state()
-            
-            current_state["user_input"] = user_message
-            current_state["answer"] = cached_answer
-            
-            current_state["messages"] = current_state["messages"][-10:]
-
-            # 6. 업데이트된 상태를 캐시에 다시 저장
-            cache.set(cache_key, current_state, timeout=1800)
             
             print(f"[DEBUG] 캐시 저장 완료 - Key: {cache_key}")
-            print(f"[DEBUG] 저장된 캐시 내용: {current_state}")
             
             return Response(response_data, status=status.HTTP_200_OK)
         
+        # 1. 캐시에서 기존 대화 상태를 가져옴
+        current_state = load_session(cache_key)
+        
+        print(f"[DEBUG] 캐시 조회 - Key: {cache_key}")
+        print(f"[DEBUG] 캐시 내용: {current_state}")
+
 
         if not current_state: 
             # 2. 상태가 없으면, 새로운 ChatState 객체를 생성
@@ -348,19 +480,11 @@ class GenerateAPIView(APIView):
 
 
             # 5. 새로운 상태에서 응답과 메타데이터를 추출
-            # 최종 답변은 LangGraph 핸들러에서 messages 리스트에 추가한 마지막 메시지
-            final_message = new_state["response"]
-            new_state["messages"].append(AIMessage(content=final_message))
-            new_state["pre_message_id"] = message_id # 현재 메시지 ID를 pre_message_id로 저장
-            
-            answer = final_message
-            
-            new_state["messages"] = new_state["messages"][-10:]
+            # 최종 답변은 LangGraph 핸들러에서 state["response"]에 담은 값
+            answer = new_state["response"]
 
-            # 6. 업데이트된 상태를 캐시에 다시 저장
-            cache.set(cache_key, new_state, timeout=1800)
-            
-            print(f"[DEBUG] 캐시 저장 완료 - Key: {cache_key}")
+            # 6. 업데이트된 상태를 캐시에 다시 저장하고, 7. 캐시된 질문과 답변을 비동기로 저장
+            _finalize_turn(cache_key, new_state, answer, message_id, user_message)
             print(f"[DEBUG] 저장된 캐시 내용: {new_state}")
             
             response_data = {
@@ -369,21 +493,6 @@ class GenerateAPIView(APIView):
                 #"metadata": metadata
             }
 
-  
-                    
-            excluded_phrases = [
-                "죄송합니다"
-            ]
-
-            # 저장하기 전에 필터링
-            if not any(phrase in answer for phrase in excluded_phrases):
-                # 7. 캐시된 질문과 답변을 비동기로 저장
-                save_embedding_async(user_message, answer, cached_collection, embedding_model)
-            else:
-                print("[DEBUG] 답변이 제외 목록에 포함되어 있어 캐시하지 않음")
-
-
-            
             return Response(response_data, status=status.HTTP_200_OK)
         
         except Exception as e:
@@ -394,6 +503,165 @@ class GenerateAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
             
+class GenerateStreamAPIView(APIView):
+    """
+    POST /api/generate/stream
+    /api/generate와 같은 요청을 받아 최종 답변을 Server-Sent Events로 스트리밍합니다.
+
+    이벤트:
+        delta : {"content": "<HTML 조각>"} (여러 번)
+        done  : {"re": 0|1, "cached": bool}
+        error : {"error": "..."} (답변 생성이 도중에 실패하면 이미 보낸 delta 뒤에 done 대신 전송)
+    스트림이 끝난 뒤 세션 상태와 Cached 컬렉션 저장은 /api/generate와 동일하게 수행합니다.
+    """
+
+    def post(self, request, *args, **kwargs):
+        session_id = request.data.get("session_id")
+        message_id = request.data.get("message_id", '')
+        parent_id = request.data.get("parent_id")
+        user_message = request.data.get("content")
+
+        if not all([session_id, message_id, user_message]):
+            return Response(
+                {
+                    "error": f"Missing required fields. "
+                            f"user_message: {user_message}, "
+                            f"session_id: {session_id}, "
+                            f"message_id: {message_id}"
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        response = StreamingHttpResponse(
+            self._stream(session_id, message_id, parent_id, user_message),
+            content_type="text/event-stream; charset=utf-8",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no" # nginx 버퍼링 비활성화
+        return response
+
+    def _stream(self, session_id, message_id, parent_id, user_message):
+        started = time.perf_counter()
+        cache_key = CHATBOT_SESSION_CACHE_KEY.format(session_id)
+
+        try:
+            # 1. 시맨틱 캐시 조회 (히트 시 저장된 답변을 한 번에 전송)
+            cached_answer = _lookup_semantic_cache(user_message)
+            if cached_answer is not None:
+                re = _apply_cached_answer(cache_key, parent_id)
+
+                yield _sse("delta", {"content": cached_answer})
+                yield _sse("done", {"re": re, "cached": True})
+                return
+
+            # 2. 그래프 실행 (최종 답변 LLM 호출은 LLMStream으로 반환됨)
+            current_state = load_session(cache_key) or get_initial_state()
+            re = _apply_regenerate(current_state, parent_id)
+            current_state["messages"].append(HumanMessage(content=user_message))
+            current_state["user_input"] = user_message
+            current_state["rephrased_query"] = user_message
+
+            with streaming_mode():
+                new_state = chat_graph.invoke(current_state)
+
+            final_response = new_state["response"]
+            failed = False
+            if isinstance(final_response, LLMStream):
+                for chunk in final_response:
+                    yield _sse("delta", {"content": chunk})
+                answer = final_response.text
+                failed = final_response.failed
+            else:
+                answer = final_response or ""
+                yield _sse("delta", {"content": answer})
+
+            # 3. 스트림 종료 후 세션 상태/시맨틱 캐시 저장 (LLM 호출이 중간에 실패한 답변은 캐시하지 않음)
+            _finalize_turn(cache_key, new_state, answer, message_id, user_message, cacheable=not failed)
+            if failed:
+                yield _sse("error", {"error": final_response.error_message})
+                return
+            yield _sse("done", {"re": re, "cached": False})
+
+        except Exception as e:
+            print(f"챗봇 스트리밍 처리 중 오류 발생: {e}")
+            yield _sse("error", {"error": f"챗봇 처리 중 오류가 발생했습니다: {e}"})
+        finally:
+            record_once("first_request.generate_stream", (time.perf_counter() - started) * 1000)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class GenerateAsyncView(View):
+    """
+    POST /api/generate/async
+    /api/generate와 같은 요청/응답 형식을 비동기로 처리합니다.
+
+    chat_graph.ainvoke와 AsyncOpenAI를 사용하므로 ASGI(uvicorn 워커, chatbot_core.asgi)로 실행하면
+    워커 하나가 LLM 응답을 기다리는 동안에도 다른 대화를 계속 처리합니다.
+    (임베딩/Mongo 등 동기 구간은 스레드에서 실행)
+    """
+
+    async def post(self, request, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await self._post(request)
+        finally:
+            record_once("first_request.generate_async", (time.perf_counter() - started) * 1000)
+
+    async def _post(self, request):
+        try:
+            data = json.loads(request.body or b"{}")
+        except json.JSONDecodeError:
+            return JsonResponse({"error": "Invalid JSON body."}, status=400)
+
+        session_id = data.get("session_id")
+        message_id = data.get("message_id", '')
+        parent_id = data.get("parent_id")
+        user_message = data.get("content")
+
+        if not all([session_id, message_id, user_message]):
+            return JsonResponse(
+                {
+                    "error": f"Missing required fields. "
+                            f"user_message: {user_message}, "
+                            f"session_id: {session_id}, "
+                            f"message_id: {message_id}"
+                },
+                status=400,
+                json_dumps_params={"ensure_ascii": False},
+            )
+
+        cache_key = CHATBOT_SESSION_CACHE_KEY.format(session_id)
+
+        try:
+            # 1. 시맨틱 캐시 조회
+            cached_answer = await asyncio.to_thread(_lookup_semantic_cache, user_message)
+            if cached_answer is not None:
+                re = await asyncio.to_thread(_apply_cached_answer, cache_key, parent_id)
+                return JsonResponse({"answer": cached_answer, "re": re}, json_dumps_params={"ensure_ascii": False})
+
+            # 2. 그래프 비동기 실행
+            current_state = await aload_session(cache_key) or get_initial_state()
+            re = _apply_regenerate(current_state, parent_id)
+            current_state["messages"].append(HumanMessage(content=user_message))
+            current_state["user_input"] = user_message
+            current_state["rephrased_query"] = user_message
+
+            new_state = await chat_graph.ainvoke(current_state)
+            answer = new_state["response"]
+
+            # 3. 세션 상태/시맨틱 캐시 저장
+            await asyncio.to_thread(_finalize_turn, cache_key, new_state, answer, message_id, user_message)
+            return JsonResponse({"answer": answer, "re": re}, json_dumps_params={"ensure_ascii": False})
+
+        except Exception as e:
+            print(f"챗봇 비동기 처리 중 오류 발생: {e}")
+            return JsonResponse(
+                {"error": f"챗봇 처리 중 오류가 발생했습니다: {e}"},
+                status=500,
+                json_dumps_params={"ensure_ascii": False},
+            )
+
+
 class RecommendAPIView(APIView):
     """
     POST /api/recommend
@@ -480,3 +748,35 @@ class FileUploadAPIView(APIView):
                 os.remove(file_path)
 
         return Response({"message": "File processed"}, status=status.HTTP_200_OK)
+
+
+class MetricsAPIView(APIView):
+    """
+    GET /api/metrics
+    현재 워커 프로세스의 내부 메트릭(배치 크기, 대기 시간 등)을 반환하는 API 뷰
+    """
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                "pid": os.getpid(),
+                "memory_mb": read_process_memory(),
+                "loaded_models": loaded_artifacts(),
+                "metrics": metrics_snapshot(),
+                "http_circuits": endpoint_states(),
+                "semantic_cache": semantic_cache.stats(),
+                "llm_parse_cache": llm_parse_cache_hit_rates(),
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class StartupReportAPIView(APIView):
+    """
+    GET /api/startup  : 현재 워커의 컴포넌트별 초기화 시간/상태 리포트
+    POST /api/startup : warm-up 실행 (아직 초기화되지 않은 컴포넌트를 미리 로드) 후 리포트 반환
+    """
+    def get(self, request, *args, **kwargs):
+        return Response(startup_report(), status=status.HTTP_200_OK)
+
+    def post(self, request, *args, **kwargs):
+        return Response(warmup(), status=status.HTTP_200_OK)
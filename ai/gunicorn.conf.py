@@ -0,0 +1,57 @@
+# gunicorn 설정 파일
+# 실행: gunicorn -c gunicorn.conf.py chatbot_core.wsgi:application
+# ASGI 실행 (/api/generate/async가 워커 하나에서 여러 대화를 동시에 처리):
+#   GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker GUNICORN_WORKERS=2 \
+#   gunicorn -c gunicorn.conf.py chatbot_core.asgi:application
+import os
+import time
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "8"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+# sync(WSGI, 기본) 또는 uvicorn.workers.UvicornWorker(ASGI)
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+# 1보다 크면 sync 워커가 gthread로 동작 (의도 분류 마이크로 배칭 auto 모드가 이 값을 봄, shared/config.py)
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+
+# 마스터에서 Django 앱과 모델을 먼저 로드한 뒤 fork → 워커들이 모델 가중치 페이지를 공유 (Copy-on-Write)
+preload_app = os.getenv("MODEL_PRELOAD", "true").lower() == "true"
+
+# 워커 기동 직후 지연 초기화 컴포넌트(그래프, DB/OpenAI 클라이언트, 모델)를 미리 초기화
+warmup_on_boot = os.getenv("WARMUP_ON_BOOT", "true").lower() == "true"
+
+
+def when_ready(server):
+    # 워커 fork 직전(마스터)에 모델 로드
+    if preload_app:
+        from shared.model_registry import preload
+        from shared.memory_report import read_process_memory, format_memory
+
+        preload()
+        server.log.info(format_memory(f"master({os.getpid()}) 모델 preload 후", read_process_memory()))
+
+
+def post_fork(server, worker):
+    worker.boot_started_at = time.perf_counter()
+
+
+def post_worker_init(worker):
+    from shared.lazy import record, warmup
+    from shared.memory_report import read_process_memory, format_memory
+
+    record("worker_boot", (time.perf_counter() - worker.boot_started_at) * 1000)
+
+    if warmup_on_boot:
+        report = warmup(modules=("chatbot_app.views",))
+        failed = [name for name, info in report["components"].items() if not info["ok"]]
+        worker.log.info(f"worker({worker.pid}) warmup {report['components']['warmup']['load_ms']}ms"
+                        + (f", 실패: {failed}" if failed else ""))
+
+    worker.log.info(format_memory(f"worker({worker.pid}) 초기화 후", read_process_memory()))
+
+
+def worker_exit(server, worker):
+    # 종료되는 워커의 쓰기 큐(답변 캐시 등)에 남은 항목을 저장
+    from shared.batch_writer import flush_all
+
+    flush_all(timeout=float(os.getenv("BATCH_WRITER_EXIT_TIMEOUT", "5")))
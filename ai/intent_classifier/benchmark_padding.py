@@ -0,0 +1,96 @@
+"""
+패딩 모드별 의도/슬롯 예측 CPU 지연 시간 벤치마크
+
+ai/ 디렉토리에서 실행:
+    python -m intent_classifier.benchmark_padding --limit 1000 --batch-sizes 1 8 16
+"""
+import argparse
+import os
+import statistics
+import time
+
+import pandas as pd
+import torch
+
+from shared.config import ROOT_DIR
+from shared.normalize_with_morph import normalize_with_morph
+from shared.predict_intent_and_slots import _forward_batch_with_bce, _tokenize
+
+DATA_PATH = os.path.join(ROOT_DIR, "intent_classifier", "data", "intent_slot_dataset_cleaned.csv")
+PADDING_MODES = ["max_length", "longest"]
+
+
+def load_questions(limit=None):
+    df = pd.read_csv(DATA_PATH)
+    questions = df["question"].dropna().astype(str).tolist()
+    if limit:
+        questions = questions[:limit]
+    # 정규화는 패딩과 무관하므로 측정 전에 미리 수행
+    return [normalize_with_morph(q) for q in questions]
+
+
+def run_benchmark(questions, padding_mode, batch_size, max_length=64):
+    latencies = []
+    outputs = []
+    for i in range(0, len(questions), batch_size):
+        items = [(q, max_length) for q in questions[i:i + batch_size]]
+        start = time.perf_counter()
+        outputs.extend(_forward_batch_with_bce(items, padding_mode=padding_mode))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, outputs
+
+
+def summarize(latencies, num_items):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": p95,
+        "per_item_ms": sum(latencies) / num_items,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="패딩 모드별 CPU 지연 시간 비교")
+    parser.add_argument("--limit", type=int, default=1000, help="사용할 질문 수 (0이면 전체)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 16])
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    questions = load_questions(args.limit or None)
+    lengths = [len(f["input_ids"]) for f in _tokenize(questions)]
+    print(f"📄 질문 수: {len(questions)}개")
+    print(f"📏 토큰 길이 - 평균 {statistics.mean(lengths):.1f}, 최대 {max(lengths)}, "
+          f"20 이하 비율 {sum(l <= 20 for l in lengths) / len(lengths):.1%}")
+
+    # 워밍업
+    _forward_batch_with_bce([(q, 64) for q in questions[:8]], padding_mode="longest")
+
+    for batch_size in args.batch_sizes:
+        print(f"\n🧪 batch_size={batch_size}")
+        results = {}
+        for mode in PADDING_MODES:
+            latencies, outputs = run_benchmark(questions, mode, batch_size)
+            results[mode] = outputs
+            stats = summarize(latencies, len(questions))
+            print(f"   - {mode:<10} 평균 {stats['mean_ms']:.2f}ms | p50 {stats['p50_ms']:.2f}ms | "
+                  f"p95 {stats['p95_ms']:.2f}ms | 문장당 {stats['per_item_ms']:.2f}ms")
+
+        # 두 모드의 예측 결과 비교 (top-1 인텐트 / 슬롯 시퀀스)
+        same_intent = sum(
+            int(torch.argmax(a[0]) == torch.argmax(b[0]))
+            for a, b in zip(results["max_length"], results["longest"])
+        )
+        same_slots = sum(
+            int(a[1] == b[1] and a[2] == b[2])
+            for a, b in zip(results["max_length"], results["longest"])
+        )
+        print(f"   🔁 top-1 인텐트 일치: {same_intent}/{len(questions)}, 슬롯 일치: {same_slots}/{len(questions)}")
+
+
+if __name__ == "__main__":
+    main()
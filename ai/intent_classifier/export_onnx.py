@@ -0,0 +1,168 @@
+"""
+KoBERTIntentSlotModel → ONNX 변환 및 정확도 비교 스크립트
+
+ai/ 디렉토리에서 실행:
+    # fp32 ONNX 변환 + 동적 INT8 양자화 + PyTorch 대비 정확도 비교
+    python -m intent_classifier.export_onnx --quantize --check
+
+    # 이미 변환된 모델로 비교만 수행
+    python -m intent_classifier.export_onnx --skip-export --check
+
+변환 후 INTENT_MODEL_BACKEND=onnx 또는 onnx_int8 환경변수로 서빙 백엔드를 바꿀 수 있습니다.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+import torch
+
+from shared.config import (
+    ROOT_DIR, ONNX_MODEL_DIR, ONNX_MODEL_PATH, ONNX_INT8_MODEL_PATH, INTENT_CLASSIFICATION,
+)
+from shared.load_model import load_torch_model, load_onnx_model, idx2intent, idx2slot
+from shared.normalize_with_morph import normalize_with_morph
+from shared.predict_intent_and_slots import (
+    _tokenize, _pad_features, _trim_to_attention, merge_tokens_and_slots,
+)
+from shared.utils import tokenizer
+
+DATA_PATH = os.path.join(ROOT_DIR, "intent_classifier", "data", "intent_slot_dataset_cleaned.csv")
+
+
+# 📦 ONNX 변환
+def export_onnx(output_path=ONNX_MODEL_PATH, opset=17):
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    model = load_torch_model().cpu()
+    encoding = tokenizer(["인천공항 제1터미널 주차 요금 알려줘"], return_tensors="pt")
+    dummy_inputs = (encoding["input_ids"], encoding["attention_mask"])
+
+    torch.onnx.export(
+        model,
+        dummy_inputs,
+        output_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["intent_logits", "slot_logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "intent_logits": {0: "batch"},
+            "slot_logits": {0: "batch", 1: "sequence"},
+        },
+        opset_version=opset,
+        do_constant_folding=True,
+        dynamo=False,
+    )
+    print(f"✅ ONNX 변환 완료: {output_path} ({os.path.getsize(output_path) / 1024 / 1024:.1f}MB)")
+    return output_path
+
+
+# 🗜️ 동적 INT8 양자화
+def quantize_onnx(input_path=ONNX_MODEL_PATH, output_path=ONNX_INT8_MODEL_PATH):
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    quantize_dynamic(input_path, output_path, weight_type=QuantType.QInt8)
+    print(f"✅ INT8 양자화 완료: {output_path} ({os.path.getsize(output_path) / 1024 / 1024:.1f}MB)")
+    return output_path
+
+
+def _load_dataset(limit=None):
+    df = pd.read_csv(DATA_PATH)
+    if limit:
+        df = df.head(limit)
+    questions = [normalize_with_morph(q) for q in df["question"].astype(str)]
+    labels = [set(json.loads(intents)) for intents in df["intent_list"]]
+    return questions, labels
+
+
+def _predict(model, questions, threshold, batch_size=32):
+    """모델별 (top-1 인텐트, 임계값 이상 인텐트 집합, 슬롯 리스트, 확률 벡터)를 반환"""
+    predictions = []
+    elapsed = 0.0
+    for i in range(0, len(questions), batch_size):
+        features = _tokenize(questions[i:i + batch_size])
+        input_ids, attention_mask = _pad_features(features, padding_mode="longest")
+
+        start = time.perf_counter()
+        with torch.no_grad():
+            intent_logits, slot_logits = model(input_ids, attention_mask)
+        elapsed += time.perf_counter() - start
+
+        intent_probs = torch.sigmoid(intent_logits).cpu()
+        slot_pred_ids = torch.argmax(slot_logits, dim=2).cpu().tolist()
+
+        for row in range(len(features)):
+            probs = intent_probs[row]
+            top1 = idx2intent[torch.argmax(probs).item()]
+            high = {idx2intent[j] for j, p in enumerate(probs.tolist()) if p >= threshold} or {top1}
+            tokens, slot_ids = _trim_to_attention(input_ids[row], attention_mask[row], slot_pred_ids[row])
+            slots = merge_tokens_and_slots(tokens, slot_ids, idx2slot)
+            predictions.append((top1, high, slots, probs))
+
+    return predictions, elapsed
+
+
+# 🔍 PyTorch 대비 정확도 비교
+def check_parity(backends, limit=None, threshold=INTENT_CLASSIFICATION["DEFAULT_THRESHOLD"], min_agreement=0.99):
+    questions, labels = _load_dataset(limit)
+    print(f"\n📄 비교 데이터: {len(questions)}개 문장 (임계값 {threshold})")
+
+    reference, ref_elapsed = _predict(load_torch_model(), questions, threshold)
+    ref_accuracy = sum(top1 in label for (top1, _, _, _), label in zip(reference, labels)) / len(labels)
+    print(f"   - torch      정확도(top-1) {ref_accuracy:.4f} | 추론 {ref_elapsed:.2f}s")
+
+    passed = True
+    for backend in backends:
+        candidate, elapsed = _predict(load_onnx_model(quantized=(backend == "onnx_int8")), questions, threshold)
+
+        accuracy = sum(top1 in label for (top1, _, _, _), label in zip(candidate, labels)) / len(labels)
+        same_top1 = sum(r[0] == c[0] for r, c in zip(reference, candidate)) / len(questions)
+        same_high = sum(r[1] == c[1] for r, c in zip(reference, candidate)) / len(questions)
+        same_slots = sum(r[2] == c[2] for r, c in zip(reference, candidate)) / len(questions)
+        max_diff = max((r[3] - c[3]).abs().max().item() for r, c in zip(reference, candidate))
+
+        print(f"   - {backend:<10} 정확도(top-1) {accuracy:.4f} | 추론 {elapsed:.2f}s "
+              f"(torch 대비 x{ref_elapsed / elapsed if elapsed else 0:.2f})")
+        print(f"     top-1 일치 {same_top1:.4f} | 임계값 인텐트 일치 {same_high:.4f} | "
+              f"슬롯 일치 {same_slots:.4f} | 확률 최대 차이 {max_diff:.4f}")
+
+        if min(same_top1, same_high, same_slots) < min_agreement:
+            print(f"     ❌ 일치율이 기준({min_agreement})보다 낮습니다.")
+            passed = False
+        else:
+            print("     ✅ 기준 통과")
+
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KoBERT 의도/슬롯 모델 ONNX 변환")
+    parser.add_argument("--output", default=ONNX_MODEL_PATH, help="fp32 ONNX 저장 경로")
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--quantize", action="store_true", help="동적 INT8 양자화 모델도 생성")
+    parser.add_argument("--skip-export", action="store_true", help="변환 없이 기존 ONNX 파일 사용")
+    parser.add_argument("--check", action="store_true", help="라벨 데이터셋으로 PyTorch 대비 정확도 비교")
+    parser.add_argument("--limit", type=int, default=0, help="비교에 사용할 문장 수 (0이면 전체)")
+    parser.add_argument("--min-agreement", type=float, default=0.99, help="통과 기준 일치율")
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        export_onnx(args.output, args.opset)
+        if args.quantize:
+            quantize_onnx(args.output, ONNX_INT8_MODEL_PATH)
+
+    if args.check:
+        backends = ["onnx"]
+        if os.path.exists(ONNX_INT8_MODEL_PATH):
+            backends.append("onnx_int8")
+        if not check_parity(backends, limit=args.limit or None, min_agreement=args.min_agreement):
+            sys.exit(1)
+
+    print(f"\n📁 ONNX 디렉토리: {ONNX_MODEL_DIR}")
+
+
+if __name__ == "__main__":
+    main()
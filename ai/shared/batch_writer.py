@@ -0,0 +1,170 @@
+"""
+제한된 큐를 쓰는 백그라운드 배치 쓰기 (write-behind)
+
+요청 스레드는 submit()으로 아이템을 큐에 넣기만 하고, 워커 스레드가 flush_interval_ms 동안
+또는 max_batch_size개가 찰 때까지 모은 뒤 write_fn(items)을 한 번 호출합니다. (예: Mongo insert_many)
+
+- 큐는 max_queue_size로 제한되며, 가득 차면 overflow 정책을 따릅니다.
+  - "drop_oldest": 가장 오래된 아이템을 버리고 새 아이템을 넣음 (요청 스레드는 막히지 않음)
+  - "block": block_timeout_sec 동안 자리가 나기를 기다리고(backpressure), 그래도 가득 차면 새 아이템을 버림
+- write_fn이 예외를 내면 해당 배치는 버리고 오류만 기록합니다.
+- close()/flush_all()은 남은 아이템을 모두 쓰고 워커를 종료합니다. 프로세스 종료 시(atexit,
+  gunicorn worker_exit 훅) 자동으로 호출됩니다.
+- 메트릭: <이름>.batch_size / flush_ms / written / dropped / errors
+"""
+import atexit
+import queue
+import threading
+import time
+
+from shared.metrics import get_counter, get_histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+_writers = []
+_writers_lock = threading.Lock()
+
+
+class BatchWriter:
+    def __init__(self, write_fn, name="batch_writer", max_queue_size=1000, max_batch_size=64,
+                 flush_interval_ms=500.0, overflow="drop_oldest", block_timeout_sec=0.05):
+        """
+        Args:
+            write_fn: 아이템 리스트를 받아 한 번에 쓰는 함수 (반환값 없음)
+            name: 메트릭 이름 접두사
+            max_queue_size: 큐에 쌓아 둘 최대 아이템 수
+            max_batch_size: 한 번에 쓸 최대 아이템 수
+            flush_interval_ms: 첫 아이템 도착 후 추가 아이템을 기다리는 최대 시간 (ms)
+            overflow: 큐가 가득 찼을 때 정책 ("drop_oldest" | "block")
+        """
+        if overflow not in ("drop_oldest", "block"):
+            raise ValueError(f"지원하지 않는 overflow 정책: {overflow}")
+        self.write_fn = write_fn
+        self.name = name
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.flush_interval = max(0.0, float(flush_interval_ms)) / 1000.0
+        self.overflow = overflow
+        self.block_timeout_sec = block_timeout_sec
+
+        self._queue = queue.Queue(maxsize=max(1, int(max_queue_size)))
+        self._worker = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._batch_size_hist = get_histogram(f"{name}.batch_size", BATCH_SIZE_BUCKETS)
+        self._flush_hist = get_histogram(f"{name}.flush_ms")
+        self._written = get_counter(f"{name}.written")
+        self._dropped = get_counter(f"{name}.dropped")
+        self._errors = get_counter(f"{name}.errors")
+
+        with _writers_lock:
+            _writers.append(self)
+
+    def _ensure_worker(self):
+        # fork 이후 자식 프로세스에는 스레드가 복제되지 않으므로 살아있는지 매번 확인
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=f"{self.name}-worker", daemon=True)
+                self._worker.start()
+
+    def submit(self, item) -> bool:
+        """아이템을 큐에 넣습니다. 버려졌으면(큐 포화/종료 후) False"""
+        if self._closed:
+            self._dropped.inc()
+            return False
+        self._ensure_worker()
+
+        if self.overflow == "block":
+            try:
+                self._queue.put(item, timeout=self.block_timeout_sec)
+                return True
+            except queue.Full:
+                self._dropped.inc()
+                print(f"디버그: {self.name} 큐가 가득 차 아이템을 버립니다.")
+                return False
+
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return True
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self._dropped.inc()
+                except queue.Empty:
+                    pass
+
+    def _collect_batch(self):
+        # 첫 아이템은 올 때까지 대기 (None은 종료 신호)
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.flush_interval
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # 종료 신호는 다시 넣어 두고, 모은 배치부터 씀
+                self._queue.task_done()
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _write(self, batch):
+        started = time.perf_counter()
+        try:
+            self.write_fn(batch)
+            self._written.inc(len(batch))
+        except Exception as e:
+            self._errors.inc()
+            print(f"디버그: {self.name} 배치 쓰기 중 오류 발생 ({len(batch)}건 버림) - {e}")
+        finally:
+            self._batch_size_hist.observe(len(batch))
+            self._flush_hist.observe((time.perf_counter() - started) * 1000)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            if batch is None:
+                self._queue.task_done()
+                return
+            self._write(batch)
+
+    def close(self, timeout: float = 5.0):
+        """남은 아이템을 모두 쓰고 워커를 종료합니다. 이후 submit()은 버려집니다."""
+        worker = self._worker
+        self._closed = True
+        if worker is None or not worker.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            print(f"디버그: {self.name} 종료 신호를 넣지 못했습니다. (큐 포화)")
+            return
+        worker.join(timeout)
+        if worker.is_alive():
+            print(f"디버그: {self.name} 종료 대기 시간 초과 - 남은 아이템 {self._queue.qsize()}건")
+
+
+def flush_all(timeout: float = 5.0):
+    """등록된 모든 BatchWriter를 닫습니다. (워커 종료 시)"""
+    with _writers_lock:
+        writers = list(_writers)
+    for writer in writers:
+        writer.close(timeout)
+
+
+atexit.register(flush_all)
@@ -0,0 +1,103 @@
+"""
+동시 요청을 짧은 시간 동안 모아 한 번에 처리하는 마이크로 배칭 스케줄러
+
+여러 스레드(gunicorn 워커의 요청 스레드 등)에서 동시에 submit()을 호출하면,
+백그라운드 워커 스레드가 최대 max_wait_ms 동안 또는 max_batch_size개가 찰 때까지 요청을 모은 뒤
+process_fn(items)을 한 번 호출하고 결과를 각 호출자의 Future로 돌려줍니다.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from shared.metrics import get_histogram
+
+# 배치 크기 분포용 버킷
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+class MicroBatcher:
+    def __init__(self, process_fn, max_batch_size=16, max_wait_ms=5.0, name="batcher"):
+        """
+        Args:
+            process_fn: 아이템 리스트를 받아 같은 길이의 결과 리스트를 반환하는 함수
+            max_batch_size: 한 번에 처리할 최대 아이템 수
+            max_wait_ms: 첫 아이템 도착 후 추가 아이템을 기다리는 최대 시간 (ms)
+            name: 메트릭 이름 접두사
+        """
+        self.process_fn = process_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+        self._batch_size_hist = get_histogram(f"{name}.batch_size", BATCH_SIZE_BUCKETS)
+        self._queue_wait_hist = get_histogram(f"{name}.queue_wait_ms")
+        self._run_hist = get_histogram(f"{name}.run_ms")
+
+    def _ensure_worker(self):
+        # fork 이후 자식 프로세스에는 스레드가 복제되지 않으므로 살아있는지 매번 확인
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name=f"{self.name}-worker", daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, item):
+        """아이템을 큐에 넣고 결과를 받을 Future를 반환합니다."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def __call__(self, item, timeout=None):
+        """아이템을 제출하고 결과가 나올 때까지 기다립니다."""
+        return self.submit(item).result(timeout=timeout)
+
+    def _collect_batch(self):
+        # 첫 아이템은 올 때까지 대기
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            started = time.perf_counter()
+
+            for _, _, enqueued_at in batch:
+                self._queue_wait_hist.observe((started - enqueued_at) * 1000)
+            self._batch_size_hist.observe(len(batch))
+
+            items = [item for item, _, _ in batch]
+            try:
+                results = self.process_fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"배치 처리 결과 수({len(results)})가 입력 수({len(items)})와 다릅니다."
+                    )
+            except Exception as e:
+                print(f"디버그: {self.name} 배치 처리 중 오류 발생 - {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            finally:
+                self._run_hist.observe((time.perf_counter() - started) * 1000)
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
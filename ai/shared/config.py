@@ -13,6 +13,11 @@ MODEL_PATH = os.path.join(INTENT_SLOT_MODEL_DIR, "best_model.pt")
 INTENT2IDX_PATH = os.path.join(INTENT_SLOT_MODEL_DIR, "intent2idx.pkl")
 SLOT2IDX_PATH = os.path.join(INTENT_SLOT_MODEL_DIR, "slot2idx.pkl")
 
+# ONNX 변환 모델 경로 (intent_classifier/export_onnx.py로 생성)
+ONNX_MODEL_DIR = os.path.join(INTENT_SLOT_MODEL_DIR, "onnx")
+ONNX_MODEL_PATH = os.path.join(ONNX_MODEL_DIR, "model.onnx")
+ONNX_INT8_MODEL_PATH = os.path.join(ONNX_MODEL_DIR, "model.int8.onnx")
+
 # 저장 디렉토리 경로만 필요할 경우
 SAVE_PATH = INTENT_SLOT_MODEL_DIR
 
@@ -20,4 +25,59 @@ SAVE_PATH = INTENT_SLOT_MODEL_DIR
 INTENT_CLASSIFICATION = {
     # BCE 기반 예측에서 사용할 기본 임계값
     "DEFAULT_THRESHOLD": 0.7,
-}
\ No newline at end of file
+}
+
+
+def _has_concurrent_requests() -> bool:
+    """
+    워커 프로세스 하나가 요청을 동시에 처리하는지 (gunicorn.conf.py와 같은 환경 변수 기준)
+    기본 배포(sync 워커, 스레드 1개)는 프로세스당 요청이 항상 하나라 배치 크기가 1이므로,
+    배칭은 스레드 전환 + MAX_WAIT_MS 대기만 더하게 됩니다.
+    gthread(GUNICORN_THREADS > 1)나 ASGI(uvicorn 워커, /api/generate/async)일 때만 동시 호출자가 생깁니다.
+    """
+    worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync").lower()
+    threads = int(os.getenv("GUNICORN_THREADS", "1"))
+    return worker_class != "sync" or threads > 1
+
+
+# 의도 분류 마이크로 배칭 설정
+# 동시에 들어온 predict_with_bce 요청을 짧은 시간 동안 모아 한 번의 forward pass로 처리
+# INTENT_BATCHING_ENABLED: auto(기본, 동시 처리 워커일 때만) | true | false
+_INTENT_BATCHING_MODE = os.getenv("INTENT_BATCHING_ENABLED", "auto").lower()
+INTENT_BATCHING = {
+    "ENABLED": _has_concurrent_requests() if _INTENT_BATCHING_MODE == "auto" else _INTENT_BATCHING_MODE == "true",
+    # 한 배치에 담을 최대 요청 수
+    "MAX_BATCH_SIZE": int(os.getenv("INTENT_BATCHING_MAX_BATCH_SIZE", "16")),
+    # 첫 요청 도착 후 추가 요청을 기다리는 최대 시간 (ms)
+    "MAX_WAIT_MS": float(os.getenv("INTENT_BATCHING_MAX_WAIT_MS", "5")),
+    # 호출자가 결과를 기다리는 최대 시간 (초)
+    "RESULT_TIMEOUT_SEC": float(os.getenv("INTENT_BATCHING_RESULT_TIMEOUT_SEC", "10")),
+}
+
+# 의도 분류 토크나이즈 패딩 설정
+INTENT_PADDING = {
+    # "longest": 배치 내 최장 문장 길이까지만 패딩, "max_length": 항상 max_length(64)까지 패딩
+    "MODE": os.getenv("INTENT_PADDING_MODE", "longest"),
+    # "longest" 모드에서 길이가 비슷한 문장끼리 묶을 버킷 크기
+    "BUCKET_SIZE": int(os.getenv("INTENT_PADDING_BUCKET_SIZE", "8")),
+}
+
+# 의도 분류 모델 실행 백엔드 설정
+INTENT_MODEL_RUNTIME = {
+    # "torch": PyTorch fp32, "onnx": ONNX Runtime fp32, "onnx_int8": ONNX Runtime 동적 INT8 양자화 모델
+    "BACKEND": os.getenv("INTENT_MODEL_BACKEND", "torch"),
+    # ONNX Runtime intra-op 스레드 수 (0이면 ONNX Runtime 기본값)
+    "ONNX_INTRA_OP_THREADS": int(os.getenv("INTENT_ONNX_INTRA_OP_THREADS", "0")),
+}
+
+# 모델 로딩 설정 (shared/model_registry.py)
+MODEL_LOADING = {
+    # KoBERT 토크나이저/구조 설정 이름
+    "BASE_MODEL_NAME": "skt/kobert-base-v1",
+    # RAG/시맨틱 캐시용 임베딩 모델
+    "EMBEDDING_MODEL_PATH": os.getenv("EMBEDDING_MODEL_PATH", "dragonkue/snowflake-arctic-embed-l-v2.0-ko"),
+    # 의도/슬롯 모델 가중치를 mmap으로 로드 (워커 간 페이지 공유)
+    "MMAP_WEIGHTS": os.getenv("MODEL_MMAP_WEIGHTS", "true").lower() == "true",
+    # gunicorn 마스터에서 fork 전에 모델을 미리 로드
+    "PRELOAD": os.getenv("MODEL_PRELOAD", "true").lower() == "true",
+}
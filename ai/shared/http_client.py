@@ -0,0 +1,189 @@
+"""
+외부 HTTP API 공용 클라이언트 (data.go.kr 항공편/주차장 API 등)
+
+- 프로세스당 하나의 requests.Session을 사용해 keep-alive 커넥션을 재사용합니다. (fork 이후 워커마다 새로 생성)
+- 엔드포인트별 타임아웃/재시도 횟수를 지정합니다. (get_endpoint)
+- 연결 오류, 타임아웃, 429/5xx 응답은 지수 백오프 + jitter로 재시도합니다.
+- 서킷 브레이커: 연속 HTTP_CB_FAILURE_THRESHOLD번 실패하면 HTTP_CB_RESET_SEC 동안 호출하지 않고
+  바로 CircuitOpenError를 냅니다. 이후 시험 요청 한 건이 성공하면 다시 정상 상태로 돌아갑니다.
+- CircuitOpenError는 requests.exceptions.RequestException을 상속하므로 기존 except 블록에서 그대로 처리됩니다.
+- 메트릭: http.<엔드포인트>.latency_ms / errors / retries / circuit_open
+"""
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from shared.metrics import get_counter, get_histogram
+
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+HTTP_CONNECT_TIMEOUT_SEC = float(os.getenv("HTTP_CONNECT_TIMEOUT_SEC", "3"))
+HTTP_READ_TIMEOUT_SEC = float(os.getenv("HTTP_READ_TIMEOUT_SEC", "5"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_BASE_SEC = float(os.getenv("HTTP_BACKOFF_BASE_SEC", "0.2"))
+HTTP_BACKOFF_MAX_SEC = float(os.getenv("HTTP_BACKOFF_MAX_SEC", "2"))
+HTTP_CB_FAILURE_THRESHOLD = int(os.getenv("HTTP_CB_FAILURE_THRESHOLD", "5"))
+HTTP_CB_RESET_SEC = float(os.getenv("HTTP_CB_RESET_SEC", "30"))
+
+# 재시도할 응답 상태 코드 (그 외 4xx는 요청 자체의 문제이므로 그대로 반환)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+_endpoints = {}
+_endpoints_lock = threading.Lock()
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+def _get_session() -> requests.Session:
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session, _session_pid = session, os.getpid()
+    return _session
+
+
+def _backoff_sec(attempt: int) -> float:
+    """full jitter: 0 ~ min(최대, 기본 * 2^attempt)"""
+    return random.uniform(0, min(HTTP_BACKOFF_MAX_SEC, HTTP_BACKOFF_BASE_SEC * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = HTTP_CB_FAILURE_THRESHOLD, reset_sec: float = HTTP_CB_RESET_SEC):
+        self.failure_threshold = failure_threshold
+        self.reset_sec = reset_sec
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_sec:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """호출해도 되는지 (열린 상태에서 reset_sec가 지나면 시험 요청 한 건만 허용)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_sec and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class Endpoint:
+    def __init__(self, name: str, timeout, retries: int, breaker: CircuitBreaker):
+        """
+        Args:
+            name: 메트릭/서킷 브레이커 구분용 이름 (같은 업스트림은 같은 이름 사용)
+            timeout: 초 또는 (connect, read) 튜플
+            retries: 첫 요청 이후 추가 시도 횟수
+        """
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.breaker = breaker
+        self._latency_ms = get_histogram(f"http.{name}.latency_ms")
+        self._errors = get_counter(f"http.{name}.errors")
+        self._retries = get_counter(f"http.{name}.retries")
+        self._circuit_open = get_counter(f"http.{name}.circuit_open")
+
+    def get(self, url: str, params: dict = None, **kwargs) -> requests.Response:
+        """
+        GET 요청. 재시도 후에도 5xx/429면 마지막 응답을 반환하고(호출부의 raise_for_status로 처리),
+        연결 오류/타임아웃이면 마지막 예외를 그대로 냅니다.
+        """
+        if not self.breaker.allow():
+            self._circuit_open.inc()
+            raise CircuitOpenError(f"'{self.name}' API 서킷 브레이커가 열려 있어 호출을 건너뜁니다.")
+
+        kwargs.setdefault("timeout", self.timeout)
+        response, error = None, None
+        succeeded = False
+        # 어떤 경로로 끝나든(예상하지 못한 예외 포함) 서킷 브레이커에 결과를 한 번 기록해 half-open 시험 상태가 남지 않도록 함
+        try:
+            for attempt in range(self.retries + 1):
+                started = time.perf_counter()
+                try:
+                    response, error = _get_session().get(url, params=params, **kwargs), None
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    response, error = None, e
+                except requests.exceptions.RequestException:
+                    # ChunkedEncodingError, TooManyRedirects 등 재시도해도 같은 결과일 오류는 바로 냄
+                    self._errors.inc()
+                    raise
+                finally:
+                    self._latency_ms.observe((time.perf_counter() - started) * 1000)
+
+                if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                    succeeded = True
+                    return response
+
+                self._errors.inc()
+                reason = error or f"HTTP {response.status_code}"
+                if attempt < self.retries:
+                    self._retries.inc()
+                    delay = _backoff_sec(attempt)
+                    print(f"디버그: '{self.name}' API 호출 실패 ({reason}), {delay:.2f}초 후 재시도 ({attempt + 1}/{self.retries})")
+                    time.sleep(delay)
+
+            if response is not None:
+                return response
+            raise error
+        finally:
+            if succeeded:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+
+def get_endpoint(name: str, timeout=None, retries: int = None) -> Endpoint:
+    """이름으로 엔드포인트를 가져오거나 새로 등록합니다. (같은 이름은 서킷 브레이커/메트릭 공유)"""
+    with _endpoints_lock:
+        endpoint = _endpoints.get(name)
+        if endpoint is None:
+            endpoint = Endpoint(
+                name,
+                timeout if timeout is not None else (HTTP_CONNECT_TIMEOUT_SEC, HTTP_READ_TIMEOUT_SEC),
+                HTTP_MAX_RETRIES if retries is None else retries,
+                CircuitBreaker(),
+            )
+            _endpoints[name] = endpoint
+        return endpoint
+
+
+def endpoint_states() -> dict:
+    """엔드포인트별 서킷 브레이커 상태 (closed / open / half_open)"""
+    with _endpoints_lock:
+        return {name: endpoint.breaker.state for name, endpoint in sorted(_endpoints.items())}
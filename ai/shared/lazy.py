@@ -0,0 +1,138 @@
+"""
+지연 초기화(Lazy) 리소스 및 기동 시간 리포트
+
+모듈 import 시점에는 아무 것도 연결/로드하지 않고, 처음 사용될 때 factory를 호출해 실제 객체를 만듭니다.
+각 컴포넌트의 로드 시간과 오류는 startup_report()로 확인할 수 있고,
+warmup()으로 워커 기동 직후 필요한 컴포넌트를 미리 초기화할 수 있습니다.
+
+    client = LazyResource("openai", _create_openai_client)
+    client.chat.completions.create(...)  # 첫 접근 시 생성
+"""
+import importlib
+import os
+import threading
+import time
+
+_resources = {}
+_report = {}
+_report_lock = threading.Lock()
+_process_started_at = time.time()
+
+
+def record(name, elapsed_ms, error=None):
+    """컴포넌트 로드 시간을 리포트에 기록합니다."""
+    with _report_lock:
+        _report[name] = {
+            "load_ms": round(elapsed_ms, 1),
+            "ok": error is None,
+            "error": str(error) if error else None,
+            "loaded_at": time.time(),
+        }
+
+
+def record_once(name, elapsed_ms):
+    """처음 한 번만 기록합니다. (첫 요청 지연 시간 등)"""
+    with _report_lock:
+        if name in _report:
+            return
+    record(name, elapsed_ms)
+
+
+class LazyResource:
+    """첫 접근 시 factory()로 생성되는 프록시 객체"""
+
+    def __init__(self, name, factory):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_loaded", False)
+        object.__setattr__(self, "_lock", threading.Lock())
+        _resources[name] = self
+
+    def _get(self):
+        if self._loaded:
+            return self._instance
+        with self._lock:
+            if not self._loaded:
+                started = time.perf_counter()
+                try:
+                    instance = self._factory()
+                except Exception as e:
+                    record(self._name, (time.perf_counter() - started) * 1000, error=e)
+                    print(f"오류: '{self._name}' 초기화 실패 - {e}")
+                    raise
+                object.__setattr__(self, "_instance", instance)
+                object.__setattr__(self, "_loaded", True)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                record(self._name, elapsed_ms)
+                print(f"디버그: '{self._name}' 초기화 완료 ({elapsed_ms:.1f}ms, pid={os.getpid()})")
+        return self._instance
+
+    @property
+    def is_loaded(self):
+        return self._loaded
+
+    def __getattr__(self, item):
+        return getattr(self._get(), item)
+
+    def __setattr__(self, key, value):
+        setattr(self._get(), key, value)
+
+    def __getitem__(self, key):
+        return self._get()[key]
+
+    def __call__(self, *args, **kwargs):
+        return self._get()(*args, **kwargs)
+
+    def __repr__(self):
+        state = "loaded" if self._loaded else "not loaded"
+        return f"<LazyResource {self._name} ({state})>"
+
+
+def warmup(names=None, modules=()):
+    """
+    등록된 리소스를 미리 초기화합니다. 실패한 컴포넌트는 리포트에만 남기고 계속 진행합니다.
+    (의존 서비스가 느리거나 죽어 있어도 워커가 죽지 않고, 해당 기능만 첫 사용 시 다시 시도)
+
+    Args:
+        names: 초기화할 리소스 이름 목록 (None이면 전체)
+        modules: 리소스를 등록하는 모듈을 먼저 import (예: "chatbot_app.views")
+    """
+    started = time.perf_counter()
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            print(f"오류: warmup 중 '{module}' import 실패 - {e}")
+
+    # 초기화 도중 새로 등록되는 리소스(그래프 빌드 중 import되는 클라이언트 등)까지 처리
+    attempted = set()
+    while True:
+        pending = [
+            (name, resource) for name, resource in list(_resources.items())
+            if name not in attempted and (not names or name in names)
+        ]
+        if not pending:
+            break
+        for name, resource in pending:
+            attempted.add(name)
+            try:
+                resource._get()
+            except Exception:
+                pass
+
+    record("warmup", (time.perf_counter() - started) * 1000)
+    return startup_report()
+
+
+def startup_report():
+    """컴포넌트별 로드 시간/상태 리포트"""
+    with _report_lock:
+        components = {name: dict(info) for name, info in _report.items()}
+    pending = [name for name, resource in _resources.items() if not resource.is_loaded]
+    return {
+        "pid": os.getpid(),
+        "uptime_sec": round(time.time() - _process_started_at, 1),
+        "components": components,
+        "not_loaded": sorted(pending),
+    }
@@ -1,26 +1,12 @@
-import torch
-import pickle
-
-from transformers import AutoTokenizer
-
-from shared.config import INTENT2IDX_PATH, SLOT2IDX_PATH, MODEL_PATH
-from shared.model import KoBERTIntentSlotModel
-from shared.utils import device
+from shared.lazy import LazyResource
+from shared.model_registry import (
+    get_label_maps, get_intent_model,
+    load_torch_model, load_onnx_model,
+)
+from shared.utils import tokenizer
 
 # 인텐트/슬롯 라벨 딕셔너리 로드
-with open(INTENT2IDX_PATH, "rb") as f:
-    intent2idx = pickle.load(f)
-
-with open(SLOT2IDX_PATH, "rb") as f:
-    slot2idx = pickle.load(f)
-
-idx2intent = {v: k for k, v in intent2idx.items()}
-idx2slot = {v: k for k, v in slot2idx.items()}
-
-# ✅ 모델 로드
-model = KoBERTIntentSlotModel(num_intents=len(intent2idx), num_slots=len(slot2idx))
-model.load_state_dict(torch.load(MODEL_PATH, map_location=device))
-model.to(device)
-model.eval()
+intent2idx, slot2idx, idx2intent, idx2slot = get_label_maps()
 
-tokenizer = AutoTokenizer.from_pretrained("skt/kobert-base-v1", use_fast=False)
\ No newline at end of file
+# ✅ 모델 로드 (모델 레지스트리에서 프로세스당 1회, 첫 추론 또는 warmup 시점)
+model = LazyResource("intent_model", get_intent_model)
@@ -0,0 +1,79 @@
+"""
+프로세스 메모리 사용량 조회 (Linux /proc 기반)
+
+- rss: 프로세스가 점유한 물리 메모리 (공유 페이지 포함)
+- pss: 공유 페이지를 공유하는 프로세스 수로 나눈 비례 메모리 (워커별 실제 부담)
+- shared / private: 다른 프로세스와 공유 중인 페이지 / 해당 프로세스 전용 페이지
+
+gunicorn 마스터 PID를 넘겨 실행하면 워커별 메모리를 출력합니다:
+    python -m shared.memory_report <master_pid>
+"""
+import os
+import sys
+
+_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared_clean",
+    "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean",
+    "Private_Dirty": "private_dirty",
+}
+
+
+def read_process_memory(pid=None):
+    """
+    /proc/<pid>/smaps_rollup에서 메모리 사용량(MB)을 읽어 반환합니다.
+    지원하지 않는 환경에서는 빈 dict를 반환합니다.
+    """
+    pid = pid or os.getpid()
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                key = parts[0].rstrip(":")
+                if key in _FIELDS and len(parts) >= 2:
+                    values[_FIELDS[key]] = round(int(parts[1]) / 1024, 1)  # kB → MB
+    except (FileNotFoundError, PermissionError, ProcessLookupError):
+        return {}
+
+    if values:
+        values["shared"] = round(values.get("shared_clean", 0) + values.get("shared_dirty", 0), 1)
+        values["private"] = round(values.get("private_clean", 0) + values.get("private_dirty", 0), 1)
+    return values
+
+
+def child_pids(pid):
+    """지정 프로세스의 자식 PID 목록 (gunicorn 워커 조회용)"""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def format_memory(label, memory):
+    if not memory:
+        return f"{label}: 메모리 정보를 읽을 수 없습니다."
+    return (f"{label}: RSS {memory['rss']:.1f}MB | PSS {memory['pss']:.1f}MB | "
+            f"공유 {memory['shared']:.1f}MB | 전용 {memory['private']:.1f}MB")
+
+
+def report(master_pid):
+    print(format_memory(f"master({master_pid})", read_process_memory(master_pid)))
+    total_pss = 0.0
+    workers = child_pids(master_pid)
+    for pid in workers:
+        memory = read_process_memory(pid)
+        total_pss += memory.get("pss", 0.0)
+        print(format_memory(f"worker({pid})", memory))
+    if workers:
+        print(f"워커 {len(workers)}개 PSS 합계: {total_pss:.1f}MB (워커당 평균 {total_pss / len(workers):.1f}MB)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python -m shared.memory_report <gunicorn_master_pid>")
+        sys.exit(1)
+    report(int(sys.argv[1]))
@@ -0,0 +1,99 @@
+"""
+프로세스 내 경량 메트릭 모듈
+
+- Histogram: 버킷 기반 분포 (배치 크기, 대기 시간, 지연 시간 등)
+- Counter: 단순 누적 카운터 (캐시 히트/미스 등)
+
+외부 의존성 없이 워커 프로세스 단위로 값을 모으며, snapshot()으로 현재 값을 dict 형태로 확인할 수 있습니다.
+"""
+import bisect
+import threading
+
+# 기본 버킷 (밀리초 단위 지연 시간 측정용)
+DEFAULT_MS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    def __init__(self, name, buckets=DEFAULT_MS_BUCKETS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        # 마지막 칸은 +Inf 버킷
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+            self._count += 1
+            if self._max is None or value > self._max:
+                self._max = value
+
+    def snapshot(self):
+        with self._lock:
+            buckets = {}
+            cumulative = 0
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets[f"le_{bound}"] = cumulative
+            buckets["le_inf"] = cumulative + self._counts[-1]
+            return {
+                "count": self._count,
+                "sum": round(self._sum, 3),
+                "avg": round(self._sum / self._count, 3) if self._count else 0.0,
+                "max": self._max,
+                "buckets": buckets,
+            }
+
+
+class Counter:
+    def __init__(self, name):
+        self.name = name
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def snapshot(self):
+        return self._value
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_histogram(name, buckets=DEFAULT_MS_BUCKETS):
+    """이름으로 히스토그램을 가져오거나 새로 생성합니다."""
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = Histogram(name, buckets)
+            _registry[name] = metric
+        return metric
+
+
+def get_counter(name):
+    """이름으로 카운터를 가져오거나 새로 생성합니다."""
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = Counter(name)
+            _registry[name] = metric
+        return metric
+
+
+def snapshot():
+    """등록된 모든 메트릭의 현재 값을 반환합니다."""
+    with _registry_lock:
+        metrics = dict(_registry)
+    return {name: metric.snapshot() for name, metric in sorted(metrics.items())}
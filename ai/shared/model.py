@@ -1,10 +1,19 @@
+import torch
 import torch.nn as nn
 from transformers import BertModel
 
 class KoBERTIntentSlotModel(nn.Module):
-    def __init__(self, num_intents, num_slots):
+    def __init__(self, num_intents, num_slots, pretrained=True, bert_config=None):
+        """
+        Args:
+            pretrained: True면 사전학습 KoBERT 가중치를 내려받아 초기화 (학습용)
+                        False면 bert_config로 구조만 생성 (파인튜닝 가중치를 바로 로드하는 추론용)
+        """
         super().__init__()
-        self.bert = BertModel.from_pretrained("skt/kobert-base-v1")
+        if pretrained:
+            self.bert = BertModel.from_pretrained("skt/kobert-base-v1")
+        else:
+            self.bert = BertModel(bert_config, add_pooling_layer=True)
         hidden_size = self.bert.config.hidden_size
 
         self.intent_classifier = nn.Linear(hidden_size, num_intents)
@@ -23,4 +32,38 @@ class KoBERTIntentSlotModel(nn.Module):
         intent_logits = self.intent_classifier(pooled_output)
         slot_logits = self.slot_classifier(sequence_output)
 
-        return intent_logits, slot_logits
\ No newline at end of file
+        return intent_logits, slot_logits
+
+
+class OnnxIntentSlotModel:
+    """
+    ONNX Runtime으로 KoBERTIntentSlotModel과 같은 입출력을 제공하는 래퍼
+    (torch 텐서를 받아 (intent_logits, slot_logits) torch 텐서를 반환)
+    """
+    def __init__(self, onnx_path, intra_op_threads=0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.onnx_path = onnx_path
+        self.session = ort.InferenceSession(onnx_path, sess_options=options, providers=["CPUExecutionProvider"])
+
+    def __call__(self, input_ids, attention_mask):
+        intent_logits, slot_logits = self.session.run(
+            ["intent_logits", "slot_logits"],
+            {
+                "input_ids": input_ids.cpu().numpy().astype("int64"),
+                "attention_mask": attention_mask.cpu().numpy().astype("int64"),
+            }
+        )
+        return torch.from_numpy(intent_logits), torch.from_numpy(slot_logits)
+
+    # torch 모델과 동일하게 다룰 수 있도록 no-op 제공
+    def to(self, device):
+        return self
+
+    def eval(self):
+        return self
@@ -0,0 +1,144 @@
+"""
+모델/토크나이저 레지스트리
+
+프로세스 내에서 각 아티팩트(KoBERT 토크나이저, 라벨 딕셔너리, 의도/슬롯 모델, 임베딩 모델)를 한 번만 로드합니다.
+
+- 의도/슬롯 모델은 BertConfig로 구조만 만들고(사전학습 가중치 다운로드 없음) 파인튜닝 가중치를 바로 적용합니다.
+- MODEL_MMAP_WEIGHTS가 켜져 있으면 가중치를 mmap으로 읽어 같은 파일을 쓰는 워커끼리 페이지 캐시를 공유합니다.
+- gunicorn preload_app 모드에서는 fork 전에 preload()를 호출해 모든 워커가 부모의 메모리 페이지를 공유합니다.
+"""
+import os
+import pickle
+import threading
+import time
+
+import torch
+from transformers import AutoTokenizer, BertConfig
+
+from shared.config import (
+    INTENT2IDX_PATH, SLOT2IDX_PATH, MODEL_PATH,
+    ONNX_MODEL_PATH, ONNX_INT8_MODEL_PATH, INTENT_MODEL_RUNTIME, MODEL_LOADING,
+)
+from shared.model import KoBERTIntentSlotModel, OnnxIntentSlotModel
+from shared.lazy import record
+
+# 공통 디바이스 설정
+device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+_cache = {}
+_lock = threading.RLock()
+
+
+def _get_or_load(key, loader):
+    if key in _cache:
+        return _cache[key]
+    with _lock:
+        if key not in _cache:
+            started = time.perf_counter()
+            _cache[key] = loader()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            record(f"model_registry.{key}", elapsed_ms)
+            print(f"디버그: 모델 레지스트리 '{key}' 로드 완료 ({elapsed_ms:.1f}ms, pid={os.getpid()})")
+        return _cache[key]
+
+
+def get_tokenizer():
+    """KoBERT 토크나이저 (프로세스당 1회 로드)"""
+    return _get_or_load(
+        "tokenizer",
+        lambda: AutoTokenizer.from_pretrained(MODEL_LOADING["BASE_MODEL_NAME"], use_fast=False),
+    )
+
+
+def _load_label_maps():
+    with open(INTENT2IDX_PATH, "rb") as f:
+        intent2idx = pickle.load(f)
+    with open(SLOT2IDX_PATH, "rb") as f:
+        slot2idx = pickle.load(f)
+    idx2intent = {v: k for k, v in intent2idx.items()}
+    idx2slot = {v: k for k, v in slot2idx.items()}
+    return intent2idx, slot2idx, idx2intent, idx2slot
+
+
+def get_label_maps():
+    """(intent2idx, slot2idx, idx2intent, idx2slot)"""
+    return _get_or_load("label_maps", _load_label_maps)
+
+
+def load_torch_model():
+    """
+    파인튜닝된 KoBERTIntentSlotModel을 로드합니다.
+    구조는 BertConfig로만 만들고, 가중치는 best_model.pt에서 바로 가져옵니다.
+    """
+    intent2idx, slot2idx, _, _ = get_label_maps()
+    bert_config = BertConfig.from_pretrained(MODEL_LOADING["BASE_MODEL_NAME"])
+    model = KoBERTIntentSlotModel(
+        num_intents=len(intent2idx), num_slots=len(slot2idx),
+        pretrained=False, bert_config=bert_config,
+    )
+
+    if MODEL_LOADING["MMAP_WEIGHTS"] and device.type == "cpu":
+        # mmap으로 읽은 텐서를 그대로 파라미터로 사용 (복사 없음 → 워커 간 페이지 캐시 공유)
+        state_dict = torch.load(MODEL_PATH, map_location="cpu", mmap=True, weights_only=True)
+        model.load_state_dict(state_dict, assign=True)
+    else:
+        model.load_state_dict(torch.load(MODEL_PATH, map_location=device))
+
+    model.to(device)
+    model.eval()
+    # 추론 전용이므로 autograd 메타데이터를 만들지 않도록 고정
+    for param in model.parameters():
+        param.requires_grad_(False)
+    return model
+
+
+def load_onnx_model(quantized=False):
+    onnx_path = ONNX_INT8_MODEL_PATH if quantized else ONNX_MODEL_PATH
+    return OnnxIntentSlotModel(onnx_path, intra_op_threads=INTENT_MODEL_RUNTIME["ONNX_INTRA_OP_THREADS"])
+
+
+def _load_intent_model(backend):
+    if backend == "torch":
+        return load_torch_model()
+    if backend == "onnx":
+        return load_onnx_model(quantized=False)
+    if backend == "onnx_int8":
+        return load_onnx_model(quantized=True)
+    raise ValueError(f"지원하지 않는 INTENT_MODEL_BACKEND: {backend}")
+
+
+def get_intent_model(backend=None):
+    """
+    설정된 백엔드로 의도/슬롯 모델을 반환합니다.
+    (torch / onnx / onnx_int8)
+    """
+    backend = backend or INTENT_MODEL_RUNTIME["BACKEND"]
+    return _get_or_load(f"intent_model:{backend}", lambda: _load_intent_model(backend))
+
+
+def get_embedding_model():
+    """SentenceTransformer 임베딩 모델 (프로세스당 1회 로드)"""
+    def _load():
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(MODEL_LOADING["EMBEDDING_MODEL_PATH"], device=str(device))
+        model.eval()
+        return model
+
+    return _get_or_load("embedding_model", _load)
+
+
+def preload():
+    """
+    fork 전에 모든 모델을 미리 로드합니다. (gunicorn preload_app 모드)
+    부모 프로세스에서는 추론을 실행하지 않습니다. (OpenMP 스레드 풀이 fork 이후 멈추는 문제 방지)
+    """
+    get_tokenizer()
+    get_label_maps()
+    get_intent_model()
+    get_embedding_model()
+
+
+def loaded_artifacts():
+    """현재 프로세스에 로드된 아티팩트 이름 목록"""
+    return sorted(_cache.keys())
@@ -4,6 +4,8 @@ from torch.nn.functional import softmax, sigmoid
 from shared.load_model import model, idx2intent, idx2slot, intent2idx
 from shared.normalize_with_morph import normalize_with_morph
 from shared.utils import tokenizer, device
+from shared.batching import MicroBatcher
+from shared.config import INTENT_BATCHING, INTENT_PADDING
 
 # 🧱 토큰 → 단어 병합 + 슬롯 정렬
 def merge_tokens_and_slots(tokens, slot_ids, idx2slot):
@@ -30,17 +32,74 @@ def merge_tokens_and_slots(tokens, slot_ids, idx2slot):
 
     return merged
 
+# 🧩 토크나이즈 + 패딩
+def _pad_features(features, max_length=64, padding_mode=None):
+    """
+    토큰화된 feature 리스트를 패딩 모드에 맞춰 텐서로 변환합니다.
+
+    - "longest": 배치 내 가장 긴 문장 길이까지만 오른쪽 패딩 (기본값)
+      실제 토큰의 위치가 항상 0부터 시작하므로 배치 구성과 관계없이 같은 결과가 나옵니다. (학습 시 인코딩과 동일)
+    - "max_length": 기존과 동일하게 토크나이저 기본 방식으로 max_length까지 패딩
+    """
+    padding_mode = padding_mode or INTENT_PADDING["MODE"]
+
+    if padding_mode == 'max_length':
+        batch = tokenizer.pad(
+            [{"input_ids": f["input_ids"], "attention_mask": f["attention_mask"]} for f in features],
+            padding='max_length',
+            max_length=max_length,
+            return_tensors='pt'
+        )
+        return batch["input_ids"].to(device), batch["attention_mask"].to(device)
+
+    longest = max(len(f["input_ids"]) for f in features)
+    input_ids = torch.full((len(features), longest), tokenizer.pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(features), longest), dtype=torch.long)
+    for row, f in enumerate(features):
+        length = len(f["input_ids"])
+        input_ids[row, :length] = torch.tensor(f["input_ids"], dtype=torch.long)
+        attention_mask[row, :length] = torch.tensor(f["attention_mask"], dtype=torch.long)
+    return input_ids.to(device), attention_mask.to(device)
+
+
+def _tokenize(texts, max_length=64):
+    """패딩 없이 토크나이즈만 수행하고 문장별 feature 리스트를 반환합니다."""
+    encoded = tokenizer(texts, truncation=True, max_length=max_length)
+    return [
+        {"input_ids": ids, "attention_mask": mask}
+        for ids, mask in zip(encoded["input_ids"], encoded["attention_mask"])
+    ]
+
+
+def _encode(texts, max_length=64, padding_mode=None):
+    if isinstance(texts, str):
+        texts = [texts]
+    return _pad_features(_tokenize(texts, max_length), max_length, padding_mode)
+
+
+def _trim_to_attention(input_ids_row, attention_mask_row, slot_ids_row):
+    """
+    패딩 위치를 제거한 토큰/슬롯 ID를 반환합니다.
+    "max_length" 모드는 토크나이저 기본값인 왼쪽 패딩이므로 앞부분 자르기가 아닌 attention mask 위치 기준으로 고릅니다.
+    """
+    mask = attention_mask_row.bool().cpu()
+    tokens = tokenizer.convert_ids_to_tokens(input_ids_row.cpu()[mask])
+    slot_ids = [slot_id for slot_id, keep in zip(slot_ids_row, mask.tolist()) if keep]
+    return tokens, slot_ids
+
+
+def bucket_by_length(lengths, bucket_size):
+    """
+    길이가 비슷한 아이템끼리 묶인 인덱스 리스트를 반환합니다.
+    버킷 단위로 "longest" 패딩을 하면 짧은 문장이 긴 문장 길이만큼 패딩되는 낭비가 줄어듭니다.
+    """
+    bucket_size = max(1, int(bucket_size))
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[i:i + bucket_size] for i in range(0, len(order), bucket_size)]
+
 # 🔮 예측 함수
 def predict_top_k_intents_and_slots(text, k=3):
-    encoding = tokenizer(
-        text,
-        return_tensors='pt',
-        truncation=True,
-        padding='max_length',
-        max_length=64
-    )
-    input_ids = encoding["input_ids"].to(device)
-    attention_mask = encoding["attention_mask"].to(device)
+    input_ids, attention_mask = _encode(text, max_length=64)
 
     with torch.no_grad():
         intent_logits, slot_logits = model(input_ids, attention_mask)
@@ -58,7 +117,7 @@ def predict_top_k_intents_and_slots(text, k=3):
 
         # 🎯 슬롯 예측
         slot_pred_ids = torch.argmax(slot_logits, dim=2)[0].tolist()
-        tokens = tokenizer.convert_ids_to_tokens(input_ids[0])
+        tokens, slot_pred_ids = _trim_to_attention(input_ids[0], attention_mask[0], slot_pred_ids)
 
         merged = merge_tokens_and_slots(tokens, slot_pred_ids, idx2slot)
 
@@ -66,9 +125,7 @@ def predict_top_k_intents_and_slots(text, k=3):
 
 # 🔮 예측 함수 (의도 top-1만 사용)
 def predict_intent(text):
-    encoding = tokenizer(text, return_tensors='pt', truncation=True, padding='max_length', max_length=64)
-    input_ids = encoding["input_ids"].to(device)
-    attention_mask = encoding["attention_mask"].to(device)
+    input_ids, attention_mask = _encode(text, max_length=64)
 
     with torch.no_grad():
         intent_logits, _ = model(input_ids, attention_mask)
@@ -77,58 +134,81 @@ def predict_intent(text):
         predicted_intent = idx2intent[top_index.item()]
         return predicted_intent, top_prob.item()
 
-# 🔮 BCEWithLogitsLoss 기반 예측 함수
-def predict_with_bce(text, threshold=0.8, top_k_intents=3, max_length=64):
+# 🔮 BCEWithLogitsLoss 기반 배치 forward pass
+def _forward_batch_with_bce(items, padding_mode=None):
     """
-    BCEWithLogitsLoss로 학습된 모델을 위한 예측 함수
-
-    Args:
-        text: 입력 텍스트
-        threshold: Intent 분류 임계값 (default: 0.8)
-        top_k_intents: 상위 K개 인텐트 반환 (default: 3)
+    (정규화된 텍스트, max_length) 리스트를 forward pass로 처리합니다.
+    "longest" 패딩 모드에서는 길이가 비슷한 문장끼리 버킷으로 묶어 처리합니다.
+    각 아이템마다 (intent_probs, tokens, slot_pred_ids)를 반환합니다.
     """
-    text = normalize_with_morph(text)
-    encoding = tokenizer(
-        text,
-        return_tensors='pt',
-        truncation=True,
-        padding='max_length',
-        max_length=max_length
-    )
-    input_ids = encoding["input_ids"].to(device)
-    attention_mask = encoding["attention_mask"].to(device)
+    padding_mode = padding_mode or INTENT_PADDING["MODE"]
+    results = [None] * len(items)
 
-    with torch.no_grad():
-        intent_logits, slot_logits = model(input_ids, attention_mask)
+    # max_length가 다른 요청은 따로 묶어서 처리
+    groups = {}
+    for i, (text, max_length) in enumerate(items):
+        groups.setdefault(max_length, []).append(i)
 
-        # Intent 예측 (Sigmoid 기반)
-        intent_probs = sigmoid(intent_logits)[0]  # [num_intents]
+    for max_length, indices in groups.items():
+        features = _tokenize([items[i][0] for i in indices], max_length)
 
-        # 임계값 이상의 인텐트들 찾기
-        high_confidence_intents = []
-        for i, prob in enumerate(intent_probs):
-            if prob.item() >= threshold:
-                intent_name = idx2intent[i]
-                high_confidence_intents.append((intent_name, prob.item()))
+        if padding_mode == 'max_length':
+            buckets = [list(range(len(indices)))]
+        else:
+            buckets = bucket_by_length(
+                [len(f["input_ids"]) for f in features], INTENT_PADDING["BUCKET_SIZE"]
+            )
 
-        # 확률 순으로 정렬
-        high_confidence_intents.sort(key=lambda x: x[1], reverse=True)
+        for bucket in buckets:
+            input_ids, attention_mask = _pad_features(
+                [features[b] for b in bucket], max_length, padding_mode
+            )
 
-        # 만약 임계값 이상인 게 없다면 최고 확률 하나만
-        if not high_confidence_intents:
-            max_idx = torch.argmax(intent_probs).item()
-            max_prob = intent_probs[max_idx].item()
-            high_confidence_intents = [(idx2intent[max_idx], max_prob)]
+            with torch.no_grad():
+                intent_logits, slot_logits = model(input_ids, attention_mask)
+                intent_probs = sigmoid(intent_logits).cpu()
+                slot_pred_ids = torch.argmax(slot_logits, dim=2).cpu().tolist()
 
-        # Top-K 인텐트 (전체 순위용)
-        topk_probs, topk_indices = torch.topk(intent_probs, min(top_k_intents, len(intent2idx)))
-        all_top_intents = [(idx2intent[idx.item()], prob.item())
-                          for idx, prob in zip(topk_indices, topk_probs)]
+            for row, b in enumerate(bucket):
+                tokens, slot_ids = _trim_to_attention(input_ids[row], attention_mask[row], slot_pred_ids[row])
+                results[indices[b]] = (intent_probs[row], tokens, slot_ids)
 
-        # 슬롯 예측 (기존과 동일 - Softmax 기반)
-        slot_pred_ids = torch.argmax(slot_logits, dim=2)[0].tolist()
-        tokens = tokenizer.convert_ids_to_tokens(input_ids[0])
-        merged_slots = merge_tokens_and_slots(tokens, slot_pred_ids, idx2slot)
+    return results
+
+
+# 동시 요청을 모아 처리하는 배처 (워커 스레드는 첫 요청 시 시작)
+_intent_batcher = MicroBatcher(
+    _forward_batch_with_bce,
+    max_batch_size=INTENT_BATCHING["MAX_BATCH_SIZE"],
+    max_wait_ms=INTENT_BATCHING["MAX_WAIT_MS"],
+    name="intent_batcher",
+)
+
+
+def _build_bce_result(intent_probs, tokens, slot_pred_ids, threshold, top_k_intents):
+    # 임계값 이상의 인텐트들 찾기
+    high_confidence_intents = []
+    for i, prob in enumerate(intent_probs):
+        if prob.item() >= threshold:
+            intent_name = idx2intent[i]
+            high_confidence_intents.append((intent_name, prob.item()))
+
+    # 확률 순으로 정렬
+    high_confidence_intents.sort(key=lambda x: x[1], reverse=True)
+
+    # 만약 임계값 이상인 게 없다면 최고 확률 하나만
+    if not high_confidence_intents:
+        max_idx = torch.argmax(intent_probs).item()
+        max_prob = intent_probs[max_idx].item()
+        high_confidence_intents = [(idx2intent[max_idx], max_prob)]
+
+    # Top-K 인텐트 (전체 순위용)
+    topk_probs, topk_indices = torch.topk(intent_probs, min(top_k_intents, len(intent2idx)))
+    all_top_intents = [(idx2intent[idx.item()], prob.item())
+                      for idx, prob in zip(topk_indices, topk_probs)]
+
+    # 슬롯 예측 (기존과 동일 - Softmax 기반)
+    merged_slots = merge_tokens_and_slots(tokens, slot_pred_ids, idx2slot)
 
     return {
         'high_confidence_intents': high_confidence_intents,  # 임계값 이상
@@ -136,5 +216,42 @@ def predict_with_bce(text, threshold=0.8, top_k_intents=3, max_length=64):
         'slots': merged_slots,
         'is_multi_intent': len(high_confidence_intents) > 1,
         'max_intent_prob': max(prob for _, prob in all_top_intents),
-        'intent_probs_raw': intent_probs.cpu().numpy()
-    }
\ No newline at end of file
+        'intent_probs_raw': intent_probs.numpy()
+    }
+
+
+# 🔮 BCEWithLogitsLoss 기반 예측 함수
+def predict_with_bce(text, threshold=0.8, top_k_intents=3, max_length=64):
+    """
+    BCEWithLogitsLoss로 학습된 모델을 위한 예측 함수
+
+    INTENT_BATCHING["ENABLED"]가 켜져 있으면 동시에 들어온 요청과 함께 배치로 처리됩니다.
+
+    Args:
+        text: 입력 텍스트
+        threshold: Intent 분류 임계값 (default: 0.8)
+        top_k_intents: 상위 K개 인텐트 반환 (default: 3)
+    """
+    text = normalize_with_morph(text)
+    item = (text, max_length)
+
+    if INTENT_BATCHING["ENABLED"]:
+        intent_probs, tokens, slot_pred_ids = _intent_batcher(
+            item, timeout=INTENT_BATCHING["RESULT_TIMEOUT_SEC"]
+        )
+    else:
+        intent_probs, tokens, slot_pred_ids = _forward_batch_with_bce([item])[0]
+
+    return _build_bce_result(intent_probs, tokens, slot_pred_ids, threshold, top_k_intents)
+
+
+def predict_batch_with_bce(texts, threshold=0.8, top_k_intents=3, max_length=64, padding_mode=None):
+    """
+    여러 문장을 한 번에 예측합니다. (오프라인 평가/벤치마크용)
+    """
+    items = [(normalize_with_morph(text), max_length) for text in texts]
+    outputs = _forward_batch_with_bce(items, padding_mode=padding_mode)
+    return [
+        _build_bce_result(intent_probs, tokens, slot_pred_ids, threshold, top_k_intents)
+        for intent_probs, tokens, slot_pred_ids in outputs
+    ]
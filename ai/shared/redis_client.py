@@ -0,0 +1,56 @@
+"""
+공용 Redis 클라이언트 (django_redis와 같은 Redis 인스턴스 사용)
+
+Django 설정 없이도 RAG/공용 모듈에서 사용할 수 있도록 redis-py 클라이언트를 직접 만듭니다.
+Redis가 꺼져 있거나 연결할 수 없으면 None을 반환하며, 호출하는 쪽은 로컬 캐시만으로 동작해야 합니다.
+"""
+import os
+import threading
+import time
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/1")
+REDIS_SOCKET_TIMEOUT_SEC = float(os.getenv("REDIS_SOCKET_TIMEOUT_SEC", "0.2"))
+# 연결 실패 후 다시 시도하기까지 기다리는 시간 (요청마다 연결 타임아웃을 겪지 않도록)
+REDIS_RETRY_AFTER_SEC = float(os.getenv("REDIS_RETRY_AFTER_SEC", "30"))
+
+_client = None
+_client_pid = None
+_failed_at = 0.0
+_lock = threading.Lock()
+
+
+def get_redis():
+    """redis.Redis 인스턴스 또는 None (사용 불가 시)"""
+    global _client, _client_pid, _failed_at
+
+    if _client is not None and _client_pid == os.getpid():
+        return _client
+    if _failed_at and time.time() - _failed_at < REDIS_RETRY_AFTER_SEC:
+        return None
+
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            return _client
+        try:
+            import redis
+
+            client = redis.Redis.from_url(
+                REDIS_URL,
+                socket_timeout=REDIS_SOCKET_TIMEOUT_SEC,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SEC,
+            )
+            client.ping()
+        except Exception as e:
+            print(f"디버그: Redis 연결 실패, 로컬 캐시만 사용합니다 - {e}")
+            _failed_at = time.time()
+            return None
+
+        _client, _client_pid, _failed_at = client, os.getpid(), 0.0
+        return _client
+
+
+def mark_redis_failed():
+    """요청 중 Redis 오류가 나면 호출 → 일정 시간 동안 Redis를 건너뜀"""
+    global _client, _failed_at
+    _client = None
+    _failed_at = time.time()
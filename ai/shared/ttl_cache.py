@@ -0,0 +1,74 @@
+"""
+프로세스 내 TTL 캐시 + 요청 병합(single-flight)
+
+- get_or_load(key, loader): 만료되지 않은 값이 있으면 바로 반환하고, 없으면 loader()를 호출해 저장합니다.
+- 같은 키를 동시에 요청하면 첫 요청만 loader를 실행하고 나머지는 그 결과를 기다려 함께 받습니다.
+  (예: 여러 사용자가 동시에 KE907을 물어봐도 외부 API 호출은 한 번)
+- loader가 예외를 내면 저장하지 않고, 기다리던 요청에도 같은 예외를 전달합니다.
+- max_entries를 넘으면 가장 오래된 항목부터 제거합니다.
+- 반환값은 캐시에 저장된 객체 그대로이므로, 수정이 필요한 호출부는 복사해서 사용해야 합니다.
+- 메트릭: cache.<이름>.hit / miss / coalesced
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from shared.metrics import get_counter
+
+
+class TTLCache:
+    def __init__(self, name: str, ttl_sec: float, max_entries: int = 1024):
+        self.name = name
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (만료 시각, 값)
+        self._inflight = {}  # key -> Future
+        self._lock = threading.Lock()
+        self._hit = get_counter(f"cache.{name}.hit")
+        self._miss = get_counter(f"cache.{name}.miss")
+        self._coalesced = get_counter(f"cache.{name}.coalesced")
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._hit.inc()
+                    return entry[1]
+                del self._data[key]
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            self._coalesced.inc()
+            return future.result()
+
+        self._miss.inc()
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_sec, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
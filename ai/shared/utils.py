@@ -1,10 +1,7 @@
 # ai/intent_classifier/utils.py
 
-import torch
-from transformers import AutoTokenizer
+from shared.lazy import LazyResource
+from shared.model_registry import device, get_tokenizer
 
-# 공통 디바이스 설정
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
-# 공통 토크나이저 로드
-tokenizer = AutoTokenizer.from_pretrained("skt/kobert-base-v1", use_fast=False)
+# 공통 디바이스 설정 / 토크나이저 (모델 레지스트리에서 프로세스당 1회, 첫 사용 시 로드)
+tokenizer = LazyResource("kobert_tokenizer", get_tokenizer)
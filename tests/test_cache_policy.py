@@ -0,0 +1,42 @@
+# tests/test_cache_policy.py
+# 시맨틱 캐시 정책(ai/chatbot/rag/cache_policy.py) 테스트: 이전 대화 맥락에 기댄 답변은 캐시하지 않음
+# 실행: python -m pytest tests/test_cache_policy.py  또는  python tests/test_cache_policy.py
+
+import sys
+import unittest
+from pathlib import Path
+
+AI_DIR = Path(__file__).resolve().parent.parent / "ai"
+sys.path.insert(0, str(AI_DIR))
+
+from chatbot.rag.cache_policy import DAILY_TTL_SEC, resolve_cache_policy
+
+PREVIOUS_SLOTS = [("KE123", "B-flight_id"), ("항공편", "O")]
+
+# (설명, state, 캐시 여부)
+CASES = [
+    ("첫 질문", {"user_input": "주차 요금 알려줘", "rephrased_query": "주차 요금 알려줘"}, True),
+    ("재구성 없음", {"user_input": "주차 요금 알려줘"}, True),
+    ("공백만 다른 재구성", {"user_input": "주차 요금 알려줘", "rephrased_query": " 주차  요금 알려줘"}, True),
+    ("재구성된 질문 사용", {"user_input": "2터미널은?", "rephrased_query": "2터미널 주차 요금 알려줘"}, False),
+    ("이전 슬롯 이어받음", {"user_input": "탑승구는?", "previous_slots": PREVIOUS_SLOTS}, False),
+    ("이전 슬롯이 질문에 다시 나옴", {"user_input": "KE123 탑승구는?", "previous_slots": PREVIOUS_SLOTS}, True),
+]
+
+
+class CachePolicyTest(unittest.TestCase):
+    def test_history_dependent_answers_are_not_cached(self):
+        for name, state, cacheable in CASES:
+            with self.subTest(name=name):
+                state = {"intent": "parking_fee_info", **state}
+                policy = resolve_cache_policy(state, state["user_input"])
+                self.assertEqual(policy is not None, cacheable)
+
+    def test_cacheable_policy(self):
+        policy = resolve_cache_policy({"intent": "parking_fee_info", "user_input": "주차 요금"}, "주차 요금")
+        self.assertEqual(policy["ttl_sec"], DAILY_TTL_SEC)
+        self.assertEqual(policy["domains"], ["parking"])
+
+
+if __name__ == "__main__":
+    unittest.main()
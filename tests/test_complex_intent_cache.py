@@ -0,0 +1,84 @@
+# tests/test_complex_intent_cache.py
+# 복합 의도 하위 질문이 시간 초과/실패하면 답변을 partial로 표시하고 시맨틱 캐시에 저장하지 않는지 확인
+# 실행: python -m pytest tests/test_complex_intent_cache.py  또는  python tests/test_complex_intent_cache.py
+
+import sys
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+AI_DIR = Path(__file__).resolve().parent.parent / "ai"
+sys.path.insert(0, str(AI_DIR))
+
+from chatbot.graph.nodes import complex_handler
+from chatbot.rag.cache_policy import resolve_cache_policy
+
+
+class _FakeSubgraph:
+    """intent별로 지연/오류를 흉내 내는 서브그래프"""
+
+    def __init__(self, delays=None, errors=()):
+        self.delays = delays or {}
+        self.errors = set(errors)
+
+    def invoke(self, state):
+        intent = state["intent"]
+        if intent in self.errors:
+            raise RuntimeError("handler failed")
+        time.sleep(self.delays.get(intent, 0))
+        return {"response": f"<p>{intent} 답변</p>"}
+
+
+def _complex_state(subgraph, queries):
+    state = {
+        "user_input": "주차 요금이랑 날씨 알려줘",
+        "intent": "complex_intent",
+        "detected_intents": [(item["intent"], 0.5) for item in queries],
+        "messages": [],
+    }
+    with mock.patch.object(complex_handler, "_decompose_and_classify_queries", return_value=queries):
+        return complex_handler.handle_complex_intent(state, handlers={}, supported_intents=[], subgraph=subgraph)
+
+
+QUERIES = [
+    {"question": "주차 요금", "intent": "parking_fee_info"},
+    {"question": "날씨", "intent": "airport_weather_current"},
+]
+
+
+class ComplexIntentCacheTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(complex_handler, "COMPLEX_INTENT_BRANCH_TIMEOUT_SEC", 0.2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_all_branches_answered_is_cached(self):
+        state = _complex_state(_FakeSubgraph(), QUERIES)
+        self.assertFalse(state["partial"])
+        self.assertIsNotNone(resolve_cache_policy(state, state["user_input"]))
+
+    def test_timed_out_branch_is_not_cached(self):
+        state = _complex_state(_FakeSubgraph(delays={"airport_weather_current": 1.0}), QUERIES)
+        self.assertTrue(state["partial"])
+        self.assertIn("지금 바로 확인하기 어렵습니다", state["response"])
+        self.assertIsNone(resolve_cache_policy(state, state["user_input"]))
+
+    def test_queue_wait_is_not_counted(self):
+        # 스레드 1개: 두 번째 질문은 첫 질문이 끝날 때까지 대기열에 있다가 시작 (합계 0.3초 > 제한 0.2초)
+        delays = {"parking_fee_info": 0.15, "airport_weather_current": 0.15}
+        with ThreadPoolExecutor(max_workers=1) as executor, \
+                mock.patch.object(complex_handler, "_get_branch_executor", return_value=executor):
+            state = _complex_state(_FakeSubgraph(delays=delays), QUERIES)
+        self.assertFalse(state["partial"])
+
+    def test_failed_single_question_becomes_placeholder(self):
+        state = _complex_state(_FakeSubgraph(errors={"parking_fee_info"}), QUERIES[:1])
+        self.assertTrue(state["partial"])
+        self.assertIn("처리하는 중 문제가 발생했습니다", state["response"])
+        self.assertIsNone(resolve_cache_policy(state, state["user_input"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
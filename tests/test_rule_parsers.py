@@ -0,0 +1,58 @@
+# tests/test_rule_parsers.py
+# 규칙 기반 질의 파서(ai/chatbot/rag/rule_parsers.py)의 표 기반 테스트
+# 실행: python -m pytest tests/test_rule_parsers.py  또는  python tests/test_rule_parsers.py
+
+import sys
+import unittest
+from pathlib import Path
+
+AI_DIR = Path(__file__).resolve().parent.parent / "ai"
+sys.path.insert(0, str(AI_DIR))
+
+from chatbot.rag.rule_parsers import (
+    RULE_PARSER_MIN_COVERAGE,
+    parse_flight_baggage_query,
+    parse_schedule_query,
+)
+
+# (질문, 슬롯, 기대 flight_id, 규칙만으로 처리(coverage 충분) 여부)
+FLIGHT_BAGGAGE_CASES = [
+    ("T1 5시 도착 수하물", [], None, False),
+    ("T2 3번 수취대", [], None, False),
+    ("t2 수하물 찾는 곳", [], None, False),
+    ("KE123 수하물 어디서 찾아?", [], "KE123", True),
+    ("oz 102편 짐 찾는 곳", [], "OZ102", True),
+    ("7C1101 수취대 알려줘", [], "7C1101", True),
+]
+
+# (질문, 슬롯, 기대 airline_name, 기대 airport_name)
+SCHEDULE_CASES = [
+    ("대한민국에서 도쿄 가는 정기편", [], None, "도쿄"),
+    ("대한항공 도쿄 운항 스케줄", [], "대한항공", "도쿄"),
+    ("아시아나로 오사카 가는 스케줄", [], "아시아나항공", "오사카"),
+    ("세부 내용 알려줘 오사카 스케줄", [], None, "오사카"),
+    ("세부 정보 알려줘", [], None, None),
+    ("세부행 정기편 스케줄", [], None, "세부"),
+    ("세부 정기 운항 스케줄", [("세부", "B-airport_name")], None, "세부"),
+]
+
+
+class RuleParserTest(unittest.TestCase):
+    def test_flight_baggage_query(self):
+        for query, slots, flight_id, rule_only in FLIGHT_BAGGAGE_CASES:
+            with self.subTest(query=query):
+                parsed, coverage = parse_flight_baggage_query(query, slots)
+                self.assertEqual(parsed[0]["flight_id"], flight_id)
+                self.assertEqual(coverage >= RULE_PARSER_MIN_COVERAGE, rule_only)
+
+    def test_schedule_query(self):
+        for query, slots, airline_name, airport_name in SCHEDULE_CASES:
+            with self.subTest(query=query):
+                parsed, _ = parse_schedule_query(query, slots)
+                request = parsed["requests"][0]
+                self.assertEqual(request["airline_name"], airline_name)
+                self.assertEqual(request["airport_name"], airport_name)
+
+
+if __name__ == "__main__":
+    unittest.main()